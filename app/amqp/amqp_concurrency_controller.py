@@ -0,0 +1,191 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from loguru import logger
+
+from app.errors.database_error import TransientErrorCounter
+from app.settings.app_settings import AppSettings
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Bound on the number of messages of a topic processed at the same time,
+    which can be changed while workers are waiting for it
+    """
+
+    def __init__(self, limit: int):
+        """
+        :param limit: initial number of messages processed at the same time
+        """
+        self.limit = limit
+        self.active = 0
+        self._peak_active = 0
+        self._processing_time = 0.0
+        self._processed = 0
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @asynccontextmanager
+    async def slot(self, messages: int = 1) -> AsyncIterator[None]:
+        """
+        Wait for a processing slot and hold it, measuring the processing time
+
+        :param messages: number of messages processed while holding the slot
+        :return: None
+        """
+        condition = self._bind_to_loop()
+        async with condition:
+            await condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+            self._peak_active = max(self._peak_active, self.active)
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self._processing_time += time.monotonic() - start_time
+            self._processed += messages
+            async with condition:
+                self.active -= 1
+                condition.notify()
+
+    async def set_limit(self, limit: int) -> None:
+        """
+        Change the number of messages processed at the same time :
+        running messages are not interrupted
+
+        :param limit: new limit
+        :return: None
+        """
+        condition = self._bind_to_loop()
+        async with condition:
+            self.limit = limit
+            condition.notify_all()
+
+    def take_measures(self) -> tuple[int, float, int]:
+        """
+        Get the measures taken since the previous call and reset them
+
+        :return: number of processed messages, mean processing time per message
+                 and peak number of messages processed at the same time
+        """
+        processed, processing_time, peak_active = \
+            self._processed, self._processing_time, self._peak_active
+        self._processed, self._processing_time, self._peak_active = 0, 0.0, self.active
+        return processed, processing_time / processed if processed else 0.0, peak_active
+
+    def _bind_to_loop(self) -> asyncio.Condition:
+        # asyncio primitives are bound to the event loop they are first used in
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+
+class AMQPConcurrencyController:
+    """
+    AIMD controller of the number of active workers per topic and of the channel prefetch
+
+    A topic whose workers are all busy gets one more active worker per interval
+    while its mean processing time stays under the target. Its limit is multiplied
+    by the decrease factor when the target is exceeded, and so are the limits of all
+    the topics when Neo4j transient errors occur, as they share the same database.
+    """
+
+    def __init__(self, settings: AppSettings, set_prefetch: Callable[[int], Awaitable[None]]):
+        """
+        :param settings: application settings
+        :param set_prefetch: coroutine function applying a new prefetch count
+        """
+        self.settings = settings
+        self.limits: dict[str, AdaptiveConcurrencyLimit] = {}
+        self.prefetch_count = 0
+        self._set_prefetch = set_prefetch
+        self._transient_errors = TransientErrorCounter.count
+
+    def limit(self, topic: str) -> AdaptiveConcurrencyLimit:
+        """
+        Get the concurrency limit shared by the workers of a topic
+
+        :param topic: the topic
+        :return: the concurrency limit
+        """
+        if topic not in self.limits:
+            self.limits[topic] = AdaptiveConcurrencyLimit(
+                self._bounded_workers(self.settings.amqp_task_parallelism_limit))
+        return self.limits[topic]
+
+    async def run(self) -> None:
+        """
+        Adjust the limits at every interval until cancelled
+
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(self.settings.amqp_adaptive_concurrency_interval)
+            try:
+                await self.adjust()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.exception(f"Adaptive concurrency adjustment failed : {error}")
+
+    async def adjust(self) -> None:
+        """
+        Adjust the limits from the measures taken since the previous adjustment
+
+        :return: None
+        """
+        transient_errors = TransientErrorCounter.count - self._transient_errors
+        self._transient_errors += transient_errors
+        database_overloaded = \
+            transient_errors >= self.settings.amqp_adaptive_concurrency_transient_error_threshold
+        for topic, limit in self.limits.items():
+            processed, mean_processing_time, peak_active = limit.take_measures()
+            if database_overloaded or (
+                    processed and mean_processing_time
+                    > self.settings.amqp_adaptive_concurrency_target_processing_time):
+                new_limit = self._bounded_workers(
+                    math.floor(limit.limit
+                               * self.settings.amqp_adaptive_concurrency_decrease_factor))
+            elif processed and peak_active >= limit.limit:
+                new_limit = self._bounded_workers(limit.limit + 1)
+            else:
+                continue
+            if new_limit == limit.limit:
+                continue
+            logger.info(
+                f"Adaptive concurrency : active workers for topic '{topic}' "
+                f"{limit.limit} -> {new_limit} ({processed} messages processed "
+                f"in {mean_processing_time:.3f}s on average, "
+                f"{transient_errors} transient database errors)"
+            )
+            await limit.set_limit(new_limit)
+        await self.adjust_prefetch()
+
+    async def adjust_prefetch(self) -> None:
+        """
+        Apply the channel prefetch matching the current limits : it is shared by the
+        consumers of all the topics, each topic contributing its own limit in the ratio
+        of the configured prefetch count to the configured parallelism
+
+        :return: None
+        """
+        if not self.limits:
+            return
+        ratio = self.settings.amqp_prefetch_count / self.settings.amqp_task_parallelism_limit
+        prefetch_count = sum(min(max(math.ceil(limit.limit * ratio),
+                                     self.settings.amqp_adaptive_prefetch_min),
+                                 self.settings.amqp_adaptive_prefetch_max)
+                             for limit in self.limits.values())
+        if prefetch_count == self.prefetch_count:
+            return
+        logger.info(f"Adaptive concurrency : prefetch count "
+                    f"{self.prefetch_count} -> {prefetch_count}")
+        await self._set_prefetch(prefetch_count)
+        self.prefetch_count = prefetch_count
+
+    def _bounded_workers(self, workers: int) -> int:
+        return min(max(workers, self.settings.amqp_adaptive_concurrency_min_workers),
+                   self.settings.amqp_adaptive_concurrency_max_workers)
@@ -1,4 +1,6 @@
 import asyncio
+import json
+import zlib
 from collections import defaultdict
 from typing import List
 from urllib.parse import quote
@@ -7,10 +9,12 @@ import aio_pika
 from aio_pika import ExchangeType
 from loguru import logger
 
+from app.amqp.amqp_concurrency_controller import AMQPConcurrencyController
 from app.amqp.amqp_message_processor import AMQPMessageProcessor
 from app.amqp.amqp_message_processor_factory import AMQPMessageProcessorFactory
 from app.amqp.amqp_message_publisher import AMQPMessagePublisher
 from app.settings.app_settings import AppSettings
+from app.utils.concurrency.priority_scheduler import PriorityScheduler
 
 
 # pylint: disable=too-many-instance-attributes
@@ -27,7 +31,18 @@ class AMQPInterface:
         self.pika_exchanges: dict[str, aio_pika.Exchange] = {}
         self.pika_connexion: aio_pika.abc.AbstractRobustConnection | None = None
         self.inner_tasks_queues: dict[str, asyncio.Queue] = {}
+        # topics routed by key : each shard has its own queue and a single worker
+        self.inner_tasks_shard_queues: dict[str, List[asyncio.Queue]] = {}
         self.message_processing_workers: dict[str, List[asyncio.Task]] = defaultdict(list)
+        self.concurrency_controller: AMQPConcurrencyController | None = \
+            AMQPConcurrencyController(settings, self._set_prefetch_count) \
+            if settings.amqp_adaptive_concurrency_enabled else None
+        self.concurrency_controller_task: asyncio.Task | None = None
+        self.priority_scheduler: PriorityScheduler | None = \
+            PriorityScheduler(settings.amqp_shared_capacity,
+                              settings.amqp_topic_priorities,
+                              settings.amqp_reserved_capacity) \
+            if settings.amqp_shared_capacity > 0 else None
         self.keys = {
             "people": [self.settings.amqp_directory_people_event_routing_key],
             "structures": [self.settings.amqp_directory_structure_event_routing_key],
@@ -78,6 +93,10 @@ class AMQPInterface:
         self._attach_message_processing_workers(self.settings.amqp_structures_topic)
         self._attach_message_processing_workers(self.settings.amqp_user_actions_topic)
         self._attach_message_processing_workers(self.settings.amqp_harvesting_events_topic)
+        if self.concurrency_controller:
+            await self.concurrency_controller.adjust_prefetch()
+            self.concurrency_controller_task = asyncio.create_task(
+                self.concurrency_controller.run(), name="amqp_concurrency_controller")
 
         logger.info("AMQP interface setup complete")
 
@@ -91,7 +110,15 @@ class AMQPInterface:
                     queue.join(),
                     timeout=self.settings.amqp_wait_before_shutdown,
                 )
+            for topic, queues in self.inner_tasks_shard_queues.items():
+                logger.info(f"Waiting for tasks in the shard queues of '{topic}' to complete...")
+                await asyncio.wait_for(
+                    asyncio.gather(*(queue.join() for queue in queues)),
+                    timeout=self.settings.amqp_wait_before_shutdown,
+                )
         finally:
+            if self.concurrency_controller_task:
+                self.concurrency_controller_task.cancel()
             logger.info("Cancelling worker tasks...")
             for workers in self.message_processing_workers.values():
                 for worker in workers:
@@ -104,25 +131,100 @@ class AMQPInterface:
 
         logger.info("AMQP listeners and workers stopped.")
 
+    def queue_depths(self) -> dict[str, List[int]]:
+        """
+        Get the number of messages waiting in the inner queues of each topic,
+        one value per shard for the topics routed by key
+        :return: dictionary of queue depths by topic
+        """
+        depths = {topic: [queue.qsize()] for topic, queue in self.inner_tasks_queues.items()}
+        for topic, queues in self.inner_tasks_shard_queues.items():
+            depths[topic] = [queue.qsize() for queue in queues]
+        return depths
+
     def _attach_message_processing_workers(self, topic: str):
         logger.info(f"Attaching message processing workers for topic: {topic}")
+        if topic in self.settings.amqp_shard_routing_paths:
+            # a single worker per shard keeps the messages of a key in order
+            self.inner_tasks_shard_queues[topic] = [
+                asyncio.Queue(maxsize=self.INNER_TASKS_QUEUE_LENGTH)
+                for _ in range(self.settings.amqp_task_parallelism_limit)
+            ]
+            for worker_id, queue in enumerate(self.inner_tasks_shard_queues[topic]):
+                self._attach_message_processing_worker(topic, worker_id, queue)
+            return
         self.inner_tasks_queues[topic] = asyncio.Queue(
             maxsize=self.INNER_TASKS_QUEUE_LENGTH)
-        for worker_id in range(self.settings.amqp_task_parallelism_limit):
+        # with adaptive concurrency, the number of active workers is bounded by the controller
+        workers = self.settings.amqp_adaptive_concurrency_max_workers \
+            if self.concurrency_controller else self.settings.amqp_task_parallelism_limit
+        for worker_id in range(workers):
             self._attach_message_processing_worker(topic, worker_id)
 
-    def _attach_message_processing_worker(self, topic, worker_id):
+    def _attach_message_processing_worker(self, topic, worker_id,
+                                          tasks_queue: asyncio.Queue | None = None):
         logger.info(f"Creating message processor for worker {worker_id} on topic: {topic}")
-        processor = self._message_processor(topic)
+        processor = self._message_processor(topic, tasks_queue or self.inner_tasks_queues[topic])
+        if self.concurrency_controller:
+            processor.concurrency_limit = self.concurrency_controller.limit(topic)
+        processor.priority_lane = topic
+        if self.priority_scheduler:
+            processor.priority_scheduler = self.priority_scheduler
         task = asyncio.create_task(
             processor.wait_for_message(worker_id),
             name=f"amqp_message_processor_{topic}_{worker_id}",
         )
         self.message_processing_workers[topic].append(task)
 
-    def _message_processor(self, topic: str) -> AMQPMessageProcessor:
-        return AMQPMessageProcessorFactory.get_processor(topic,
-                                                         self.inner_tasks_queues[topic])
+    @staticmethod
+    def _message_processor(topic: str, tasks_queue: asyncio.Queue) -> AMQPMessageProcessor:
+        return AMQPMessageProcessorFactory.get_processor(topic, tasks_queue)
+
+    def _shard_queue(self, topic: str, message: aio_pika.abc.AbstractIncomingMessage
+                     ) -> asyncio.Queue:
+        queues = self.inner_tasks_shard_queues[topic]
+        routing_key = self._shard_routing_key(message.body,
+                                              self.settings.amqp_shard_routing_paths[topic])
+        if routing_key is None:
+            # messages without routing attribute are not related to each other
+            return min(queues, key=lambda queue: queue.qsize())
+        return queues[zlib.crc32(routing_key.encode("utf8")) % len(queues)]
+
+    @staticmethod
+    def _shard_routing_key(body: bytes, path: str) -> str | None:
+        """
+        Get the routing attribute of a message from a dotted JSON path
+        (e.g. entity.identifiers), serialized so that equal values give equal keys,
+        whatever the order of the elements of the lists they contain
+        :param body: the message body
+        :param path: the dotted JSON path of the routing attribute
+        :return: the routing key or None if the attribute is missing
+        """
+        try:
+            value = json.loads(body)
+        except (json.JSONDecodeError, TypeError, UnicodeDecodeError):
+            return None
+        for step in path.split("."):
+            if isinstance(value, dict):
+                value = value.get(step)
+            elif isinstance(value, list) and step.isdigit() and int(step) < len(value):
+                value = value[int(step)]
+            else:
+                return None
+        if value is None:
+            return None
+        return json.dumps(AMQPInterface._normalized(value), sort_keys=True)
+
+    @staticmethod
+    def _normalized(value):
+        # sort_keys orders the keys of the objects but not the elements of the lists :
+        # they are sorted by their own serialization
+        if isinstance(value, list):
+            return sorted((AMQPInterface._normalized(element) for element in value),
+                          key=lambda element: json.dumps(element, sort_keys=True))
+        if isinstance(value, dict):
+            return {key: AMQPInterface._normalized(element) for key, element in value.items()}
+        return value
 
     async def listen(self, topic: str) -> None:
         """
@@ -134,11 +236,16 @@ class AMQPInterface:
         try:
             async with self.pika_queues[topic].iterator() as queue_iter:
                 async for message in queue_iter:
+                    if topic in self.inner_tasks_shard_queues:
+                        await self._shard_queue(topic, message).put(message)
+                        await asyncio.sleep(0)
+                        continue
                     queue_size = self.inner_tasks_queues[topic].qsize()
                     logger.debug(f"Received message: {message.body}")
                     logger.debug(f"Number of messages in queue before adding :"
                                  f" {queue_size}")
-                    if queue_size == self.settings.amqp_prefetch_count - 2:
+                    if not self.concurrency_controller \
+                            and queue_size == self.settings.amqp_prefetch_count - 2:
                         logger.warning(f"Queue for topic '{topic}' is almost full. "
                                        f"Attaching a new worker to process messages.")
                         self._attach_message_processing_worker(
@@ -234,11 +341,28 @@ class AMQPInterface:
 
         logger.info("Opening AMQP channel...")
         self.pika_channel = await self.pika_connexion.channel(publisher_confirms=True)
-        await self.pika_channel.set_qos(
-            prefetch_count=self.settings.amqp_prefetch_count
-        )
+        await self.pika_channel.set_qos(prefetch_count=self._consumer_prefetch_count())
         logger.info("AMQP channel opened and QoS set.")
 
+    def _consumer_prefetch_count(self) -> int:
+        # with adaptive concurrency, each consumer may prefetch up to the adaptive maximum
+        # while the controller adjusts the prefetch shared by all the consumers of the channel
+        prefetch_count = self.settings.amqp_adaptive_prefetch_max \
+            if self.concurrency_controller else self.settings.amqp_prefetch_count
+        return max(prefetch_count, self._shards_prefetch_count())
+
+    def _shards_prefetch_count(self) -> int:
+        # a burst of messages routed to one shard must leave messages to the other shards
+        if not self.settings.amqp_shard_routing_paths:
+            return 0
+        return self.settings.amqp_task_parallelism_limit * self.settings.amqp_shard_prefetch_depth
+
+    async def _set_prefetch_count(self, prefetch_count: int) -> None:
+        # unlike the per-consumer prefetch, which is fixed when a consumer starts,
+        # the channel-wide (global) prefetch applies at once to the running consumers
+        await self.pika_channel.set_qos(
+            prefetch_count=max(prefetch_count, self._shards_prefetch_count()), global_=True)
+
     async def fetch_publications(self, _, **extra) -> None:
         """
         Request publications for a person
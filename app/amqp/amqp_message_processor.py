@@ -2,14 +2,20 @@ import asyncio
 import json
 import traceback
 from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable
 
 from aio_pika import IncomingMessage
 from loguru import logger
 
+from app.amqp.amqp_concurrency_controller import AdaptiveConcurrencyLimit
 from app.errors.database_error import DatabaseError
 from app.errors.message_error import UnreadableMessageError
 from app.settings.app_settings import AppSettings
+from app.utils.concurrency.priority_scheduler import PriorityScheduler, \
+    current_priority_lane
 
 
 class AMQPMessageProcessor(ABC):
@@ -24,6 +30,12 @@ class AMQPMessageProcessor(ABC):
     ):
         self.tasks_queue = tasks_queue
         self.settings = settings
+        # shared by the workers of the topic when adaptive concurrency is enabled
+        self.concurrency_limit: AdaptiveConcurrencyLimit | None = None
+        # shared by the workers of all the topics when priority lanes are enabled
+        self.priority_scheduler: PriorityScheduler | None = None
+        # lane of the processed messages, also given to the work they request
+        self.priority_lane: str | None = None
 
     async def wait_for_message(self, worker_id: int) -> None:
         """
@@ -31,57 +43,86 @@ class AMQPMessageProcessor(ABC):
         :param worker_id: queue worker identifier
         :return: None
         """
-        message: IncomingMessage | None = None
-        payload = None
-
         while True:
-            message = await self.tasks_queue.get()
+            message: IncomingMessage = await self.tasks_queue.get()
             start_time = datetime.now()
-            requeue = False
             try:
-                async with message.process(ignore_processed=True):
-                    payload = message.body
-                    key = message.routing_key
-                    try:
-                        await self._process_message(key, payload)
-                        await message.ack()
-                    # inner exceptions
-                    except ValueError as error:
-                        logger.error(
-                            f"Invalid message received by {worker_id} : {error}",
-                            exc_info=True
-                        )
-                    except DatabaseError as database_error:
-                        logger.error(traceback.format_exc())
-                        logger.error(
-                            f"Database error for worker {worker_id} "
-                            f"message processing : {database_error}",
-                            exc_info=True
-                        )
-                        requeue = True
-                    finally:
-                        if not message.processed:
-                            await message.nack(requeue=requeue)
-            # outer  exceptions
-            except KeyboardInterrupt as keyboard_interrupt:
-                logger.warning(f"Amqp connect worker {worker_id} has been cancelled")
-                await message.nack(requeue=True)
-                raise keyboard_interrupt
-            except Exception as exception:  # pylint: disable=broad-exception-caught
-                logger.error(
-                    f"Unexpected exception during {worker_id} message processing: {exception}",
-                    exc_info=True
-                )
-                logger.error(traceback.format_exc())
+                async with self._processing_slot():
+                    await self._process_and_settle(
+                        worker_id, message,
+                        partial(self._process_message, message.routing_key, message.body)
+                    )
             finally:
                 self.tasks_queue.task_done()
                 await asyncio.sleep(0)
                 end_time = datetime.now()
                 logger.warning(
                     f"Performance : Message  processed by {worker_id} "
-                    f"in {end_time - start_time} for payload {payload}"
+                    f"in {end_time - start_time} for payload {message.body}"
                 )
 
+    @asynccontextmanager
+    async def _processing_slot(self, messages: int = 1) -> AsyncIterator[None]:
+        async with AsyncExitStack() as stack:
+            # the topic slot is taken first so that waiting topics do not hold shared capacity
+            if self.concurrency_limit is not None:
+                await stack.enter_async_context(self.concurrency_limit.slot(messages))
+            if self.priority_scheduler is not None:
+                await stack.enter_async_context(
+                    self.priority_scheduler.slot(self.priority_lane))
+            # the work requested while processing the messages inherits their lane
+            token = current_priority_lane.set(self.priority_lane)
+            try:
+                yield
+            finally:
+                current_priority_lane.reset(token)
+
+    @staticmethod
+    async def _process_and_settle(worker_id: int, message: IncomingMessage,
+                                  process: Callable[[], Awaitable[None]]) -> None:
+        """
+        Process a message and acknowledge it, or reject it if the processing fails :
+        invalid messages are dropped, messages failing on a database error are requeued
+        :param worker_id: queue worker identifier
+        :param message: the message to settle
+        :param process: the processing of the message
+        :return: None
+        """
+        requeue = False
+        try:
+            async with message.process(ignore_processed=True):
+                try:
+                    await process()
+                    await message.ack()
+                # inner exceptions
+                except ValueError as error:
+                    logger.error(
+                        f"Invalid message received by {worker_id} : {error}",
+                        exc_info=True
+                    )
+                except DatabaseError as database_error:
+                    logger.error(traceback.format_exc())
+                    logger.error(
+                        f"Database error for worker {worker_id} "
+                        f"message processing : {database_error}",
+                        exc_info=True
+                    )
+                    requeue = True
+                finally:
+                    if not message.processed:
+                        await message.nack(requeue=requeue)
+        # outer  exceptions
+        except KeyboardInterrupt as keyboard_interrupt:
+            logger.warning(f"Amqp connect worker {worker_id} has been cancelled")
+            await message.nack(requeue=True)
+            raise keyboard_interrupt
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.error(
+                f"Unexpected exception during {worker_id} message processing: {exception}",
+                exc_info=True
+            )
+            logger.error(traceback.format_exc())
+
     @abstractmethod
     async def _process_message(self, key: str, payload: str) -> None:
         """
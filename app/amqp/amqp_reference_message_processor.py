@@ -1,3 +1,9 @@
+import asyncio
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+
+from aio_pika import IncomingMessage
 from loguru import logger
 
 from app.amqp.amqp_message_processor import AMQPMessageProcessor
@@ -11,6 +17,16 @@ from app.models.source_records import SourceRecord
 from app.services.source_records.source_record_service import SourceRecordService
 
 
+class ReferenceEvent(NamedTuple):
+    """
+    Reference event read from a publication message
+    """
+    event_type: str  # effective event type : created, updated or unchanged
+    source_record: SourceRecord
+    person: Person
+    identifier_used: PersonIdentifier
+
+
 class AMQReferenceMessageProcessor(AMQPMessageProcessor):
     """
     Workers to process publication messages from AMQP interface
@@ -20,7 +36,148 @@ class AMQReferenceMessageProcessor(AMQPMessageProcessor):
         super().__init__(*args, **kwargs)
         self.service = SourceRecordService()
 
+    async def wait_for_message(self, worker_id: int) -> None:
+        """
+        Messages awaiting method for async processing,
+        by batches if a batch size greater than one is configured
+        :param worker_id: queue worker identifier
+        :return: None
+        """
+        if self.settings.amqp_reference_batch_size <= 1:
+            await super().wait_for_message(worker_id)
+            return
+        while True:
+            messages = await self._next_batch()
+            start_time = datetime.now()
+            try:
+                async with self._processing_slot(len(messages)):
+                    await self._process_batch(worker_id, messages)
+            finally:
+                for _ in messages:
+                    self.tasks_queue.task_done()
+                await asyncio.sleep(0)
+                end_time = datetime.now()
+                logger.warning(
+                    f"Performance : Batch of {len(messages)} messages processed by {worker_id} "
+                    f"in {end_time - start_time}"
+                )
+
+    async def _next_batch(self) -> list[IncomingMessage]:
+        messages = [await self.tasks_queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.amqp_reference_batch_timeout / 1000
+        while len(messages) < self.settings.amqp_reference_batch_size:
+            try:
+                messages.append(self.tasks_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                messages.append(await asyncio.wait_for(self.tasks_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return messages
+
+    async def _process_batch(self, worker_id: int, messages: list[IncomingMessage]) -> None:
+        """
+        Process a batch of publication messages : the owners and the related entities
+        of the source records are resolved once for the whole batch, then each source record
+        is saved in its own unit of work and each message is settled on its own outcome
+        :param worker_id: queue worker identifier
+        :param messages: the messages of the batch
+        :return: None
+        """
+        outcomes: list[ReferenceEvent | Exception | None] = []
+        for message in messages:
+            try:
+                outcomes.append(await self._parse_reference_event(message.body))
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # reported when the message is settled
+                outcomes.append(error)
+        # unchanged source records are not saved
+        events = [outcome for outcome in outcomes
+                  if isinstance(outcome, ReferenceEvent) and outcome.event_type != "unchanged"]
+        owners: dict[int, Person | None] = {}
+        existing_uids: set[str] | None = None
+        stored_source_records: dict[str, SourceRecord] = {}
+        try:
+            if events:
+                found_owners = await self.service.find_source_record_owners(
+                    [event.person for event in events])
+                owners = {id(event): owner for event, owner in zip(events, found_owners)}
+                stored_source_records = await self.service.prepare_source_records(
+                    [event.source_record for event in events
+                     if owners[id(event)] is not None])
+                existing_uids = await self.service.get_existing_source_record_uids(
+                    [event.source_record.uid for event in events])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # the source records are saved one by one, as without batch,
+            # so that each message is still settled on its own outcome
+            logger.error(f"Error while preparing a batch of {len(events)} "
+                         f"source records, processing them one by one : {e}")
+            existing_uids = None
+        for message, outcome in zip(messages, outcomes):
+            await self._process_and_settle(
+                worker_id, message,
+                partial(self._process_batched_outcome, outcome, owners, existing_uids,
+                        stored_source_records)
+            )
+
+    async def _process_batched_outcome(self, outcome: ReferenceEvent | Exception | None,
+                                       owners: dict[int, Person | None],
+                                       existing_uids: set[str] | None,
+                                       stored_source_records: dict[str, SourceRecord]) -> None:
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome is None:
+            return
+        if existing_uids is None or outcome.event_type == "unchanged":
+            await self._process_reference_event(outcome)
+            return
+        source_record, person = outcome.source_record, outcome.person
+        owner = owners[id(outcome)]
+        if owner is None:
+            logger.error(f"Reference owner {person} not found while trying to save source record"
+                         f" {source_record}")
+            raise ReferenceOwnerNotFoundError(f"Person with uid {person.uid} does not exist")
+        if source_record.uid in existing_uids:
+            await self._update_prepared_source_record(
+                outcome, owner, stored_source_records.get(source_record.uid))
+            return
+        try:
+            await self.service.create_source_record(source_record=source_record,
+                                                    harvested_for=owner,
+                                                    identifier_used=outcome.identifier_used,
+                                                    prepared=True)
+        except ConflictError:
+            # created in the meantime by another worker
+            logger.warning(f"Source record {source_record.uid} already exists in the database,"
+                           f" the system will try to update it")
+            await self._update_prepared_source_record(outcome, owner)
+
+    async def _update_prepared_source_record(self, event: ReferenceEvent, owner: Person,
+                                             stored_source_record: SourceRecord | None = None):
+        try:
+            await self.service.update_source_record(source_record=event.source_record,
+                                                    harvested_for=owner,
+                                                    identifier_used=event.identifier_used,
+                                                    prepared=True,
+                                                    stored_source_record=stored_source_record)
+        except ConflictError as e:
+            logger.error(
+                f"Identifier conflict while trying to update source record "
+                f"{event.source_record} : {e}")
+            raise e
+
     async def _process_message(self, key: str, payload: str):
+        event = await self._parse_reference_event(payload)
+        if event is not None:
+            await self._process_reference_event(event)
+
+    async def _parse_reference_event(self, payload: str) -> ReferenceEvent | None:
         json_payload = await self._read_message_json(payload)
         logger.info(f"Processing message {json_payload}")
         self._check_keys(json_payload, {
@@ -38,10 +195,10 @@ class AMQReferenceMessageProcessor(AMQPMessageProcessor):
         # If the event type is not in settings.event_types_to_process, we skip processing
         if effective_event_type not in self.settings.event_types_to_process:
             logger.info(f"Event type {effective_event_type} not in settings, skipping processing")
-            return
+            return None
         identifier_used = self._parse_identifier_used(json_payload["harvesting"])
         if identifier_used is None:
-            return
+            return None
         reference_data = event_data["reference"]
         try:
             person = Person(**person_data | {'display_name': person_data['name']})
@@ -54,12 +211,18 @@ class AMQReferenceMessageProcessor(AMQPMessageProcessor):
         except (ValueError, AttributeError) as e:
             logger.error(f"Error processing source record data {reference_data} : {e}")
             raise e
-        if effective_event_type in ["created"]:
-            await self._create_source_record(source_record, person, identifier_used)
-        elif effective_event_type in ["updated"]:
-            await self._update_source_record(source_record, person, identifier_used)
-        elif effective_event_type in ["unchanged"]:
-            logger.debug(f"Source record {source_record.uid} is unchanged (not enhanced), "
+        return ReferenceEvent(event_type=effective_event_type, source_record=source_record,
+                              person=person, identifier_used=identifier_used)
+
+    async def _process_reference_event(self, event: ReferenceEvent) -> None:
+        if event.event_type in ["created"]:
+            await self._create_source_record(event.source_record, event.person,
+                                             event.identifier_used)
+        elif event.event_type in ["updated"]:
+            await self._update_source_record(event.source_record, event.person,
+                                             event.identifier_used)
+        elif event.event_type in ["unchanged"]:
+            logger.debug(f"Source record {event.source_record.uid} is unchanged (not enhanced), "
                          f"no action "
                         f"taken")
 
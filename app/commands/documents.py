@@ -5,6 +5,8 @@ import typer
 
 from app.commands import with_app_lifecycle
 from app.services.documents.document_service import DocumentService
+from app.services.source_contributors.clustering_scratch_data_collector import \
+    ClusteringScratchDataCollector
 
 document_cli = typer.Typer()
 
@@ -161,3 +163,23 @@ def dispatch_all(
         typer.echo(f"All document events of type '{event}' dispatched successfully.")
 
     asyncio.run(_dispatch_all(event))
+
+
+@document_cli.command()
+def collect_clustering_scratch_data(
+        batch_size: int = typer.Option(
+            None,
+            help="Number of entities deleted per transaction "
+                 "(defaults to the clustering_scratch_gc_batch_size setting)")
+):
+    """
+    Delete the scratch data left by contributor clustering. Can be interrupted and resumed.
+    """
+
+    @with_app_lifecycle
+    async def _collect_clustering_scratch_data(batch_size: int | None):
+        counts = await ClusteringScratchDataCollector().collect(batch_size)
+        typer.echo(f"Deleted {counts['source_people_distances']} source people distances "
+                   f"and {counts['computation_origins']} computation origins.")
+
+    asyncio.run(_collect_clustering_scratch_data(batch_size))
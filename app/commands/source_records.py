@@ -59,3 +59,33 @@ def resave_source_record(
         typer.echo(f"Source record {uid} resaved.")
 
     asyncio.run(_resave_source_record(uid))
+
+
+@source_record_cli.command()
+def list_hub_identifiers(
+        refresh: bool = typer.Option(
+            False,
+            help="Recompute the cardinality of all the publication identifiers first, "
+                 "e.g. after a change of the fan-out ceilings")
+):
+    """
+    Lists the publication identifiers shared by too many source records,
+    which are excluded from inferred equivalence.
+
+    """
+
+    @with_app_lifecycle
+    async def _list_hub_identifiers(refresh: bool):
+        settings = get_app_settings()
+        factory = AbstractDAOFactory().get_dao_factory(settings.graph_db)
+        source_record_dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        if refresh:
+            count = await source_record_dao.refresh_publication_identifiers_cardinality()
+            typer.echo(f"Cardinality of {count} publication identifiers refreshed.")
+        hub_identifiers = await source_record_dao.get_hub_publication_identifiers()
+        for identifier in hub_identifiers:
+            typer.echo(f"{identifier['type']}\t{identifier['value']}\t"
+                       f"{identifier['source_record_count']} source records")
+        typer.echo(f"{len(hub_identifiers)} hub publication identifiers.")
+
+    asyncio.run(_list_hub_identifiers(refresh))
@@ -1,4 +1,5 @@
 import asyncio
+import signal
 import sys
 
 from aiormq import AMQPConnectionError
@@ -20,8 +21,13 @@ from app.search.search_engine import SearchEngine
 from app.search.source_record_index import SourceRecordIndex
 from app.services.authority_organizations.authority_organization_location_service import \
     AuthorityOrganizationLocationService
+from app.services.authority_organizations.authority_organization_service import \
+    AuthorityOrganizationService
 from app.services.documents.document_service import DocumentService
 from app.services.journals.journal_service import JournalService
+from app.services.policies.publication_source_policy import PublicationSourcePolicy
+from app.services.source_contributors.clustering_scratch_data_collector import \
+    ClusteringScratchDataCollector
 from app.services.source_records.equivalence_service import EquivalenceService
 from app.settings.app_env_types import AppEnvTypes
 from app.signals import person_created, person_identifiers_updated, source_record_created, \
@@ -42,6 +48,8 @@ class CrisalidIKG(FastAPI):
         self.amqp_interface = AMQPInterface(settings)
         self.search_engine = None
         self.state.es_client = None
+        self.state.clustering_scratch_gc_task = None
+        self.state.document_recomputation_sweep_task = None
 
         self.include_router(
             api_router, prefix=f"{settings.api_prefix}/{settings.api_version}"
@@ -65,17 +73,33 @@ class CrisalidIKG(FastAPI):
             not_found_reference_owner_error_handler
         )
 
+        self.add_event_handler("startup", self.setup_publication_source_policy)
         self.add_event_handler("startup", self.setup_graph)
         self.add_event_handler("startup", self.import_openalex_domains)
+        if settings.clustering_scratch_gc_interval > 0:
+            # stopped before the graph connexion is closed
+            self.add_event_handler("startup", self.start_clustering_scratch_gc)
+            self.add_event_handler("shutdown", self.stop_clustering_scratch_gc)
+
+        if settings.document_recomputation_sweep_at_startup:
+            # stopped before the pending document recomputations are drained
+            self.add_event_handler("startup", self.start_document_recomputation_sweep)
+            self.add_event_handler("shutdown", self.stop_document_recomputation_sweep)
 
         if settings.amqp_enabled:
             self.add_event_handler("startup", self.open_rabbitmq_connexion)
             self.add_event_handler("shutdown", self.close_rabbitmq_connexion)
+        # drained once the AMQP workers, which schedule recomputations, are stopped,
+        # while the recomputed documents can still be indexed
+        self.add_event_handler("shutdown", self.drain_document_recomputations)
 
         if settings.es_enabled:
             self.add_event_handler("startup", self.setup_elasticsearch)
             self.add_event_handler("shutdown", self.close_elasticsearch)
 
+        # closed last, once nothing can write to the graph anymore
+        self.add_event_handler("shutdown", self.close_graph_connexion)
+
         self._register_source_record_events()
         self._register_journal_events()
         self._register_document_events()
@@ -83,6 +107,15 @@ class CrisalidIKG(FastAPI):
         self._register_person_events()
         self._register_authority_organization_state_events()
 
+    @logger.catch(reraise=True)
+    async def setup_publication_source_policy(self) -> None:  # pragma: no cover
+        """Compile the publication source policies at boot time and reload them on SIGHUP"""
+        PublicationSourcePolicy.current()
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP,
+                                                          PublicationSourcePolicy.reload)
+        logger.info("Publication source policies have been compiled")
+
     @logger.catch(reraise=True)
     async def setup_graph(self) -> None:  # pragma: no cover
         """Init graph connexion at boot time"""
@@ -93,6 +126,50 @@ class CrisalidIKG(FastAPI):
         await setup.run()
         logger.info("Graph connexion has been set up")
 
+    @logger.catch(reraise=True)
+    async def close_graph_connexion(self) -> None:  # pragma: no cover
+        """Close the shared graph driver and its connection pool at shutdown"""
+        logger.info("Closing graph connexion")
+        settings = get_app_settings()
+        factory = AbstractDAOFactory().get_dao_factory(settings.graph_db)
+        await factory.close()
+        logger.info("Graph connexion has been closed")
+
+    async def start_clustering_scratch_gc(self) -> None:  # pragma: no cover
+        """Schedule the collection of contributor clustering scratch data"""
+        settings = get_app_settings()
+        logger.info("Scheduling clustering scratch data collection every "
+                    f"{settings.clustering_scratch_gc_interval} seconds")
+        self.state.clustering_scratch_gc_task = asyncio.create_task(
+            ClusteringScratchDataCollector().run_periodically(
+                settings.clustering_scratch_gc_interval),
+            name="clustering_scratch_gc")
+
+    async def stop_clustering_scratch_gc(self) -> None:  # pragma: no cover
+        """Cancel the scheduled collection of contributor clustering scratch data"""
+        if self.state.clustering_scratch_gc_task is not None:
+            self.state.clustering_scratch_gc_task.cancel()
+            self.state.clustering_scratch_gc_task = None
+
+    async def start_document_recomputation_sweep(self) -> None:  # pragma: no cover
+        """Recompute in background the documents left flagged to be recomputed"""
+        logger.info("Scheduling the recomputation of the documents flagged to be recomputed")
+        self.state.document_recomputation_sweep_task = asyncio.create_task(
+            # failures are logged, the next startup resumes the recomputations
+            logger.catch(DocumentService().recompute_flagged_documents)(),
+            name="document_recomputation_sweep")
+
+    async def stop_document_recomputation_sweep(self) -> None:  # pragma: no cover
+        """Cancel the recomputation of the documents flagged to be recomputed"""
+        if self.state.document_recomputation_sweep_task is not None:
+            self.state.document_recomputation_sweep_task.cancel()
+            self.state.document_recomputation_sweep_task = None
+
+    async def drain_document_recomputations(self) -> None:  # pragma: no cover
+        """Run the pending document recomputations before the graph connexion is closed"""
+        logger.info("Running pending document recomputations")
+        await DocumentService.drain_scheduled_recomputations()
+
     @logger.catch(reraise=True)
     async def import_openalex_domains(self) -> None:  # pragma: no cover
         """Import OpenAlex domains hierarchy at boot time"""
@@ -131,7 +208,7 @@ class CrisalidIKG(FastAPI):
     def _register_document_events(self):
         self.document_service = DocumentService()
         document_sources_changed.connect(
-            self.document_service.update_from_source_records)
+            self.document_service.schedule_update_from_source_records)
         document_created_from_sources.connect(
             self.document_service.create_from_source_records)
         document_updated.connect(self.amqp_interface.dispatch_document_updated)
@@ -148,6 +225,9 @@ class CrisalidIKG(FastAPI):
         self.authority_organization_location_service = AuthorityOrganizationLocationService()
         authority_organisation_state_updated.connect(
             self.authority_organization_location_service.add_location_from_source_organizations)
+        # the resolution cache is held by the class : no service instance is kept for it
+        authority_organisation_state_updated.connect(
+            AuthorityOrganizationService.invalidate_cached_resolutions, weak=False)
 
     @logger.catch(reraise=True)
     async def close_elasticsearch(self) -> None:  # pragma: no cover
@@ -221,7 +301,9 @@ class CrisalidIKG(FastAPI):
         Trigger all registered shutdown events programmatically.
         """
         settings = get_app_settings()
-        if settings.es_enabled:
-            await self.close_elasticsearch()
         if settings.amqp_enabled:
             await self.close_rabbitmq_connexion()
+        await self.drain_document_recomputations()
+        if settings.es_enabled:
+            await self.close_elasticsearch()
+        await self.close_graph_connexion()
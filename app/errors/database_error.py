@@ -17,6 +17,9 @@ from neo4j.exceptions import (
     ServiceUnavailable
 )
 
+from app.graph.generic.unit_of_work import current_unit_of_work
+from app.graph.neo4j.query_registry import QueryRegistry
+
 MAX_RETRIES = 3
 RETRY_DELAY = 2
 
@@ -30,6 +33,30 @@ class DatabaseError(Exception):
         super().__init__(message)
 
 
+class TransientErrorCounter:
+    """
+    Process-wide count of the Neo4j transient errors (deadlocks, lock timeouts...),
+    including the failed attempts of the units of work retried by the driver
+    """
+
+    count = 0
+
+    @classmethod
+    def record(cls, error: TransientError) -> None:
+        """
+        Count a transient error once, whichever handlers it goes through
+        (e.g. the last failed attempt of a unit of work is raised again
+        by the unit of work once the driver stops retrying it)
+
+        :param error: the transient error
+        :return: None
+        """
+        if getattr(error, "counted_as_transient_error", False):
+            return
+        error.counted_as_transient_error = True
+        cls.count += 1
+
+
 async def database_error_handler(
         _: Request,
         exc: DatabaseError,
@@ -50,35 +77,46 @@ def handle_database_errors(func):
     """
     Decorator to handle various Neo4j exceptions by converting them to a custom DatabaseError.
     Includes retry logic for TransientError with deadlock detection.
+    Inside a unit of work, the failed transaction cannot be replayed alone :
+    the retry is left to the unit of work.
     """
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
         retries = 0
         while retries <= MAX_RETRIES:
+            QueryRegistry.reset_last_loaded()
             try:
                 return await func(*args, **kwargs)
             except TransientError as e:
+                if current_unit_of_work.get() is None:
+                    # inside a unit of work, the failed attempt is counted by the unit of work
+                    TransientErrorCounter.record(e)
                 if e.code == 'Neo.TransientError.Transaction.DeadlockDetected':
-                    if retries < MAX_RETRIES:
+                    if retries < MAX_RETRIES and current_unit_of_work.get() is None:
                         retries += 1
+                        logger.warning(f"Deadlock detected{_failing_query()}, "
+                                       f"retry {retries}/{MAX_RETRIES}")
                         # add a random delay to avoid contention
                         await asyncio.sleep(RETRY_DELAY + int(random() * 10) / 10)
                         continue
                     raise DatabaseError(
-                        f"Max retries reached for deadlock detected: {e.code}"
+                        f"Max retries reached for deadlock detected{_failing_query()}: {e.code}"
                     ) from e
-                raise DatabaseError("A transient error occurred.") from e
+                raise DatabaseError(f"A transient error occurred{_failing_query()}.") from e
             except Neo4jDatabaseError as e:
+                logger.error(f"Database error{_failing_query()}")
                 logger.error(traceback.format_exc())
                 raise DatabaseError("A database error occurred.") from e
             except ServiceUnavailable as e:
                 raise DatabaseError("The Neo4j service is unavailable or misconfigured."
                                     ) from e
             except ClientError as e:
+                logger.error(f"Client error{_failing_query()}")
                 logger.error(traceback.format_exc())
                 raise DatabaseError(
-                    "A client error occurred, possibly due to an invalid query or constraint."
+                    "A client error occurred, possibly due to an invalid query or constraint"
+                    f"{_failing_query()}."
                 ) from e
             except DriverError as e:
                 logger.error(traceback.format_exc())
@@ -87,3 +125,9 @@ def handle_database_errors(func):
                 ) from e
 
     return wrapper
+
+
+def _failing_query() -> str:
+    # named cypher query the failing call was running, if it was loaded from the registry
+    query = QueryRegistry.last_loaded()
+    return f" in cypher query {query.name} ({query.identifier})" if query else ""
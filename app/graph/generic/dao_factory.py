@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from app.graph.generic.dao import DAO
 from app.graph.generic.setup import Setup
+from app.graph.generic.unit_of_work import UnitOfWork
 
 
 class DAOFactory(ABC):
@@ -36,3 +37,27 @@ class DAOFactory(ABC):
 
         :return:
         """
+
+    @abstractmethod
+    def get_unit_of_work(self) -> UnitOfWork:
+        """
+        Get a new unit of work for the concrete backend
+
+        :return: The unit of work
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Release the connexion resources shared by the DAOs of the concrete backend
+
+        :return: None
+        """
+
+    @abstractmethod
+    def get_pool_statistics(self) -> dict:
+        """
+        Get monitoring statistics about the connexion pool of the concrete backend
+
+        :return: dictionary of statistics
+        """
@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, TypeVar
+
+from blinker import Signal
+
+T = TypeVar("T")  # pylint: disable=invalid-name
+
+current_unit_of_work: ContextVar["UnitOfWork | None"] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+class UnitOfWork(ABC):
+    """
+    Parent class for all units of work
+
+    A unit of work runs a sequence of DAO calls in a single session and transaction :
+    DAO calls made while it is active join it instead of opening their own session,
+    and everything is rolled back if one of them fails at the database level.
+    """
+
+    def __init__(self):
+        self.failure: Exception | None = None
+        self._after_commit: list[Callable[[], Awaitable[Any]]] = []
+
+    @abstractmethod
+    async def run(self, work: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """
+        Run a coroutine function inside the unit of work and commit at the end
+
+        If a unit of work is already active, the coroutine joins it.
+        :param work: coroutine function to run
+        :return: the result of the coroutine
+        """
+
+    def fail(self, error: Exception) -> None:
+        """
+        Record a database level failure : the unit of work will be rolled back
+
+        :param error: the error raised by the database
+        :return: None
+        """
+        if self.failure is None:
+            self.failure = error
+
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Register a coroutine function to call once the unit of work has been committed
+
+        :param callback: coroutine function without arguments
+        :return: None
+        """
+        self._after_commit.append(callback)
+
+    def _reset(self) -> None:
+        self.failure = None
+        self._after_commit = []
+
+    async def _run_after_commit_callbacks(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+
+async def send_after_commit(signal: Signal, sender: Any, **kwargs) -> None:
+    """
+    Send a signal once the active unit of work has been committed,
+    or immediately if no unit of work is active
+
+    :param signal: the blinker signal to send
+    :param sender: the signal sender
+    :param kwargs: the signal arguments
+    :return: None
+    """
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is None:
+        await signal.send_async(sender, **kwargs)
+        return
+
+    async def _send() -> None:
+        await signal.send_async(sender, **kwargs)
+
+    unit_of_work.after_commit(_send)
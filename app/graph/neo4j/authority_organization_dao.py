@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import re
+from uuid import uuid4
 
 from neo4j import AsyncSession, AsyncManagedTransaction
 
@@ -288,21 +289,82 @@ class AuthorityOrganizationDAO(Neo4jDAO):
                     return [r["root_uid"] for r in rows]
 
     @handle_database_errors
-    async def get_organization_states_of_root(self, root_uid: str) -> list[str]:
+    async def find_candidate_roots_of_states(self, state_uids: list[str]) -> dict[str, list[str]]:
         """
-        Get the UIDs of AuthorityOrganizationStates attached to an AuthorityOrganizationRoot.
-        :param root_uid:
-        :return:
+        Find the AuthorityOrganizationRoots of the given AuthorityOrganizationStates,
+        with the UIDs of all the states attached to each of them, in a single query.
+        :param state_uids: list of AuthorityOrganizationState UIDs
+        :return: dictionary of attached AuthorityOrganizationState UIDs
+            by AuthorityOrganizationRoot UID
         """
+        if not state_uids:
+            return {}
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
-                async with await session.begin_transaction() as tx:
-                    result = await tx.run(
-                        load_query("get_organization_states_of_root"),
-                        root_uid=root_uid,
-                    )
-                    rec = await result.single()
-                    return rec["state_uids"] if rec and rec["state_uids"] else []
+                return await session.read_transaction(
+                    self._find_candidate_roots_of_states_tx, state_uids)
+
+    @staticmethod
+    async def _find_candidate_roots_of_states_tx(
+            tx: AsyncManagedTransaction,
+            state_uids: list[str],
+    ) -> dict[str, list[str]]:
+        result = await tx.run(
+            load_query("find_candidate_roots_of_states"),
+            state_uids=state_uids,
+        )
+        return {record["root_uid"]: record["state_uids"] async for record in result}
+
+    @handle_database_errors
+    async def save_authority_organization_root_with_states(
+            self,
+            root: AuthorityOrganizationRoot,
+            state_uids: list[str],
+    ) -> AuthorityOrganizationRoot:
+        """
+        Create the AuthorityOrganizationRoot if it has no UID yet, or update its scalar properties
+        otherwise, attach the AuthorityOrganizationStates to it and read it back,
+        in a single transaction.
+        :param root: the root to save
+        :param state_uids: UIDs of the states to attach
+        :return: the hydrated root
+        """
+        # generated outside of the transaction function, which the driver may retry,
+        # and without mutating the root, as the whole call may be retried on deadlocks
+        root_uid = root.uid or str(uuid4())
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.write_transaction(
+                    self._save_authority_organization_root_with_states_tx,
+                    root,
+                    root_uid,
+                    state_uids,
+                )
+
+    @classmethod
+    async def _save_authority_organization_root_with_states_tx(
+            cls,
+            tx: AsyncManagedTransaction,
+            root: AuthorityOrganizationRoot,
+            root_uid: str,
+            state_uids: list[str],
+    ) -> AuthorityOrganizationRoot:
+        source_organization_uids = root.source_organization_uids or []
+        if not root.uid:
+            await tx.run(load_query("create_authority_organization_root"),
+                         uid=root_uid,
+                         source_organization_uids=source_organization_uids)
+        if state_uids:
+            await cls._attach_authority_organization_states_to_root_tx(tx, root_uid, state_uids)
+        result = await tx.run(
+            load_query("update_authority_organization_root"),
+            uid=root_uid,
+            source_organization_uids=source_organization_uids,
+        )
+        record = await result.single()
+        if not record:
+            raise NotFoundError(f"AuthorityOrganizationRoot with uid {root_uid} not found")
+        return cls._hydrate_authority_organization_root(record)
 
     @handle_database_errors
     async def update_authority_organization_root(
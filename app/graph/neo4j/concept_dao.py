@@ -85,6 +85,71 @@ class ConceptDAO(Neo4jDAO):
                                                 existing_concept)
         return concept.uri
 
+    @handle_database_errors
+    async def find_by_uids(self, uids: list[str]) -> dict[str, Concept]:
+        """
+        Find several concepts by their uids in a single query
+
+        :param uids: concept uids
+        :return: dictionary of the concepts found, by uid
+        """
+        if not uids:
+            return {}
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                async with await session.begin_transaction() as tx:
+                    result = await tx.run(
+                        load_query("find_concepts_by_uids"),
+                        uids=list(set(uids))
+                    )
+                    concepts = [self._hydrate(record) async for record in result]
+                    return {concept.uid: concept for concept in concepts}
+
+    @handle_database_errors
+    async def create_or_update_many(self, concepts: list[Concept],
+                                    existing_concepts: dict[str, Concept]) -> None:
+        """
+        Create or update several concepts in a single batched statement
+
+        :param concepts: the concepts to write, with their complete labels
+        :param existing_concepts: the current state of the concepts already in the database,
+                                  by uid, to compute the labels to create and delete
+        :return: None
+        """
+        rows = [self._concept_row(concept, existing_concepts.get(concept.uid))
+                for concept in concepts]
+        # existing concepts whose labels have not changed need no write
+        rows = [row for row in rows
+                if row["uid"] not in existing_concepts
+                or row["pref_labels_to_delete"] or row["pref_labels"] or row["alt_labels"]]
+        if not rows:
+            return
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                await session.write_transaction(self._create_or_update_concepts_transaction,
+                                                rows)
+
+    @staticmethod
+    async def _create_or_update_concepts_transaction(tx: AsyncManagedTransaction,
+                                                     rows: list[dict]) -> None:
+        await tx.run(load_query("create_or_update_concepts"), concepts=rows)
+
+    @staticmethod
+    def _concept_row(concept: Concept, existing_concept: Concept | None) -> dict:
+        existing_pref_labels = existing_concept.pref_labels if existing_concept else []
+        existing_alt_labels = existing_concept.alt_labels if existing_concept else []
+        return {
+            "uid": concept.uid,
+            "uri": concept.uri,
+            "pref_labels_to_delete": [pref_label.model_dump(exclude_none=True)
+                                      for pref_label in existing_pref_labels
+                                      if pref_label not in concept.pref_labels],
+            "pref_labels": [pref_label.model_dump() for pref_label in concept.pref_labels
+                            if pref_label not in existing_pref_labels],
+            "alt_labels": [alt_label.model_dump() for alt_label in concept.alt_labels
+                           if alt_label not in existing_alt_labels],
+        }
+
     @staticmethod
     def _hydrate(record) -> Concept:
         concept_data = record["concept"]
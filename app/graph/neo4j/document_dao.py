@@ -111,6 +111,36 @@ class DocumentDAO(Neo4jDAO):
                     source_record_uids=source_record_uids
                 )
 
+    @handle_database_errors
+    async def mark_document_recomputed(self, document_uid: str) -> None:
+        """
+        Clear the recomputation flag of a document left unchanged by its recomputation
+        :param document_uid: UID of the document
+        :return:
+        """
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                await session.write_transaction(
+                    self._mark_document_recomputed_transaction,
+                    document_uid=document_uid
+                )
+
+    @handle_database_errors
+    async def get_document_uids_to_be_recomputed(self, after_uid: str, limit: int) -> list[str]:
+        """
+        Get the uids of the documents flagged to be recomputed, by pages ordered by uid
+        :param after_uid: uid after which the page starts, empty string for the first page
+        :param limit: maximal number of uids of the page
+        :return: list of document uids, empty after the last page
+        """
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.read_transaction(
+                    self._get_document_uids_to_be_recomputed_transaction,
+                    after_uid=after_uid,
+                    limit=limit
+                )
+
     @handle_database_errors
     async def get_person_documents(self, person_uid: str) -> list[str] | None:
         """
@@ -162,6 +192,7 @@ class DocumentDAO(Neo4jDAO):
             oa_status=document.open_access_status.oa_status,
             upw_oa_status=document.open_access_status.upw_oa_status,
             coar_oa_status=document.open_access_status.coar_oa_status,
+            content_fingerprint=document.content_fingerprint,
         )
         update_document_subjects_query = load_query(
             "update_document_subjects"
@@ -188,6 +219,24 @@ class DocumentDAO(Neo4jDAO):
 
         return result
 
+    @classmethod
+    async def _get_document_uids_to_be_recomputed_transaction(
+            cls, tx: AsyncManagedTransaction, after_uid: str, limit: int) -> list[str]:
+        result = await tx.run(
+            load_query("get_document_uids_to_be_recomputed"),
+            after_uid=after_uid,
+            limit=limit
+        )
+        return [record["uid"] async for record in result]
+
+    @classmethod
+    async def _mark_document_recomputed_transaction(cls, tx: AsyncManagedTransaction,
+                                                    document_uid: str) -> None:
+        await tx.run(
+            load_query("mark_document_recomputed"),
+            document_uid=document_uid
+        )
+
     @classmethod
     async def _attach_source_records_to_document_transaction(
             cls, tx: AsyncManagedTransaction, document_uid: str,
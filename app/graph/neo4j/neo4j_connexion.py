@@ -1,28 +1,120 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+from loguru import logger
 from neo4j import AsyncGraphDatabase, AsyncDriver
 
 from app.config import get_app_settings
+from app.graph.generic.unit_of_work import current_unit_of_work
 
 
 class Neo4jConnexion:
     """
-    Neo4j connexion class to get a driver for the database
+    Neo4j connexion class giving access to the process-wide pooled driver
+
+    The driver (and its Bolt connection pool) is created lazily on first use
+    and shared by all DAOs until the application lifecycle closes it.
     """
 
+    _driver: AsyncDriver | None = None
+    _driver_loop: asyncio.AbstractEventLoop | None = None
+    _drivers_created: int = 0
+    _active_leases: int = 0
+    _total_leases: int = 0
+
     @asynccontextmanager
     async def get_driver(self) -> AsyncGenerator[AsyncDriver, None]:
         """
-        Get a driver for the database
+        Get the shared driver for the database
+
+        The driver is not closed when the context exits: it is owned by the
+        application lifecycle (see open and close).
+        If a unit of work is active, a driver handle joining it is yielded instead.
         :yields: driver
         """
-        settings = get_app_settings()
-        driver = AsyncGraphDatabase.driver(
-            settings.neo4j_uri,
-            auth=(settings.neo4j_user, settings.neo4j_password)
-        )
+        unit_of_work = current_unit_of_work.get()
+        if unit_of_work is not None:
+            yield unit_of_work.joined_driver()
+            return
+        driver = await self.open()
+        Neo4jConnexion._active_leases += 1
+        Neo4jConnexion._total_leases += 1
         try:
             yield driver
         finally:
-            await driver.close()
+            Neo4jConnexion._active_leases -= 1
+
+    @classmethod
+    async def open(cls) -> AsyncDriver:
+        """
+        Get the shared driver, creating it if needed
+
+        Async drivers are bound to the event loop they were created in :
+        if the running loop has changed (e.g. successive asyncio.run calls),
+        a new driver is created for the new loop.
+        :return: the shared driver
+        """
+        loop = asyncio.get_running_loop()
+        # driver creation does not await, so no lock is needed to avoid duplicates
+        if cls._driver is not None and cls._driver_loop is loop:
+            return cls._driver
+        if cls._driver is not None:
+            logger.debug("Event loop changed, discarding previous Neo4j driver")
+        cls._driver = cls._create_driver()
+        cls._driver_loop = loop
+        cls._drivers_created += 1
+        return cls._driver
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Close the shared driver and its connection pool
+        :return: None
+        """
+        driver, loop = cls._driver, cls._driver_loop
+        cls._driver = None
+        cls._driver_loop = None
+        if driver is None:
+            return
+        if loop is not asyncio.get_running_loop():
+            logger.debug("Neo4j driver belongs to another event loop, dropping it")
+            return
+        await driver.close()
+
+    @classmethod
+    def pool_statistics(cls) -> dict:
+        """
+        Get statistics about the shared driver and its connection pool
+        :return: dictionary of statistics
+        """
+        settings = get_app_settings()
+        statistics = {
+            "driver_open": cls._driver is not None,
+            "drivers_created": cls._drivers_created,
+            "active_leases": cls._active_leases,
+            "total_leases": cls._total_leases,
+            "max_connection_pool_size": settings.neo4j_max_connection_pool_size,
+            "connections": 0,
+            "connections_in_use": 0,
+        }
+        # the driver does not expose its pool publicly
+        pool = getattr(cls._driver, "_pool", None)
+        if pool is None:
+            return statistics
+        for address, connections in list(pool.connections.items()):
+            statistics["connections"] += len(connections)
+            statistics["connections_in_use"] += pool.in_use_connection_count(address)
+        return statistics
+
+    @staticmethod
+    def _create_driver() -> AsyncDriver:
+        settings = get_app_settings()
+        logger.info(f"Creating Neo4j driver for {settings.neo4j_uri}")
+        return AsyncGraphDatabase.driver(
+            settings.neo4j_uri,
+            auth=(settings.neo4j_user, settings.neo4j_password),
+            max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+            connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout,
+            max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+        )
@@ -7,6 +7,7 @@ from app.graph.generic.dao_factory import DAOFactory
 from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
 from app.graph.neo4j.neo4j_dao import Neo4jDAO
 from app.graph.neo4j.neo4j_setup import Neo4jSetup
+from app.graph.neo4j.neo4j_unit_of_work import Neo4jUnitOfWork
 from app.models.authority_organization import AuthorityOrganization
 from app.models.authority_organization_root import AuthorityOrganizationRoot
 from app.models.authority_organization_state import AuthorityOrganizationState
@@ -71,3 +72,12 @@ class Neo4jDAOFactory(DAOFactory):
     def get_domain_setup(self) -> "Neo4jDomainSetup":
         from app.graph.neo4j.neo4j_domain_setup import Neo4jDomainSetup  # pylint: disable=import-outside-toplevel
         return Neo4jDomainSetup(driver=self.driver)
+
+    def get_unit_of_work(self) -> Neo4jUnitOfWork:
+        return Neo4jUnitOfWork()
+
+    async def close(self) -> None:
+        await Neo4jConnexion.close()
+
+    def get_pool_statistics(self) -> dict:
+        return Neo4jConnexion.pool_statistics()
@@ -5,6 +5,7 @@ from neo4j.exceptions import DatabaseError
 from app.config import get_app_settings
 from app.graph.generic.setup import Setup
 from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+from app.graph.neo4j.query_registry import QueryRegistry
 
 
 class Neo4jSetup(Setup[AsyncDriver]):
@@ -13,9 +14,15 @@ class Neo4jSetup(Setup[AsyncDriver]):
     """
 
     async def run(self):
+        settings = get_app_settings()
+        QueryRegistry.check_references()
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
                 await session.write_transaction(self._create_constraints)
+            if settings.neo4j_explain_queries_at_startup:
+                errors = await QueryRegistry.explain_all(driver)
+                if errors:
+                    raise ValueError(f"Invalid cypher queries : {', '.join(sorted(errors))}")
 
     @classmethod
     async def _create_constraints(cls, tx: AsyncManagedTransaction):
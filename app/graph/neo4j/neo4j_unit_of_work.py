@@ -0,0 +1,169 @@
+from typing import Awaitable, Callable
+
+from neo4j import AsyncManagedTransaction, AsyncResult
+from neo4j.exceptions import DriverError, Neo4jError, TransientError
+
+from app.errors.database_error import DatabaseError, TransientErrorCounter, \
+    handle_database_errors
+from app.graph.generic.unit_of_work import UnitOfWork, current_unit_of_work, T
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+
+
+class _JoinedTransaction:
+    """
+    Transaction handle given to DAOs joining a unit of work
+
+    Commit and rollback are left to the unit of work.
+    """
+
+    def __init__(self, unit_of_work: "Neo4jUnitOfWork"):
+        self._unit_of_work = unit_of_work
+
+    async def run(self, query, parameters=None, **kwargs) -> AsyncResult:
+        """
+        Run a query in the transaction of the unit of work
+        """
+        if self._unit_of_work.failure is not None:
+            raise DatabaseError("The unit of work has already failed and will be rolled back")
+        try:
+            return await self._unit_of_work.tx.run(query, parameters, **kwargs)
+        except (Neo4jError, DriverError) as error:
+            self._unit_of_work.fail(error)
+            raise
+
+    async def commit(self) -> None:
+        """
+        Commit is deferred to the end of the unit of work
+        """
+
+    async def rollback(self) -> None:
+        """
+        Rolling back a joined transaction rolls back the whole unit of work
+        """
+        self._unit_of_work.fail(DatabaseError("Joined transaction has been rolled back"))
+
+    async def __aenter__(self) -> "_JoinedTransaction":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+class _JoinedSession:
+    """
+    Session handle given to DAOs joining a unit of work
+
+    Every transaction opened from this session is the transaction of the unit of work.
+    """
+
+    def __init__(self, unit_of_work: "Neo4jUnitOfWork"):
+        self._transaction = _JoinedTransaction(unit_of_work)
+
+    async def begin_transaction(self, **_) -> _JoinedTransaction:
+        """
+        Join the transaction of the unit of work
+        """
+        return self._transaction
+
+    async def run(self, query, parameters=None, **kwargs) -> AsyncResult:
+        """
+        Run a query in the transaction of the unit of work
+        """
+        return await self._transaction.run(query, parameters, **kwargs)
+
+    async def execute_read(self, transaction_function, *args, **kwargs):
+        """
+        Run a transaction function in the transaction of the unit of work
+        """
+        return await transaction_function(self._transaction, *args, **kwargs)
+
+    execute_write = execute_read
+    read_transaction = execute_read
+    write_transaction = execute_read
+
+    async def close(self) -> None:
+        """
+        The underlying session is closed by the unit of work
+        """
+
+    async def __aenter__(self) -> "_JoinedSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+class _JoinedDriver:
+    """
+    Driver handle given to DAOs joining a unit of work
+    """
+
+    def __init__(self, unit_of_work: "Neo4jUnitOfWork"):
+        self._unit_of_work = unit_of_work
+
+    def session(self, **_) -> _JoinedSession:
+        """
+        Get a session bound to the unit of work
+        """
+        return _JoinedSession(self._unit_of_work)
+
+
+class Neo4jUnitOfWork(UnitOfWork):
+    """
+    Unit of work running all the DAO calls of a coroutine in a single
+    Neo4j session and write transaction
+
+    The transaction is managed by the driver, so the whole unit is retried
+    on transient errors (e.g. deadlocks). DAO calls must be awaited sequentially
+    as a transaction cannot run concurrent queries.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tx: AsyncManagedTransaction | None = None
+
+    @handle_database_errors
+    async def run(self, work: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        if current_unit_of_work.get() is not None:
+            return await work(*args, **kwargs)
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                result = await session.execute_write(self._run_in_transaction,
+                                                     work, args, kwargs)
+        await self._run_after_commit_callbacks()
+        return result
+
+    def joined_driver(self) -> _JoinedDriver:
+        """
+        Get the driver handle through which DAOs join this unit of work
+        :return: driver handle
+        """
+        return _JoinedDriver(self)
+
+    async def _run_in_transaction(self, tx: AsyncManagedTransaction,
+                                  work: Callable[..., Awaitable[T]],
+                                  args: tuple, kwargs: dict) -> T:
+        # the driver may call this function several times if the transaction is retried
+        self._reset()
+        self.tx = tx
+        token = current_unit_of_work.set(self)
+        try:
+            result = await work(*args, **kwargs)
+        except Exception as error:
+            self._record_transient_failure()
+            # re-raise the database error itself so that the driver can decide to retry
+            if self.failure is not None and self.failure is not error:
+                raise self.failure from error
+            raise
+        finally:
+            current_unit_of_work.reset(token)
+            self.tx = None
+        if self.failure is not None:
+            self._record_transient_failure()
+            raise self.failure
+        return result
+
+    def _record_transient_failure(self) -> None:
+        # counted once per failed attempt, as the driver retries the whole unit of work
+        if isinstance(self.failure, TransientError):
+            TransientErrorCounter.record(self.failure)
@@ -18,6 +18,7 @@ from app.models.memberships import Membership
 from app.models.people import Person
 from app.models.people_names import PersonName
 from app.models.positions import Position
+from app.models.source_people import SourcePerson
 from app.services.identifiers.identifier_service import AgentIdentifierService
 
 
@@ -34,6 +35,13 @@ class PersonDAO(Neo4jDAO):
         names_changed: bool
         memberships_changed: bool
 
+    class SourcePeopleClusterResolution(NamedTuple):
+        """
+        People already known for a cluster of source people
+        """
+        identified_person_uid: str | None
+        external_person_uids: list[str]
+
     @handle_database_errors
     async def get(self, person_uid: str) -> Person | None:
         """
@@ -46,6 +54,21 @@ class PersonDAO(Neo4jDAO):
             async with driver.session() as session:
                 return await session.read_transaction(self._get_person_by_uid, person_uid)
 
+    @handle_database_errors
+    async def find_by_uids(self, person_uids: list[str]) -> dict[str, Person]:
+        """
+        Find several people by their uids in a single query
+
+        :param person_uids: person uids
+        :return: dictionary of the people found, by uid
+        """
+        if not person_uids:
+            return {}
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.read_transaction(self._find_people_by_uids_transaction,
+                                                      list(set(person_uids)))
+
     @handle_database_errors
     async def create(self, person: Person) -> Tuple[str, Neo4jDAO.Status, UpdateStatus | None]:
         """
@@ -155,6 +178,54 @@ class PersonDAO(Neo4jDAO):
                     external)
                 return result
 
+    @handle_database_errors
+    async def resolve_source_people_clusters(
+            self, clusters: dict[str, list[SourcePerson]]
+    ) -> dict[str, SourcePeopleClusterResolution]:
+        """
+        Find in a single query, for each cluster of source people, a person sharing one
+        of their identifiers and the external people they are already recorded by.
+
+        :param clusters: clusters of source people, by cluster key
+        :return: resolution of each cluster, by cluster key
+        """
+        if not clusters:
+            return {}
+        parameters = [
+            {
+                "key": key,
+                "identifiers": [identifier.model_dump() for source_person in cluster
+                                for identifier in source_person.identifiers],
+                "source_person_uids": [source_person.uid for source_person in cluster],
+            }
+            for key, cluster in clusters.items()
+        ]
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.read_transaction(
+                    self._resolve_source_people_clusters_transaction, parameters)
+
+    @handle_database_errors
+    async def create_external_people(self, people: list[Person]) -> list[str]:
+        """
+        Create several external people in a single query
+
+        Only names and identifiers are created : external people have no memberships
+        nor employments. People whose uid already exists are left untouched.
+        :param people: external people to create
+        :return: uids of the people actually created
+        """
+        people = list({person.uid: person for person in people}.values())
+        if not people:
+            return []
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                created_uids = await session.write_transaction(
+                    self._create_external_people_transaction, people)
+        for person_uid in {person.uid for person in people} - set(created_uids):
+            logger.error(f"External person {person_uid} already exists")
+        return created_uids
+
     async def get_all_uids(self, external: bool | None = None) -> list[str]:
         """
         Fetch all UIDs of people from the database.
@@ -194,6 +265,37 @@ class PersonDAO(Neo4jDAO):
         record = await result.single()
         return record["person_uid"] if record else None
 
+    @classmethod
+    async def _resolve_source_people_clusters_transaction(
+            cls, tx: AsyncManagedTransaction, clusters: list[dict]
+    ) -> dict[str, SourcePeopleClusterResolution]:
+        result = await tx.run(load_query("resolve_source_people_clusters"), clusters=clusters)
+        return {
+            record["key"]: cls.SourcePeopleClusterResolution(
+                identified_person_uid=record["identified_person_uid"],
+                external_person_uids=record["external_person_uids"]
+            )
+            async for record in result
+        }
+
+    @staticmethod
+    async def _create_external_people_transaction(tx: AsyncManagedTransaction,
+                                                  people: list[Person]) -> list[str]:
+        result = await tx.run(
+            load_query("create_external_people"),
+            people=[
+                {
+                    "uid": person.uid,
+                    "display_name": person.display_name,
+                    "display_name_variants": person.display_name_variants,
+                    "names": [name.model_dump() for name in person.names],
+                    "identifiers": [identifier.dict() for identifier in person.identifiers],
+                }
+                for person in people
+            ]
+        )
+        return [record["uid"] async for record in result]
+
     @classmethod
     async def _get_person_by_uid(cls, tx, person_uid: str) -> Person | None:
         result = await tx.run(
@@ -205,6 +307,19 @@ class PersonDAO(Neo4jDAO):
             return cls._hydrate(record)
         return None
 
+    @classmethod
+    async def _find_people_by_uids_transaction(cls, tx: AsyncManagedTransaction,
+                                               person_uids: list[str]) -> dict[str, Person]:
+        result = await tx.run(
+            load_query("find_people_by_uids"),
+            uids=person_uids
+        )
+        people = {}
+        async for record in result:
+            person = cls._hydrate(record)
+            people[person.uid] = person
+        return people
+
     @staticmethod
     async def _person_exists(tx: AsyncManagedTransaction, person_uid: str) -> bool:
         result = await tx.run(
@@ -0,0 +1,37 @@
+UNWIND $people AS person
+OPTIONAL MATCH (existing:Person {uid: person.uid})
+WITH person
+WHERE existing IS NULL
+CREATE (p:Person {uid: person.uid, display_name: person.display_name, external: true})
+SET p.display_name_variants = person.display_name_variants
+
+FOREACH (name IN person.names |
+  CREATE (pn:PersonName)
+  CREATE (p)-[:HAS_NAME]->(pn)
+
+  FOREACH (first_name IN name.first_names |
+    MERGE (fn:Literal {
+      value:    trim(first_name.value),
+      language: coalesce(nullif(trim(first_name.language), ''), 'und'),
+      type:     'person_first_name'
+    })
+    MERGE (pn)-[:HAS_FIRST_NAME]->(fn)
+  )
+
+  FOREACH (last_name IN name.last_names |
+    MERGE (ln:Literal {
+      value:    trim(last_name.value),
+      language: coalesce(nullif(trim(last_name.language), ''), 'und'),
+      type:     'person_last_name'
+    })
+    MERGE (pn)-[:HAS_LAST_NAME]->(ln)
+  )
+)
+
+FOREACH (identifier IN person.identifiers |
+  CREATE (i:AgentIdentifier {type: identifier.type, value: identifier.value})
+  SET i.authenticated = identifier.authenticated,
+      i.authentication_date = identifier.authentication_date
+  CREATE (p)-[:HAS_IDENTIFIER]->(i)
+)
+RETURN p.uid AS uid
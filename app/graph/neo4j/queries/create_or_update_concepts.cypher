@@ -0,0 +1,37 @@
+UNWIND $concepts AS concept
+MERGE (c:Concept {uid: concept.uid})
+  ON CREATE SET c.uri = concept.uri
+WITH c, concept
+
+CALL {
+  WITH c, concept
+  UNWIND concept.pref_labels_to_delete AS pref_label
+  MATCH (c)-[r:HAS_PREF_LABEL]->(l:Literal {type: 'concept_pref_label'})
+    WHERE l.value = pref_label.value
+    AND l.language = coalesce(nullif(trim(pref_label.language), ''), 'und')
+  DELETE r
+}
+
+CALL {
+  WITH c, concept
+  UNWIND concept.pref_labels AS pref_label
+  MERGE (l:Literal {
+    value:    trim(pref_label.value),
+    language: coalesce(nullif(trim(pref_label.language), ''), 'und'),
+    type:     'concept_pref_label'
+  })
+  MERGE (c)-[:HAS_PREF_LABEL]->(l)
+}
+
+CALL {
+  WITH c, concept
+  UNWIND concept.alt_labels AS alt_label
+  MERGE (l:Literal {
+    value:    trim(alt_label.value),
+    language: coalesce(nullif(trim(alt_label.language), ''), 'und'),
+    type:     'concept_alt_label'
+  })
+  MERGE (c)-[:HAS_ALT_LABEL]->(l)
+}
+
+RETURN count(c) AS concepts_count
@@ -11,7 +11,8 @@ MERGE (doc:Document:Document {uid: $document_uid})
                 doc.oa_doaj_success_status = $oa_doaj_success_status,
                 doc.oa_status = $oa_status,
                 doc.upw_oa_status = $upw_oa_status,
-                doc.coar_oa_status = $coar_oa_status
+                doc.coar_oa_status = $coar_oa_status,
+                doc.content_fingerprint = $content_fingerprint
 
   ON MATCH SET  doc.document_type = $document_type,
                 doc.to_be_recomputed = $to_be_recomputed,
@@ -25,7 +26,8 @@ MERGE (doc:Document:Document {uid: $document_uid})
                 doc.oa_doaj_success_status = $oa_doaj_success_status,
                 doc.oa_status = $oa_status,
                 doc.upw_oa_status = $upw_oa_status,
-                doc.coar_oa_status = $coar_oa_status
+                doc.coar_oa_status = $coar_oa_status,
+                doc.content_fingerprint = $content_fingerprint
 
 WITH doc
 CALL apoc.create.addLabels(doc, $document_labels) YIELD node
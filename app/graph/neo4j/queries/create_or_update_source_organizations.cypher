@@ -0,0 +1,35 @@
+UNWIND $source_organizations AS source_organization
+MERGE (s:SourceOrganization {uid: source_organization.uid})
+SET s:${dynamicLabel},
+    s.source = source_organization.source,
+    s.source_identifier = source_organization.source_identifier,
+    s.name = source_organization.name,
+    s.type = source_organization.type
+WITH s, source_organization
+CALL apoc.create.removeLabels(s, $other_type_labels) YIELD node
+WITH s, source_organization
+
+CALL {
+  WITH s, source_organization
+  MATCH (s)-[rel:HAS_IDENTIFIER]->(i:SourceOrganizationIdentifier)
+    WHERE NOT i.type + ':' + i.value IN source_organization.identifier_composite_keys
+  DELETE rel
+}
+
+CALL {
+  WITH s, source_organization
+  UNWIND source_organization.identifiers AS identifier
+  MERGE (i:SourceOrganizationIdentifier {type: identifier.type, value: identifier.value})
+  FOREACH (_ IN CASE
+    WHEN identifier.extra_information IS NOT NULL
+         AND identifier.extra_information <> '{}'
+         AND identifier.extra_information <> 'null'
+    THEN [1]
+    ELSE []
+  END |
+    SET i.extra_information = identifier.extra_information
+  )
+  MERGE (s)-[:HAS_IDENTIFIER]->(i)
+}
+
+RETURN count(s) AS source_organizations_count
@@ -0,0 +1,25 @@
+UNWIND $source_people AS source_person
+MERGE (s:SourcePerson {uid: source_person.uid})
+SET s.source = source_person.source,
+    s.source_identifier = source_person.source_identifier,
+    s.name = source_person.name,
+    s.first_name = source_person.first_name,
+    s.last_name = source_person.last_name,
+    s.name_variants = source_person.name_variants
+WITH s, source_person
+
+CALL {
+  WITH s, source_person
+  MATCH (s)-[hi:HAS_IDENTIFIER]->(i:SourcePersonIdentifier)
+    WHERE NOT i.type + ':' + i.value IN source_person.identifier_composite_keys
+  DELETE hi
+}
+
+CALL {
+  WITH s, source_person
+  UNWIND source_person.identifiers AS identifier
+  MERGE (i:SourcePersonIdentifier {type: identifier.type, value: identifier.value})
+  MERGE (s)-[:HAS_IDENTIFIER]->(i)
+}
+
+RETURN count(s) AS source_people_count
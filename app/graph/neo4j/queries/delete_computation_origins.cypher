@@ -0,0 +1,7 @@
+// clustering scratch data : committed computation origins are never read again
+MATCH (computation:ComputationOrigin)
+CALL {
+  WITH computation
+  DETACH DELETE computation
+} IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS deleted_count
@@ -0,0 +1,4 @@
+MATCH (source_record:SourceRecord)-[r:INFERRED_EQUIVALENT]-(target_source_record:SourceRecord)
+WHERE source_record.uid IN $source_record_uids
+AND target_source_record.uid IN $target_source_record_uids
+DELETE r
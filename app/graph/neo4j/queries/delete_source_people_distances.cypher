@@ -0,0 +1,7 @@
+// clustering scratch data : committed distances are never read again
+MATCH ()-[distance:SOURCE_PEOPLE_DISTANCE]->()
+CALL {
+  WITH distance
+  DELETE distance
+} IN TRANSACTIONS OF $batch_size ROWS
+RETURN count(*) AS deleted_count
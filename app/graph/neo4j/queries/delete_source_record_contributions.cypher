@@ -1,2 +0,0 @@
-MATCH (:SourceRecord {uid: $source_record_uid})-[:HAS_CONTRIBUTION]->(c:SourceContribution)
-DETACH DELETE c
\ No newline at end of file
@@ -0,0 +1,5 @@
+MATCH (s:AuthorityOrganizationState)<-[:HAS_STATES]-(r:AuthorityOrganizationRoot)
+WHERE s.uid IN $state_uids
+WITH DISTINCT r
+MATCH (r)-[:HAS_STATES]->(attached:AuthorityOrganizationState)
+RETURN r.uid AS root_uid, collect(DISTINCT attached.uid) AS state_uids;
@@ -0,0 +1,7 @@
+MATCH (concept:Concept)
+WHERE concept.uid IN $uids
+RETURN concept,
+       [(concept)-[:HAS_PREF_LABEL]->(pref_label:Literal {type: 'concept_pref_label'}) |
+         {value: pref_label.value, language: pref_label.language}] AS pref_labels,
+       [(concept)-[:HAS_ALT_LABEL]->(alt_label:Literal {type: 'concept_alt_label'}) |
+         {value: alt_label.value, language: alt_label.language}] AS alt_labels
@@ -0,0 +1,2 @@
+MATCH (i:PublicationIdentifier)
+RETURN i.type AS type, i.value AS value
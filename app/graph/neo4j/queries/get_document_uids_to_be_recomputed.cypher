@@ -0,0 +1,7 @@
+MATCH (doc:Document)
+WHERE doc.uid > $after_uid
+  AND doc.to_be_recomputed = true
+  AND coalesce(doc.to_be_deleted, false) = false
+RETURN doc.uid AS uid
+ORDER BY uid
+LIMIT $limit
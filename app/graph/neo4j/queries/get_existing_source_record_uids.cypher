@@ -0,0 +1,3 @@
+UNWIND $source_record_uids AS source_record_uid
+MATCH (s:SourceRecord {uid: source_record_uid})
+RETURN s.uid AS uid
\ No newline at end of file
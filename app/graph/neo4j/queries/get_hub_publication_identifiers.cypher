@@ -0,0 +1,3 @@
+MATCH (i:HubIdentifier)
+RETURN i.type AS type, i.value AS value, i.source_record_count AS source_record_count
+ORDER BY source_record_count DESC, type, value
@@ -0,0 +1,5 @@
+UNWIND range(0, size($uids) - 1) AS position
+MATCH (s:SourceOrganization {uid: $uids[position]})
+RETURN position, s,
+       [(s)-[:HAS_IDENTIFIER]->(i:SourceOrganizationIdentifier) | i] AS identifiers
+ORDER BY position
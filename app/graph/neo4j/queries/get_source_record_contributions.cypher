@@ -0,0 +1,8 @@
+MATCH (:SourceRecord {uid: $source_record_uid})-[:HAS_CONTRIBUTION]->(sc:SourceContribution)
+OPTIONAL MATCH (sc)-[:CONTRIBUTOR]->(c:SourcePerson)
+OPTIONAL MATCH (sc)-[:HAS_AFFILIATION]->(o:SourceOrganization)
+RETURN elementId(sc) AS contribution_id,
+       c.uid AS contributor_uid,
+       sc.rank AS rank,
+       sc.role AS role,
+       collect(o.uid) AS affiliation_uids
@@ -0,0 +1,29 @@
+// component of source records sharing publication identifiers with the source record,
+// hub identifiers shared by too many source records are not traversed
+MATCH (sr:SourceRecord {uid: $source_record_uid})
+CALL apoc.path.subgraphNodes(
+    sr,
+    {
+        relationshipFilter: "HAS_IDENTIFIER",
+        labelFilter: "+PublicationIdentifier|+SourceRecord|-HubIdentifier",
+        minLevel: 0,
+        maxLevel: 100
+    }
+)
+YIELD node
+WITH collect(DISTINCT node) AS nodes
+WITH [node IN nodes WHERE node:SourceRecord] AS shared_identifier_source_records
+// component of source records inferred to be equivalent to any of them
+CALL apoc.path.subgraphNodes(
+    shared_identifier_source_records,
+    {
+        relationshipFilter: "INFERRED_EQUIVALENT",
+        labelFilter: "+SourceRecord",
+        minLevel: 0,
+        maxLevel: 100
+    }
+)
+YIELD node
+RETURN [source_record IN shared_identifier_source_records | source_record.uid]
+           AS shared_identifier_uids,
+       collect(DISTINCT node.uid) AS inferred_equivalent_uids
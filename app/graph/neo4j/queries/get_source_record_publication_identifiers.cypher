@@ -0,0 +1,2 @@
+MATCH (s:SourceRecord {uid: $source_record_uid})-[:HAS_IDENTIFIER]->(i:PublicationIdentifier)
+RETURN i.type AS type, i.value AS value
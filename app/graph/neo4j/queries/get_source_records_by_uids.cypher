@@ -0,0 +1,25 @@
+UNWIND range(0, size($source_record_uids) - 1) AS position
+MATCH (s:SourceRecord {uid: $source_record_uids[position]})
+OPTIONAL MATCH (s)-[:PUBLISHED_IN]->(issue:SourceIssue)
+OPTIONAL MATCH (issue)-[:ISSUED_BY]->(journal:SourceJournal)
+RETURN position, s, issue, journal,
+       [(s)-[:HARVESTED_FOR]->(person:Person) | person.uid] AS harvested_for_uids,
+       [(s)-[:HAS_TITLE]->(title:Literal {type: 'source_record_title'}) | title] AS titles,
+       [(s)-[:HAS_IDENTIFIER]->(pub_identifier:PublicationIdentifier) | pub_identifier] AS identifiers,
+       [(s)-[:HAS_ABSTRACT]->(abstract:TextLiteral {type: 'source_record_abstract'}) | abstract] AS abstracts,
+       [(s)-[:HAS_SUBJECT]->(concept:Concept) | concept] AS subjects,
+       CASE WHEN journal IS NULL THEN []
+            ELSE [(journal)-[:HAS_IDENTIFIER]->(journ_identifier:JournalIdentifier) | journ_identifier]
+       END AS journal_identifiers,
+       [(s)-[:HAS_CONTRIBUTION]->(contribution:SourceContribution) | contribution {
+           .*,
+           contributor: head([(contribution)-[:CONTRIBUTOR]->(contributor:SourcePerson) | contributor {
+               .*,
+               identifiers: [(contributor)-[:HAS_IDENTIFIER]->(pers_identifier:SourcePersonIdentifier) | pers_identifier]
+           }]),
+           affiliations: [(contribution)-[:HAS_AFFILIATION]->(organization:SourceOrganization) | organization {
+               .*,
+               identifiers: [(organization)-[:HAS_IDENTIFIER]->(org_identifier:SourceOrganizationIdentifier) | org_identifier]
+           }]
+       }] AS contributions
+ORDER BY position
@@ -1,14 +0,0 @@
-MATCH (sr:SourceRecord {uid: $source_record_uid})
-CALL apoc.path.subgraphNodes(
-    sr,
-    {
-        relationshipFilter: "HAS_IDENTIFIER",
-        labelFilter: "+PublicationIdentifier|+SourceRecord",
-        minLevel: 1,
-        maxLevel: 100
-    }
-)
-YIELD node
-WITH node
-WHERE node:SourceRecord
-RETURN collect(DISTINCT node.uid) AS uids
\ No newline at end of file
@@ -0,0 +1,5 @@
+UNWIND $links AS link
+MATCH (person:Person {uid: link.person_uid})
+UNWIND link.source_person_uids AS source_person_uid
+MATCH (sp:SourcePerson {uid: source_person_uid})
+MERGE (sp)<-[:RECORDED_BY]-(person)
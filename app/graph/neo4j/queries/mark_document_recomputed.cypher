@@ -0,0 +1,2 @@
+MATCH (doc:Document {uid: $document_uid})
+SET doc.to_be_recomputed = false
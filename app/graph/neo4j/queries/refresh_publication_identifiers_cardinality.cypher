@@ -0,0 +1,22 @@
+// track the number of source records sharing each identifier
+// and flag the identifiers over their type fan-out ceiling as hubs
+UNWIND $identifiers AS identifier
+MATCH (i:PublicationIdentifier {type: identifier.type, value: identifier.value})
+WITH DISTINCT i
+WITH i, COUNT { (i)<-[:HAS_IDENTIFIER]-(:SourceRecord) } AS source_record_count
+SET i.source_record_count = source_record_count
+WITH i, source_record_count > coalesce($fan_out_ceilings[i.type], $default_fan_out_ceiling) AS hub
+
+CALL {
+  WITH i, hub
+  WITH i WHERE hub
+  SET i:HubIdentifier
+}
+
+CALL {
+  WITH i, hub
+  WITH i WHERE NOT hub
+  REMOVE i:HubIdentifier
+}
+
+RETURN count(i) AS identifiers_count
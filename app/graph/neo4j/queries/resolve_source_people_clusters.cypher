@@ -0,0 +1,17 @@
+UNWIND $clusters AS cluster
+CALL {
+  WITH cluster
+  UNWIND cluster.identifiers AS identifier
+  MATCH (person:Person)-[:HAS_IDENTIFIER]->(id:AgentIdentifier)
+  WHERE id.type = identifier.type AND id.value = identifier.value
+  RETURN collect(DISTINCT person.uid) AS identified_person_uids
+}
+CALL {
+  WITH cluster
+  UNWIND cluster.source_person_uids AS source_person_uid
+  MATCH (:SourcePerson {uid: source_person_uid})<-[:RECORDED_BY]-(person:Person {external: true})
+  RETURN collect(DISTINCT person.uid) AS external_person_uids
+}
+RETURN cluster.key AS key,
+       head(identified_person_uids) AS identified_person_uid,
+       external_person_uids
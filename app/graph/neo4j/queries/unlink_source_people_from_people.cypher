@@ -0,0 +1,11 @@
+UNWIND $links AS link
+UNWIND link.source_person_uids AS source_person_uid
+MATCH (sp:SourcePerson {uid: source_person_uid})
+MATCH (sp)<-[rel:RECORDED_BY]-(old:Person {external: true})
+WHERE NOT old.uid = link.person_uid
+DELETE rel
+WITH DISTINCT old
+WHERE NOT old.uid IN $person_uids
+  AND NOT EXISTS((old)-[:RECORDED_BY]->(:SourcePerson))
+OPTIONAL MATCH (old)-[:HAS_CONTRIBUTION]->(contribution:Contribution)
+DETACH DELETE contribution, old
@@ -0,0 +1,21 @@
+MATCH (s:SourceRecord {uid: $source_record_uid})
+CALL {
+  WITH s
+  MATCH (s)-[:HAS_CONTRIBUTION]->(obsolete:SourceContribution)
+  WHERE elementId(obsolete) IN $obsolete_contribution_ids
+  DETACH DELETE obsolete
+}
+WITH s
+UNWIND $contributions AS contribution
+MATCH (c:SourcePerson {uid: contribution.contributor_uid})
+CREATE (s)-[:HAS_CONTRIBUTION]->(sc:SourceContribution {rank: contribution.rank})
+SET sc.role = contribution.role
+CREATE (sc)-[:CONTRIBUTOR]->(c)
+WITH sc, contribution
+CALL {
+  WITH sc, contribution
+  UNWIND contribution.affiliation_uids AS affiliation_uid
+  MATCH (o:SourceOrganization {uid: affiliation_uid})
+  MERGE (sc)-[:HAS_AFFILIATION]->(o)
+}
+RETURN collect(contribution.index) AS created_indexes
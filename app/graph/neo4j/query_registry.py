@@ -0,0 +1,162 @@
+import ast
+import hashlib
+import os
+import sys
+from contextvars import ContextVar
+from typing import NamedTuple, cast
+
+from loguru import logger
+from neo4j import AsyncDriver
+from neo4j.exceptions import Neo4jError
+from typing_extensions import LiteralString
+
+QUERIES_DIR = os.path.join(os.path.dirname(__file__), 'queries')
+
+
+class Query(NamedTuple):
+    """
+    Cypher query loaded from the queries directory
+    """
+    name: str
+    identifier: str  # short stable hash of the query text, for metrics attribution
+    text: LiteralString
+
+
+# last query loaded by the running task, to attribute database errors to named queries
+_last_loaded_query: ContextVar[Query | None] = ContextVar("last_loaded_query", default=None)
+
+
+class QueryRegistry:
+    """
+    Registry of all the cypher queries of the queries directory,
+    loaded and interned once per process
+    """
+
+    _queries: dict[str, Query] = {}
+
+    @classmethod
+    def load(cls) -> None:
+        """
+        Load all the queries of the queries directory
+
+        :return: None
+        """
+        queries = {}
+        for file_name in sorted(os.listdir(QUERIES_DIR)):
+            name, extension = os.path.splitext(file_name)
+            if extension != '.cypher':
+                continue
+            with open(os.path.join(QUERIES_DIR, file_name), 'r', encoding='utf8') as query_file:
+                text = sys.intern(query_file.read())
+            queries[name] = Query(
+                name=name,
+                identifier=hashlib.sha1(text.encode('utf8')).hexdigest()[:12],
+                text=cast(LiteralString, text)
+            )
+        cls._queries = queries
+
+    @classmethod
+    def get(cls, query_name: str) -> Query:
+        """
+        Get a query by its name
+
+        :param query_name: the name of the query (file name without extension)
+        :return: the query
+        """
+        try:
+            query = cls._queries[query_name]
+        except KeyError as error:
+            raise ValueError(f"Unknown cypher query {query_name}") from error
+        _last_loaded_query.set(query)
+        return query
+
+    @staticmethod
+    def last_loaded() -> Query | None:
+        """
+        Get the last query loaded by the running task,
+        i.e. the query a failing database call was running
+
+        :return: the query or None if no query has been loaded since the last reset
+        """
+        return _last_loaded_query.get()
+
+    @staticmethod
+    def reset_last_loaded() -> None:
+        """
+        Forget the last query loaded by the running task, at the beginning of a database call
+
+        :return: None
+        """
+        _last_loaded_query.set(None)
+
+    @classmethod
+    def names(cls) -> list[str]:
+        """
+        Get the names of all the registered queries
+
+        :return: list of query names
+        """
+        return list(cls._queries)
+
+    @classmethod
+    def check_references(cls) -> None:
+        """
+        Check that all the queries referenced by a literal name
+        in the neo4j package exist in the registry
+
+        :raises ValueError: if a referenced query is missing
+        """
+        referenced = cls._referenced_query_names()
+        missing = sorted(referenced - cls._queries.keys())
+        if missing:
+            raise ValueError(f"Missing cypher queries : {', '.join(missing)}")
+        logger.debug(f"{len(referenced)} referenced cypher queries found in registry")
+
+    @classmethod
+    async def explain_all(cls, driver: AsyncDriver) -> dict[str, str]:
+        """
+        Run EXPLAIN on every registered query against the live database
+        to detect syntax or schema errors without executing them
+
+        :param driver: Neo4j driver
+        :return: dictionary of failing query names and error messages
+        """
+        errors = {}
+        async with driver.session() as session:
+            for query in cls._queries.values():
+                try:
+                    result = await session.run(cast(LiteralString, f"EXPLAIN {query.text}"))
+                    await result.consume()
+                except Neo4jError as error:
+                    errors[query.name] = error.message
+                    logger.error(f"EXPLAIN failed for cypher query {query.name} : {error.message}")
+        return errors
+
+    @staticmethod
+    def _referenced_query_names() -> set[str]:
+        package_dir = os.path.dirname(__file__)
+        names = set()
+        for file_name in os.listdir(package_dir):
+            if not file_name.endswith('.py'):
+                continue
+            with open(os.path.join(package_dir, file_name), 'r', encoding='utf8') as source:
+                tree = ast.parse(source.read())
+            names.update(name for node in ast.walk(tree)
+                         if (name := QueryRegistry._literal_query_name(node)) is not None)
+        return names
+
+    @staticmethod
+    def _literal_query_name(node: ast.AST) -> str | None:
+        # name of the query loaded by a load_query call with a literal argument
+        if not (isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id == 'load_query'
+                and node.args):
+            return None
+        argument = node.args[0]
+        if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+            return argument.value
+        return None
+
+
+QueryRegistry.load()
@@ -54,6 +54,32 @@ class SourceOrganizationDAO(Neo4jDAO):
                                                                        source_organization)
                     return source_organization
 
+    @handle_database_errors
+    async def create_or_update_many(self, source_organizations: list[SourceOrganization]
+                                    ) -> list[SourceOrganization]:
+        """
+        Create or update several source organizations in batched statements,
+        one per organization type as the type is stored as a label
+
+        Source organizations are deduplicated by uid, the last occurrence wins.
+        :param source_organizations: source organization Pydantic objects
+        :return: the written source organizations, one per uid
+        """
+        unique_source_organizations = list({source_organization.uid: source_organization
+                                            for source_organization in source_organizations
+                                            }.values())
+        rows_by_type: dict[SourceOrganization.SourceOrganisationType, list[dict]] = {}
+        for source_organization in unique_source_organizations:
+            rows_by_type.setdefault(source_organization.type, []).append(
+                self._source_organization_row(source_organization))
+        if not rows_by_type:
+            return []
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                await session.write_transaction(
+                    self._create_or_update_source_organizations_transaction, rows_by_type)
+        return unique_source_organizations
+
     @handle_database_errors
     async def source_organization_exists(self, source_organization_uid: str) -> bool:
         """
@@ -84,6 +110,34 @@ class SourceOrganizationDAO(Neo4jDAO):
                         tx,
                         source_organization_uid)
 
+    @handle_database_errors
+    async def get_many_by_uids(self, source_organization_uids: list[str]
+                               ) -> list[SourceOrganization]:
+        """
+        Get several source organizations from the graph database in a single query
+
+        :param source_organization_uids: source organization uids
+        :return: source organization objects, in the order of the uids
+                 (missing ones are skipped)
+        """
+        if not source_organization_uids:
+            return []
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.read_transaction(
+                    self._get_source_organizations_by_uids_transaction,
+                    source_organization_uids)
+
+    @classmethod
+    async def _get_source_organizations_by_uids_transaction(
+            cls, tx: AsyncManagedTransaction,
+            source_organization_uids: list[str]) -> list[SourceOrganization]:
+        result = await tx.run(
+            load_query("get_source_organizations_by_uids"),
+            uids=source_organization_uids
+        )
+        return [cls._hydrate(record) async for record in result]
+
     @staticmethod
     async def _source_organization_exists(tx: AsyncManagedTransaction,
                                           source_organization_uid: str) -> bool:
@@ -165,6 +219,36 @@ class SourceOrganizationDAO(Neo4jDAO):
             ],
         )
 
+    @classmethod
+    async def _create_or_update_source_organizations_transaction(
+            cls,
+            tx: AsyncManagedTransaction,
+            rows_by_type: dict[SourceOrganization.SourceOrganisationType, list[dict]]
+    ) -> None:
+        for organization_type, rows in rows_by_type.items():
+            query = cls._replace_dynamic_label(
+                load_query("create_or_update_source_organizations"),
+                organization_type)
+            # an organization whose type has changed loses the label of its previous type
+            other_type_labels = [cls._type_label(other_type)
+                                 for other_type in SourceOrganization.SourceOrganisationType
+                                 if other_type != organization_type]
+            await tx.run(query, source_organizations=rows, other_type_labels=other_type_labels)
+
+    @staticmethod
+    def _source_organization_row(source_organization: SourceOrganization) -> dict:
+        return {
+            "uid": source_organization.uid,
+            "source": source_organization.source.value,
+            "source_identifier": source_organization.source_identifier,
+            "name": source_organization.name,
+            "type": source_organization.type.value,
+            "identifiers": [identifier.model_dump()
+                            for identifier in source_organization.identifiers],
+            "identifier_composite_keys": [f"{identifier.type}:{identifier.value}"
+                                          for identifier in source_organization.identifiers],
+        }
+
     @handle_database_errors
     async def create_source_organization_cluster(
             self,
@@ -232,5 +316,9 @@ class SourceOrganizationDAO(Neo4jDAO):
         if organization_type is None:
             dynamic_label = ""  # no colon needed; it's already in the template
         else:
-            dynamic_label = f":Source{inflection.camelize(organization_type.value)}"
+            dynamic_label = f":{SourceOrganizationDAO._type_label(organization_type)}"
         return query.replace(":${dynamicLabel}", dynamic_label)
+
+    @staticmethod
+    def _type_label(organization_type: SourceOrganization.SourceOrganisationType) -> str:
+        return f"Source{inflection.camelize(organization_type.value)}"
@@ -53,6 +53,27 @@ class SourcePersonDAO(Neo4jDAO):
                                                                  source_person)
                     return source_person
 
+    @handle_database_errors
+    async def create_or_update_many(self, source_people: list[SourcePerson]
+                                    ) -> list[SourcePerson]:
+        """
+        Create or update several source people in a single batched statement
+
+        Source people are deduplicated by uid, the last occurrence wins.
+        :param source_people: source people Pydantic objects
+        :return: the written source people, one per uid
+        """
+        rows = {source_person.uid: self._source_person_row(source_person)
+                for source_person in source_people}
+        if not rows:
+            return []
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                await session.write_transaction(self._create_or_update_source_people_transaction,
+                                                list(rows.values()))
+        return list({source_person.uid: source_person
+                     for source_person in source_people}.values())
+
     @handle_database_errors
     async def source_person_exists(self, source_person_uid: str) -> bool:
         """
@@ -87,6 +108,30 @@ class SourcePersonDAO(Neo4jDAO):
                                                                      document_uid,
                                                                      number_of_layers)
 
+    @handle_database_errors
+    async def delete_clustering_scratch_data(self, batch_size: int) -> dict[str, int]:
+        """
+        Delete the ComputationOrigin nodes and SOURCE_PEOPLE_DISTANCE relationships
+        left by the graph contributor clustering engine.
+
+        Deletions are committed by batches, so that an interrupted collection
+        can be resumed by running it again. Scratch data of a computation in progress
+        is not visible as it is created and deleted in the same transaction.
+        :param batch_size: number of entities deleted per transaction
+        :return: number of deleted distances and computation origins
+        """
+        counts = {}
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                # CALL ... IN TRANSACTIONS needs an auto-commit transaction
+                for key, query_name in (("source_people_distances",
+                                         "delete_source_people_distances"),
+                                        ("computation_origins", "delete_computation_origins")):
+                    result = await session.run(load_query(query_name), batch_size=batch_size)
+                    record = await result.single()
+                    counts[key] = record["deleted_count"] if record else 0
+        return counts
+
     @handle_database_errors
     async def create_contextual_equivalents(self, source_people_couples: list[tuple[str, str]],
                                             document_uid: str) -> None:
@@ -158,6 +203,37 @@ class SourcePersonDAO(Neo4jDAO):
         query = load_query("link_source_people_to_person")
         await tx.run(query, source_person_uids=source_person_uids, person_uid=person_uid)
 
+    @handle_database_errors
+    async def link_to_people(self, source_person_uids_by_person_uid: dict[str, list[str]]) -> None:
+        """
+        Same as link_to_person for several people at once, in a single transaction.
+
+        :param source_person_uids_by_person_uid: SourcePerson UIDs to link, by Person UID.
+        """
+        if not source_person_uids_by_person_uid:
+            return
+        links = [
+            {"person_uid": person_uid, "source_person_uids": source_person_uids}
+            for person_uid, source_person_uids in source_person_uids_by_person_uid.items()
+        ]
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                await session.write_transaction(self._link_to_people_transaction, links)
+
+    @staticmethod
+    async def _link_to_people_transaction(tx: AsyncManagedTransaction, links: list[dict]) -> None:
+        """
+        Transaction to clear and recreate RECORDED_BY relationships for several people.
+
+        Former external people are only deleted when no source person is recorded by them
+        anymore and they are not the target of one of the links.
+        :param tx: Neo4j transaction object.
+        :param links: list of dictionaries with 'person_uid' and 'source_person_uids'.
+        """
+        await tx.run(load_query("unlink_source_people_from_people"), links=links,
+                     person_uids=[link["person_uid"] for link in links])
+        await tx.run(load_query("link_source_people_to_people"), links=links)
+
     @staticmethod
     @handle_database_errors
     async def _create_source_people_clusters(tx: AsyncManagedTransaction,
@@ -315,6 +391,26 @@ class SourcePersonDAO(Neo4jDAO):
             identifiers=[identifier.model_dump() for identifier in source_person.identifiers],
         )
 
+    @staticmethod
+    async def _create_or_update_source_people_transaction(tx: AsyncManagedTransaction,
+                                                          rows: list[dict]) -> None:
+        await tx.run(load_query("create_or_update_source_people"), source_people=rows)
+
+    @staticmethod
+    def _source_person_row(source_person: SourcePerson) -> dict:
+        return {
+            "uid": source_person.uid,
+            "source": source_person.source.value,
+            "source_identifier": source_person.source_identifier,
+            "name": source_person.name,
+            "first_name": source_person.first_name,
+            "last_name": source_person.last_name,
+            "name_variants": source_person.name_variants,
+            "identifiers": [identifier.model_dump() for identifier in source_person.identifiers],
+            "identifier_composite_keys": [f"{identifier.type}:{identifier.value}"
+                                          for identifier in source_person.identifiers],
+        }
+
     @staticmethod
     def _hydrate(record) -> SourcePerson:
         source_person = SourcePerson(
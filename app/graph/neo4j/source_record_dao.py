@@ -3,6 +3,7 @@ from typing import Tuple, NamedTuple, List
 
 from neo4j import AsyncManagedTransaction
 
+from app.config import get_app_settings
 from app.errors.conflict_error import ConflictError
 from app.errors.database_error import handle_database_errors
 from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
@@ -37,11 +38,20 @@ class SourceRecordDAO(Neo4jDAO):
 
     class UpdateStatus(NamedTuple):
         """
-        Update status details
+        Update status details : which inputs of the document computation have changed
         """
         identifiers_changed: bool
         titles_changed: bool
         contributors_changed: bool
+        issue_changed: bool
+        custom_metadata_changed: bool
+
+    class ContributionError(NamedTuple):
+        """
+        Contribution that could not be written, with the reason
+        """
+        contribution: SourceContribution
+        message: str
 
     class EquivalenceType(Enum):
         """
@@ -78,7 +88,8 @@ class SourceRecordDAO(Neo4jDAO):
     @handle_database_errors
     async def update(self, source_record: SourceRecord,
                      harvested_for: Person,
-                     identifier_used: PersonIdentifier
+                     identifier_used: PersonIdentifier,
+                     stored_source_record: SourceRecord | None = None
                      ) -> Tuple[
         str, Neo4jDAO.Status, UpdateStatus | None]:
         """
@@ -87,6 +98,9 @@ class SourceRecordDAO(Neo4jDAO):
         :param harvested_for: person on behalf of whom the source record was harvested
         :param source_record: source record object
         :param identifier_used: person identifier that triggered the harvest
+        :param stored_source_record: the source record as stored before its contributors
+                and affiliations were written, to compute the update status.
+                Read from the graph database if not provided.
         :return: source record uid, operation status and update status details
         """
         async with Neo4jConnexion().get_driver() as driver:
@@ -94,21 +108,55 @@ class SourceRecordDAO(Neo4jDAO):
                 async with await session.begin_transaction() as tx:
                     return await self._update_source_record_transaction(tx, source_record,
                                                                         harvested_for,
-                                                                        identifier_used)
+                                                                        identifier_used,
+                                                                        stored_source_record)
 
     @handle_database_errors
-    async def get_source_records_with_shared_identifier_uids(self, source_record_id: str):
+    async def get_equivalence_components(self, source_record_uid: str
+                                         ) -> Tuple[List[str], List[str]]:
         """
-        Get source records with shared publication identifiers
-        :param source_record_id:
-        :return:
+        Get in a single query the weakly connected graph of source records that share
+        publication identifiers with a source record and the weakly connected graph of
+        source records inferred to be equivalent to any of them
+        :param source_record_uid: The UID of the source record.
+        :return: the UIDs of both graphs, each including the source record itself
         """
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
-                async with await session.begin_transaction() as tx:
-                    return await self._get_source_records_with_shared_identifier_uids(
-                        tx,
-                        source_record_id)
+                return await session.read_transaction(self._get_equivalence_components,
+                                                      source_record_uid)
+
+    @handle_database_errors
+    async def refresh_publication_identifiers_cardinality(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the number of source records sharing each publication identifier
+        and the hub flag of every identifier, e.g. after a change of the fan-out ceilings
+        :param batch_size: number of identifiers refreshed per transaction
+        :return: the number of refreshed identifiers
+        """
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                result = await session.run(load_query("get_all_publication_identifiers"))
+                identifiers = [{"type": record["type"], "value": record["value"]}
+                               async for record in result]
+                for start in range(0, len(identifiers), batch_size):
+                    await session.write_transaction(
+                        self._refresh_publication_identifiers_cardinality,
+                        identifiers[start:start + batch_size])
+        return len(identifiers)
+
+    @handle_database_errors
+    async def get_hub_publication_identifiers(self) -> List[dict]:
+        """
+        Get the publication identifiers shared by more source records than the fan-out ceiling
+        of their type, which are excluded from inferred equivalence
+        :return: list of identifiers as dictionaries with 'type', 'value'
+                 and 'source_record_count', most shared first
+        """
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                result = await session.run(load_query("get_hub_publication_identifiers"))
+                return [record.data() async for record in result]
 
     @handle_database_errors
     async def get_source_records_equivalent_uids(self, source_record_uid: str,
@@ -168,21 +216,21 @@ class SourceRecordDAO(Neo4jDAO):
                 return record['source_record_uids'] if record else []
 
     @handle_database_errors
-    async def delete_inferred_equivalence_relationships(self, source_record_uid: str,
-                                                        target_source_record_uids: list[str]):
-        """
-        Delete inferred equivalent relationships between a source record and other source records
-        :param source_record_uid:
-        :param target_source_record_uids:
+    async def update_inferred_equivalence_component(self, source_record_uids: list[str],
+                                                    detached_source_record_uids: list[str]):
+        """
+        In a single transaction, delete the inferred equivalent relationships between
+        detached source records and a component of source records, then create the missing
+        inferred equivalent relationships inside the component
+        :param source_record_uids: the source records of the component
+        :param detached_source_record_uids: the source records that left the component
         :return:
         """
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
-                async with await session.begin_transaction() as tx:
-                    return await self._delete_inferred_equivalence_relationships(
-                        tx,
-                        source_record_uid,
-                        target_source_record_uids)
+                await session.write_transaction(self._update_inferred_equivalence_component,
+                                                source_record_uids,
+                                                detached_source_record_uids)
 
     @handle_database_errors
     async def create_inferred_equivalence_relationships(self, source_record_uids: list[str]):
@@ -229,6 +277,22 @@ class SourceRecordDAO(Neo4jDAO):
                 return await session.read_transaction(self._get_source_record_by_uid,
                                                       source_record_uid)
 
+    @handle_database_errors
+    async def get_many(self, source_record_uids: List[str]) -> List[SourceRecord]:
+        """
+        Get several source records from the graph database in a single query,
+        with their contributions, identifiers, issue and journal
+
+        :param source_record_uids: source record uids
+        :return: source record objects, in the order of the uids (missing ones are skipped)
+        """
+        if not source_record_uids:
+            return []
+        async with Neo4jConnexion().get_driver() as driver:
+            async with driver.session() as session:
+                return await session.read_transaction(self._get_source_records_by_uids,
+                                                      source_record_uids)
+
     @handle_database_errors
     async def get_all_uids(self) -> List[str]:
         """
@@ -253,47 +317,119 @@ class SourceRecordDAO(Neo4jDAO):
                     return await SourceRecordDAO._source_record_exists(tx, source_record_uid)
 
     @handle_database_errors
-    async def delete_contributions(self, source_record_uid: str):
+    async def get_existing_uids(self, source_record_uids: List[str]) -> set[str]:
         """
-        Delete contributions of a source record
-        :param source_record_uid:
-        :return:
+        Get, among several source record uids, the ones that exist in the graph database,
+        in a single query
+
+        :param source_record_uids: source record uids
+        :return: the uids of the existing source records
         """
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
-                await session.run(
-                    load_query("delete_source_record_contributions"),
-                    source_record_uid=source_record_uid
-                )
+                return await session.read_transaction(self._get_existing_uids_transaction,
+                                                      source_record_uids)
 
     @handle_database_errors
-    async def create_contribution(self, source_contribution: SourceContribution,
-                                  source_record_uid: str):
+    async def update_contributions(self, source_record_uid: str,
+                                   contributions: List[SourceContribution]
+                                   ) -> List[ContributionError]:
         """
-        Create a contribution of a source record
-        :param source_contribution:
-        :param source_record_uid:
-        :return:
+        Synchronize the contributions of a source record in a single transaction :
+        unchanged contributions are kept, obsolete ones are deleted and new ones
+        are created with one parameterised UNWIND query
+
+        :param source_record_uid: source record uid
+        :param contributions: complete list of the contributions of the source record
+        :return: the contributions that could not be written, with the reason
         """
         async with Neo4jConnexion().get_driver() as driver:
             async with driver.session() as session:
-                async with await session.begin_transaction() as tx:
-                    await SourceRecordDAO._create_contribution_transaction(tx, source_contribution,
-                                                                           source_record_uid)
+                return await session.write_transaction(self._update_contributions_transaction,
+                                                       source_record_uid,
+                                                       contributions)
 
-    @staticmethod
-    async def _create_contribution_transaction(tx: AsyncManagedTransaction,
-                                               source_contribution: SourceContribution,
-                                               source_record_uid: str):
-        query = load_query("create_source_contribution")
-        await tx.run(
-            query,
+    @classmethod
+    async def _update_contributions_transaction(cls, tx: AsyncManagedTransaction,
+                                                source_record_uid: str,
+                                                contributions: List[SourceContribution]
+                                                ) -> List[ContributionError]:
+        errors = []
+        rows = []
+        for index, contribution in enumerate(contributions):
+            try:
+                rows.append(cls._contribution_row(index, contribution))
+            except ValueError as error:
+                errors.append(cls.ContributionError(contribution, str(error)))
+        new_rows, obsolete_contribution_ids = await cls._diff_contributions(
+            tx, source_record_uid, rows)
+        if not new_rows and not obsolete_contribution_ids:
+            return errors
+        result = await tx.run(
+            load_query("update_source_record_contributions"),
             source_record_uid=source_record_uid,
-            contributor_uid=source_contribution.contributor.uid,
-            role=source_contribution.role.name if source_contribution.role else None,
-            rank=source_contribution.rank,
-            affiliation_uids=[affiliation.uid for affiliation in source_contribution.affiliations]
+            obsolete_contribution_ids=obsolete_contribution_ids,
+            contributions=new_rows
         )
+        record = await result.single()
+        created_indexes = set(record["created_indexes"]) if record else set()
+        for row in new_rows:
+            if row["index"] not in created_indexes:
+                errors.append(cls.ContributionError(
+                    contributions[row["index"]],
+                    f"Source record {source_record_uid} or contributor "
+                    f"{row['contributor_uid']} not found"))
+        return errors
+
+    @classmethod
+    async def _diff_contributions(cls, tx: AsyncManagedTransaction, source_record_uid: str,
+                                  rows: list[dict]) -> tuple[list[dict], list[str]]:
+        """
+        Compare the contribution rows of a source record with its stored contributions
+        :return: the rows without identical stored contribution,
+                 and the ids of the stored contributions matching no row
+        """
+        result = await tx.run(
+            load_query("get_source_record_contributions"),
+            source_record_uid=source_record_uid
+        )
+        existing_contribution_ids: dict[tuple, list[str]] = {}
+        async for record in result:
+            existing_contribution_ids.setdefault(
+                cls._contribution_signature(record), []
+            ).append(record["contribution_id"])
+        new_rows = []
+        for row in rows:
+            matching_ids = existing_contribution_ids.get(cls._contribution_signature(row))
+            if matching_ids:
+                matching_ids.pop()
+            else:
+                new_rows.append(row)
+        obsolete_contribution_ids = [contribution_id
+                                     for contribution_ids in existing_contribution_ids.values()
+                                     for contribution_id in contribution_ids]
+        return new_rows, obsolete_contribution_ids
+
+    @staticmethod
+    def _contribution_row(index: int, source_contribution: SourceContribution) -> dict:
+        if not source_contribution.contributor.uid:
+            raise ValueError("Contributor uid is missing")
+        return {
+            "index": index,
+            "contributor_uid": source_contribution.contributor.uid,
+            "role": source_contribution.role.name if source_contribution.role else None,
+            "rank": source_contribution.rank,
+            "affiliation_uids": [affiliation.uid
+                                 for affiliation in source_contribution.affiliations
+                                 if affiliation.uid],
+        }
+
+    @staticmethod
+    def _contribution_signature(contribution) -> tuple:
+        return (contribution["contributor_uid"],
+                contribution["rank"],
+                contribution["role"],
+                tuple(sorted(set(contribution["affiliation_uids"]))))
 
     @staticmethod
     async def _source_record_exists(tx: AsyncManagedTransaction, source_record_uid: str) -> bool:
@@ -317,12 +453,26 @@ class SourceRecordDAO(Neo4jDAO):
             return cls._hydrate(record)
         return None
 
+    @classmethod
+    async def _get_source_records_by_uids(cls, tx: AsyncManagedTransaction,
+                                          source_record_uids: List[str]) -> List[SourceRecord]:
+        query = load_query("get_source_records_by_uids")
+        result = await tx.run(query, source_record_uids=source_record_uids)
+        return [cls._hydrate(record) async for record in result]
+
     @classmethod
     async def _get_all_uids_transaction(cls, tx: AsyncManagedTransaction) -> List[str]:
         query = load_query("get_all_source_record_uids")
         result = await tx.run(query)
         return [record['uid'] async for record in result]
 
+    @classmethod
+    async def _get_existing_uids_transaction(cls, tx: AsyncManagedTransaction,
+                                             source_record_uids: List[str]) -> set[str]:
+        query = load_query("get_existing_source_record_uids")
+        result = await tx.run(query, source_record_uids=source_record_uids)
+        return {record['uid'] async for record in result}
+
     @classmethod
     async def _create_source_record_transaction(cls, tx: AsyncManagedTransaction,
                                                 source_record: SourceRecord,
@@ -373,23 +523,38 @@ class SourceRecordDAO(Neo4jDAO):
                 else None
             )
         )
+        await cls._refresh_publication_identifiers_cardinality(
+            tx, [identifier.dict() for identifier in source_record.identifiers])
 
     @classmethod
     async def _update_source_record_transaction(cls, tx: AsyncManagedTransaction,
                                                 source_record: SourceRecord,
                                                 harvested_for: Person,
-                                                identifier_used: PersonIdentifier
+                                                identifier_used: PersonIdentifier,
+                                                stored_source_record: SourceRecord | None = None
                                                 ) -> Tuple[
         str, Neo4jDAO.Status, UpdateStatus | None]:
+        # the stored snapshot is passed through by update()
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
         if not source_record.uid:
             raise ValueError(f"Unable to compute primary key for source record {source_record}")
         if harvested_for is None:
             raise ValueError(
                 f"Source record {source_record} must be related to a person"
                 "on behalf of whom it was harvested")
-        source_record_exists = await SourceRecordDAO._source_record_exists(tx, source_record.uid)
-        if not source_record_exists:
+        # contributors and affiliations are shared nodes, overwritten when they are registered :
+        # only a snapshot taken before can tell whether they have changed
+        existing_source_record = stored_source_record \
+            or await cls._get_source_record_by_uid(tx, source_record.uid)
+        if existing_source_record is None:
             raise ValueError(f"Source record with uid {source_record.uid} does not exist")
+        update_status = cls._compute_update_status(existing_source_record, source_record,
+                                                   harvested_for)
+        # identifiers removed from the source record also need their cardinality refreshed
+        result = await tx.run(load_query("get_source_record_publication_identifiers"),
+                              source_record_uid=source_record.uid)
+        previous_identifiers = [{"type": record["type"], "value": record["value"]}
+                                async for record in result]
         update_source_record_query = load_query("update_source_record")
         issue = source_record.issue.model_dump() if source_record.issue else None
         if issue:
@@ -424,17 +589,98 @@ class SourceRecordDAO(Neo4jDAO):
                 else None
             )
         )
-        return source_record.uid, SourceRecordDAO.Status.UPDATED, None
+        await cls._refresh_publication_identifiers_cardinality(
+            tx,
+            previous_identifiers + [identifier.dict() for identifier in source_record.identifiers])
+        return source_record.uid, SourceRecordDAO.Status.UPDATED, update_status
 
     @classmethod
-    async def _get_source_records_with_shared_identifier_uids(cls, tx: AsyncManagedTransaction,
-                                                              source_record_uid: str):
+    def _compute_update_status(cls, existing_source_record: SourceRecord,
+                               source_record: SourceRecord,
+                               harvested_for: Person) -> UpdateStatus:
+        return SourceRecordDAO.UpdateStatus(
+            identifiers_changed={(identifier.type, identifier.value)
+                                 for identifier in existing_source_record.identifiers}
+                                != {(identifier.type, identifier.value)
+                                    for identifier in source_record.identifiers},
+            titles_changed={(title.value.strip(), title.language)
+                            for title in existing_source_record.titles}
+                           != {(title.value.strip(), title.language)
+                               for title in source_record.titles},
+            # contributors are mapped to the people the source record was harvested for,
+            # so a new harvested for person is also a change of the contributors
+            contributors_changed=(
+                    harvested_for.uid not in existing_source_record.harvested_for_uids
+                    or cls._contributors_signature(existing_source_record)
+                    != cls._contributors_signature(source_record)),
+            issue_changed=cls._issue_signature(existing_source_record)
+                          != cls._issue_signature(source_record),
+            custom_metadata_changed=cls._custom_metadata_signature(existing_source_record)
+                                    != cls._custom_metadata_signature(source_record)
+        )
+
+    @staticmethod
+    def _contributors_signature(source_record: SourceRecord) -> list[tuple]:
+        # people and authority organizations are matched on the contributor
+        # and affiliation identifiers, so they are part of the signature
+        return sorted(
+            (contribution.contributor.uid or "",
+             contribution.contributor.name or "",
+             contribution.rank if contribution.rank is not None else -1,
+             contribution.role.name if contribution.role else "",
+             SourceRecordDAO._identifiers_signature(contribution.contributor.identifiers),
+             tuple(sorted((affiliation.uid or "",
+                           SourceRecordDAO._identifiers_signature(affiliation.identifiers))
+                          for affiliation in contribution.affiliations)))
+            for contribution in source_record.contributions
+        )
+
+    @staticmethod
+    def _identifiers_signature(identifiers: list) -> tuple:
+        return tuple(sorted((identifier.type, identifier.value) for identifier in identifiers))
+
+    @staticmethod
+    def _issue_signature(source_record: SourceRecord) -> tuple | None:
+        issue = source_record.issue
+        if issue is None:
+            return None
+        return (issue.journal.uid if issue.journal else None,
+                issue.volume,
+                tuple(issue.number or []))
+
+    @staticmethod
+    def _custom_metadata_signature(source_record: SourceRecord) -> tuple | None:
+        if not isinstance(source_record.custom_metadata, HalCustomMetadata):
+            return None
+        return (source_record.custom_metadata.hal_submit_type,
+                tuple(sorted(source_record.custom_metadata.hal_collection_codes or [])))
+
+    @staticmethod
+    async def _refresh_publication_identifiers_cardinality(tx: AsyncManagedTransaction,
+                                                           identifiers: list[dict]) -> None:
+        if not identifiers:
+            return
+        settings = get_app_settings()
+        await tx.run(
+            load_query("refresh_publication_identifiers_cardinality"),
+            identifiers=[{"type": identifier["type"], "value": identifier["value"]}
+                         for identifier in identifiers],
+            fan_out_ceilings=settings.publication_identifier_fan_out_ceilings,
+            default_fan_out_ceiling=settings.publication_identifier_default_fan_out_ceiling
+        )
+
+    @classmethod
+    async def _get_equivalence_components(cls, tx: AsyncManagedTransaction,
+                                          source_record_uid: str
+                                          ) -> Tuple[List[str], List[str]]:
         result = await tx.run(
-            load_query("get_source_records_with_shared_identifier_uids"),
+            load_query("get_source_record_equivalence_components"),
             source_record_uid=source_record_uid
         )
         record = await result.single()
-        return record["uids"] if record else []
+        if not record:
+            return [source_record_uid], [source_record_uid]
+        return record["shared_identifier_uids"], record["inferred_equivalent_uids"]
 
     @classmethod
     async def _get_source_records_equivalent_uids(cls, tx: AsyncManagedTransaction,
@@ -457,14 +703,16 @@ class SourceRecordDAO(Neo4jDAO):
         return record["uids"] if record else []
 
     @classmethod
-    async def _delete_inferred_equivalence_relationships(cls, tx: AsyncManagedTransaction,
-                                                         source_record_uid: str,
-                                                         target_source_record_uids: list[str]):
-        await tx.run(
-            load_query("delete_inferred_equivalence_relationships"),
-            source_record_uid=source_record_uid,
-            target_source_record_uids=target_source_record_uids
-        )
+    async def _update_inferred_equivalence_component(cls, tx: AsyncManagedTransaction,
+                                                     source_record_uids: list[str],
+                                                     detached_source_record_uids: list[str]):
+        if detached_source_record_uids:
+            await tx.run(
+                load_query("delete_inferred_equivalence_relationships_between"),
+                source_record_uids=detached_source_record_uids,
+                target_source_record_uids=source_record_uids
+            )
+        await cls._create_inferred_equivalence_relationships(tx, source_record_uids)
 
     @classmethod
     async def _create_inferred_equivalence_relationships(cls, tx: AsyncManagedTransaction,
@@ -1,17 +1,12 @@
-import os
-from typing import cast
-
 from typing_extensions import LiteralString
 
+from app.graph.neo4j.query_registry import QueryRegistry
+
 
 def load_query(query_name: LiteralString) -> LiteralString:
     """
-    Load a cypher query from the queries directory
+    Get a cypher query of the queries directory from the query registry
     :param query_name: The name of the query
     :return: The cypher query
     """
-    queries_dir = os.path.join(os.path.dirname(__file__), 'queries')
-    query_path = os.path.join(queries_dir, f'{query_name}.cypher')
-    with open(query_path, 'r', encoding='utf8') as query_file:
-        file_content = query_file.read()
-        return cast(LiteralString, file_content)
+    return QueryRegistry.get(query_name).text
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import uuid
 from datetime import datetime
 from typing import List, Optional
@@ -30,6 +32,7 @@ class Document(BaseModel):
     publication_channels: List[DocumentPublicationChannel] = []
     open_access_status: OpenAccessStatus = OpenAccessStatus()
     type: str = "Document"
+    content_fingerprint: Optional[str] = None
 
     _publication_date: Optional[str] = None
     _publication_date_start: Optional[datetime] = None
@@ -45,6 +48,29 @@ class Document(BaseModel):
             values["uid"] = str(uuid.uuid4())
         return values
 
+    def compute_content_fingerprint(self) -> str:
+        """
+        Compute a stable hash of the content of the document computed from its source records
+
+        Workflow flags, contributions (written separately) and the open access
+        computation timestamp are left out.
+        :return: the content fingerprint
+        """
+        content = self.model_dump(
+            mode="json",
+            exclude={"uid", "to_be_recomputed", "to_be_deleted", "to_be_merged_into_uid",
+                     "contributions", "publication_channels", "content_fingerprint"}
+        )
+        content["open_access_status"].pop("oa_computation_timestamp", None)
+        content["source_record_uids"] = sorted(self.source_record_uids or [])
+        content["publication_date"] = self.publication_date
+        content["publication_channels"] = [
+            [channel.publication_channel.uid, channel.volume, channel.issue, channel.pages]
+            for channel in self.publication_channels
+        ]
+        serialized = json.dumps(content, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(serialized.encode("utf8")).hexdigest()
+
     @property
     def publication_date(self) -> Optional[str]:
         """
@@ -1,7 +1,13 @@
-from fastapi import status, APIRouter
+from fastapi import status, APIRouter, Request
 from loguru import logger
 from pydantic import BaseModel
 
+from app.config import get_app_settings
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.services.authority_organizations.authority_organization_service import \
+    AuthorityOrganizationService
+from app.services.documents.document_service import DocumentService
+
 
 class HealthCheck(BaseModel):
     """Response model to validate and return when performing a health check."""
@@ -9,6 +15,47 @@ class HealthCheck(BaseModel):
     status: str = "OK"
 
 
+class GraphPoolStatistics(BaseModel):
+    """Response model for the graph database connexion pool statistics."""
+
+    driver_open: bool
+    drivers_created: int
+    active_leases: int
+    total_leases: int
+    max_connection_pool_size: int
+    connections: int
+    connections_in_use: int
+
+
+class CacheStatistics(BaseModel):
+    """Response model for the statistics of an in-process cache."""
+
+    size: int
+    max_size: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class SchedulerStatistics(BaseModel):
+    """Response model for the statistics of an in-process debounced scheduler."""
+
+    pending: int
+    running: int
+    requested: int
+    coalesced: int
+    completed: int
+    failed: int
+
+
+class AMQPQueueStatistics(BaseModel):
+    """Response model for the depths of the inner AMQP message queues."""
+
+    queue_depths: dict[str, list[int]]
+
+
 router = APIRouter()
 
 
@@ -30,3 +77,84 @@ async def get_health() -> HealthCheck:
     """
     logger.info("Health check performed")
     return HealthCheck(status="OK")
+
+
+@router.get(
+    "/graph",
+    tags=["healthcheck"],
+    summary="Get graph database connexion pool statistics",
+    response_description="Return the connexion pool statistics",
+    status_code=status.HTTP_200_OK,
+    response_model=GraphPoolStatistics,
+)
+async def get_graph_pool_statistics() -> GraphPoolStatistics:
+    """
+    ## Get graph database connexion pool statistics
+    Endpoint to monitor the shared graph database driver.
+
+    Returns:
+        GraphPoolStatistics: Returns a JSON response with the pool statistics
+    """
+    settings = get_app_settings()
+    factory = AbstractDAOFactory().get_dao_factory(settings.graph_db)
+    return GraphPoolStatistics(**factory.get_pool_statistics())
+
+
+@router.get(
+    "/authority-organizations-cache",
+    tags=["healthcheck"],
+    summary="Get authority organization resolution cache statistics",
+    response_description="Return the cache statistics",
+    status_code=status.HTTP_200_OK,
+    response_model=CacheStatistics,
+)
+async def get_authority_organization_cache_statistics() -> CacheStatistics:
+    """
+    ## Get authority organization resolution cache statistics
+    Endpoint to monitor the hit ratio of the cache of authority organizations
+    resolved from source organization clusters.
+
+    Returns:
+        CacheStatistics: Returns a JSON response with the cache statistics
+    """
+    return CacheStatistics(**AuthorityOrganizationService.resolution_cache_statistics())
+
+
+@router.get(
+    "/document-recomputations",
+    tags=["healthcheck"],
+    summary="Get scheduled document recomputations statistics",
+    response_description="Return the scheduler statistics",
+    status_code=status.HTTP_200_OK,
+    response_model=SchedulerStatistics,
+)
+async def get_document_recomputation_statistics() -> SchedulerStatistics:
+    """
+    ## Get scheduled document recomputations statistics
+    Endpoint to monitor how many document recomputations are pending
+    and how many requests have been coalesced.
+
+    Returns:
+        SchedulerStatistics: Returns a JSON response with the scheduler statistics
+    """
+    return SchedulerStatistics(**DocumentService.recomputation_scheduler_statistics())
+
+
+@router.get(
+    "/amqp-queues",
+    tags=["healthcheck"],
+    summary="Get AMQP inner queues depths",
+    response_description="Return the number of messages waiting in each inner queue",
+    status_code=status.HTTP_200_OK,
+    response_model=AMQPQueueStatistics,
+)
+async def get_amqp_queue_statistics(request: Request) -> AMQPQueueStatistics:
+    """
+    ## Get AMQP inner queues depths
+    Endpoint to monitor the messages waiting for a worker, by topic,
+    with one value per shard for the topics routed by key.
+
+    Returns:
+        AMQPQueueStatistics: Returns a JSON response with the queue depths
+    """
+    return AMQPQueueStatistics(queue_depths=request.app.amqp_interface.queue_depths())
@@ -28,8 +28,7 @@ class AuthorityOrganizationLocationService:
         state = await auth_org_dao.get_authority_organization_state_by_uid(state_uid)
 
         source_org_dao = self._get_source_org_dao()
-        source_orgs = [await source_org_dao.get_by_uid(uid) for uid
-                       in state.source_organization_uids]
+        source_orgs = await source_org_dao.get_many_by_uids(state.source_organization_uids)
 
         address_list = []
         place_list = []
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from collections import defaultdict
+from contextvars import ContextVar
 from typing import Dict, List, Set, Optional
 
 from app.config import get_app_settings
@@ -15,6 +18,10 @@ from app.models.literal import Literal
 from app.models.source_organization_identifiers import SourceOrganizationIdentifier
 from app.models.source_organizations import SourceOrganization
 from app.signals import authority_organisation_state_updated
+from app.utils.cache.lru_ttl_cache import LruTtlCache
+
+# set while a cluster is being resolved to fill the resolution cache
+_resolving_cluster: ContextVar[bool] = ContextVar("resolving_cluster", default=False)
 
 
 class AuthorityOrganizationService:
@@ -23,10 +30,107 @@ class AuthorityOrganizationService:
     then get-or-create states in Neo4j.
     """
 
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-return-statements
+    # resolved roots by source organization cluster signature, shared by all the instances
+    _resolution_cache: LruTtlCache[AuthorityOrganizationRoot] | None = None
+
     async def get_or_create_authority_organization(
             self,
             source_org_cluster: List[SourceOrganization],
+    ) -> AuthorityOrganizationRoot:
+        """
+        Get the AuthorityOrganizationRoot of a source-org cluster from the resolution cache,
+        or build and get-or-create it in Neo4j if the cluster has not been resolved recently.
+
+        Cached roots are invalidated when one of their states is attached to another root,
+        or updated outside of a resolution.
+        """
+        cache = self._get_resolution_cache()
+        signature = self.cluster_signature(source_org_cluster)
+        cached_root = cache.get(signature)
+        if cached_root is not None:
+            return cached_root.model_copy(deep=True)
+        resolving_token = _resolving_cluster.set(True)
+        try:
+            root = await self._get_or_create_authority_organization(source_org_cluster)
+        finally:
+            _resolving_cluster.reset(resolving_token)
+        state_uids = [state.uid for state in root.states if state.uid]
+        cache.put(signature, root.model_copy(deep=True),
+                  tags=state_uids + ([root.uid] if root.uid else []))
+        return root
+
+    @classmethod
+    async def invalidate_cached_resolutions(cls, _sender, state_uid: str, **_) -> None:
+        """
+        Remove from the resolution cache the roots depending on an updated state
+        (receiver of the authority_organisation_state_updated signal)
+
+        The updates signaled while resolving a cluster are ignored : they merge identifiers
+        and names into a state without changing its uid, so the roots cached for the other
+        clusters of the state are still valid, and the moves of states between roots
+        are invalidated by _invalidate_moved_states.
+        Otherwise, two variants of the same cluster sharing a state would evict
+        each other at each resolution.
+
+        :param state_uid: uid of the updated state
+        :return: None
+        """
+        if _resolving_cluster.get():
+            return
+        cls._get_resolution_cache().invalidate_tag(state_uid)
+
+    @classmethod
+    def resolution_cache_statistics(cls) -> dict:
+        """
+        Get the size and the hit and miss counters of the resolution cache
+
+        :return: dictionary of statistics
+        """
+        return cls._get_resolution_cache().statistics()
+
+    @classmethod
+    def clear_resolution_cache(cls) -> None:
+        """
+        Remove all the roots from the resolution cache, e.g. after a reset of the graph
+
+        :return: None
+        """
+        cls._get_resolution_cache().clear()
+
+    @staticmethod
+    def cluster_signature(source_org_cluster: List[SourceOrganization]) -> str:
+        """
+        Compute a signature of the content of a source-org cluster :
+        two clusters with the same signature resolve to the same root.
+
+        :param source_org_cluster: cluster of source organizations
+        :return: signature
+        """
+        content = sorted(
+            (
+                source_org.uid,
+                source_org.name,
+                source_org.type.value,
+                sorted((identifier.type, identifier.value)
+                       for identifier in source_org.identifiers),
+            )
+            for source_org in source_org_cluster
+        )
+        return hashlib.sha1(json.dumps(content).encode("utf8")).hexdigest()
+
+    @classmethod
+    def _get_resolution_cache(cls) -> LruTtlCache[AuthorityOrganizationRoot]:
+        if cls._resolution_cache is None:
+            settings = get_app_settings()
+            cls._resolution_cache = LruTtlCache(
+                max_size=settings.authority_organization_cache_size,
+                ttl=settings.authority_organization_cache_ttl)
+        return cls._resolution_cache
+
+    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-return-statements
+    async def _get_or_create_authority_organization(
+            self,
+            source_org_cluster: List[SourceOrganization],
     ) -> AuthorityOrganizationRoot:
         """
         Build AuthorityOrganizationRoot + AuthorityOrganizationState(s) from a source-org cluster.
@@ -80,65 +184,53 @@ class AuthorityOrganizationService:
             in_memory_root.uid = None
             return in_memory_root
 
-        roots = await dao.find_organization_roots_of_states(cluster_state_uids)
-        if len(roots) == 0:
-            # if no root exists yet, create one and link it to states
-            new_root_uid = await dao.create_authority_organization_root(in_memory_root)
-            await dao.attach_authority_organization_states_to_root(
-                root_uid=new_root_uid,
-                state_uids=[s.uid for s in in_memory_root.states if s.uid],
-            )
-            return await dao.get_authority_organization_root_by_uid(new_root_uid)
-        if len(roots) == 1:
-            root_uid = roots[0]
-            attached = await dao.get_organization_states_of_root(root_uid)
-            # if the root has states that are not in the cluster, create a new root
-            if any(uid not in cluster_state_uids for uid in attached):
-                new_root_uid = await dao.create_authority_organization_root(in_memory_root)
-                await dao.attach_authority_organization_states_to_root(
-                    root_uid=new_root_uid,
-                    state_uids=[s.uid for s in in_memory_root.states if s.uid],
-                )
-                return await dao.get_authority_organization_root_by_uid(new_root_uid)
-            # case where all attached states are in the cluster:
-            # reuse existing root
-            await dao.attach_authority_organization_states_to_root(
-                root_uid=root_uid,
-                state_uids=[s.uid for s in in_memory_root.states if s.uid],
-            )
-            # overwrite other root properties
-            in_memory_root.uid = root_uid
-            return await dao.update_authority_organization_root(in_memory_root)
-        # case of multiple roots found for the same cluster
-        states_by_root: Dict[str, List[str]] = {}
-        for root_uid in roots:
-            attached = await dao.get_organization_states_of_root(root_uid)
-            states_by_root[root_uid] = attached
-        # we will choose the root having the largest number of attached states
-        # among those whose states are all in the cluster
-        # order roots by number of attached states (descending)
+        candidate_roots = await dao.find_candidate_roots_of_states(cluster_state_uids)
+        in_memory_root.uid = self._elect_root(candidate_roots, cluster_state_uids)
+        # if no root was elected, a new one is created
+        root = await dao.save_authority_organization_root_with_states(
+            in_memory_root,
+            [s.uid for s in in_memory_root.states if s.uid],
+        )
+        self._invalidate_moved_states(candidate_roots, root.uid, cluster_state_uids)
+        return root
+
+    @classmethod
+    def _invalidate_moved_states(cls, candidate_roots: Dict[str, List[str]], root_uid: str,
+                                 cluster_state_uids: List[str]) -> None:
+        """
+        Remove from the resolution cache the roots depending on states attached to a root
+        they were not attached to, or on their previous roots, as these moves are not signaled
+        :param candidate_roots: attached state uids by root uid, before saving the root
+        :param root_uid: uid of the saved root
+        :param cluster_state_uids: uids of the states attached to the saved root
+        :return: None
+        """
+        if list(candidate_roots) == [root_uid] \
+                and set(candidate_roots[root_uid]) == set(cluster_state_uids):
+            return
+        cache = cls._get_resolution_cache()
+        for tag in [*cluster_state_uids, *candidate_roots, root_uid]:
+            cache.invalidate_tag(tag)
+
+    @staticmethod
+    def _elect_root(candidate_roots: Dict[str, List[str]],
+                    cluster_state_uids: List[str]) -> Optional[str]:
+        """
+        Choose, among the roots of the cluster states, the root having the largest number
+        of attached states among those whose states are all in the cluster.
+        :param candidate_roots: attached state uids by root uid
+        :param cluster_state_uids: uids of the states of the cluster
+        :return: the uid of the elected root, or None if a new root is needed
+        """
         sorted_roots = sorted(
-            states_by_root.items(),
+            candidate_roots.items(),
             key=lambda item: len(item[1]),
             reverse=True,
         )
         for root_uid, attached in sorted_roots:
             if all(uid in cluster_state_uids for uid in attached):
-                # found a root whose states are all in the cluster
-                await dao.attach_authority_organization_states_to_root(
-                    root_uid=root_uid,
-                    state_uids=[s.uid for s in in_memory_root.states if s.uid],
-                )
-                in_memory_root.uid = root_uid
-                await dao.update_authority_organization_root(in_memory_root)
-                return await dao.get_authority_organization_root_by_uid(root_uid)
-        # no suitable root found, create a new one
-        new_root_uid = await dao.create_authority_organization_root(in_memory_root)
-        await dao.attach_authority_organization_states_to_root(
-            root_uid=new_root_uid,
-            state_uids=[s.uid for s in in_memory_root.states if s.uid],
-        )
-        return await dao.get_authority_organization_root_by_uid(new_root_uid)
+                return root_uid
+        return None
 
     @classmethod
     def split_cluster_into_root_and_states(
@@ -21,10 +21,7 @@ class ConceptService:
         """
         factory = self._get_dao_factory()
         dao: ConceptDAO = factory.get_dao(Concept)
-        if not concept.uri:
-            if len(concept.pref_labels) > 1 or concept.alt_labels:
-                raise ValueError(
-                    "Concept with more than one pref_label or with alt_labels should have an uri")
+        self._check_concept(concept)
         existing_concept = await dao.find_by_uid(concept.uid)
         # case when the concept already exists in the database
         if existing_concept:
@@ -45,8 +42,59 @@ class ConceptService:
                 await self._update_concept(existing_concept, concept, dao)
             return existing_concept
 
+    async def create_or_update_concepts(self, concepts: list[Concept]) -> list[Concept]:
+        """
+        Create or update several concepts with a single lookup query and a single
+        batched write, following the same rules as create_or_update_concept.
+        Invalid concepts are logged and skipped.
+        :param concepts: Pydantic Concept objects
+        :return: the registered concepts, in the order of the valid input concepts
+        """
+        factory = self._get_dao_factory()
+        dao: ConceptDAO = factory.get_dao(Concept)
+        valid_concepts = []
+        for concept in concepts:
+            try:
+                self._check_concept(concept)
+                valid_concepts.append(concept)
+            except ValueError as e:
+                logger.error(f"Invalid data error while creating or updating concept {concept} :"
+                             f" {e}")
+        existing_concepts = await dao.find_by_uids([concept.uid for concept in valid_concepts])
+        registered_concepts: dict[str, Concept] = {}
+        concepts_to_write: dict[str, Concept] = {}
+        for concept in valid_concepts:
+            registered_concept = registered_concepts.get(concept.uid) \
+                                 or existing_concepts.get(concept.uid)
+            if registered_concept is None:
+                registered_concepts[concept.uid] = concept
+                concepts_to_write[concept.uid] = concept
+                continue
+            # concepts without uri cannot be updated
+            # as they don't carry any information apart from their unique pref_label
+            if concept.uri:
+                # existing concepts are kept intact to compute the labels to delete
+                registered_concept = registered_concept.model_copy(deep=True)
+                self._merge_labels(registered_concept, concept)
+                concepts_to_write[concept.uid] = registered_concept
+            registered_concepts[concept.uid] = registered_concept
+        await dao.create_or_update_many(list(concepts_to_write.values()), existing_concepts)
+        return [registered_concepts[concept.uid] for concept in valid_concepts]
+
+    @staticmethod
+    def _check_concept(concept: Concept) -> None:
+        if not concept.uri:
+            if len(concept.pref_labels) > 1 or concept.alt_labels:
+                raise ValueError(
+                    "Concept with more than one pref_label or with alt_labels should have an uri")
+
     async def _update_concept(self, existing_concept: Concept, new_concept: Concept,
                               dao: ConceptDAO) -> None:
+        self._merge_labels(existing_concept, new_concept)
+        await dao.update(existing_concept)
+
+    @staticmethod
+    def _merge_labels(existing_concept: Concept, new_concept: Concept) -> None:
         for pref_label in new_concept.pref_labels:
             # if the pref_label already exists in the concept, update it
             if any(
@@ -70,7 +118,6 @@ class ConceptService:
                     for existing_alt_label in existing_concept.alt_labels
             ):
                 existing_concept.alt_labels.append(alt_label)
-        await dao.update(existing_concept)
 
     async def get_concept(self, uid: str) -> Concept:
         """
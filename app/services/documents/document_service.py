@@ -1,6 +1,8 @@
 from itertools import combinations
 from typing import cast
 
+from loguru import logger
+
 from app.config import get_app_settings
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
 from app.graph.generic.dao_factory import DAOFactory
@@ -17,6 +19,8 @@ from app.services.source_contributors.source_contributor_mapping_service import
 from app.services.source_records.equivalence_service import EquivalenceService
 from app.signals import document_updated, document_created, \
     document_unchanged, document_deleted
+from app.utils.concurrency.debounced_scheduler import DebouncedScheduler
+from app.utils.concurrency.priority_scheduler import current_priority_lane
 
 
 class DocumentService:
@@ -24,16 +28,91 @@ class DocumentService:
     Service to handle operations on publication data
     """
 
-    async def update_from_source_records(self, _, document_uid: str):
+    # shared by all the instances so that all the requests of the process are coalesced
+    _recomputation_scheduler: DebouncedScheduler | None = None
+
+    async def schedule_update_from_source_records(
+            self, _, document_uid: str,
+            update_status: SourceRecordDAO.UpdateStatus | None = None):
+        """
+        Request the recomputation of an existing document whose source records have changed
+
+        The requests received for a document within the quiet window are coalesced
+        into a single recomputation, served with the priority of the topic
+        whose message requested it. Waits while too many recomputations are pending.
+        :param _: unused (for compatibility with signal handlers)
+        :param document_uid: the document uid
+        :param update_status: the fields that have changed in the source records
+                              of the document, None to recompute everything
+        :return:
+        """
+        if get_app_settings().document_recomputation_quiet_window <= 0:
+            await self.update_from_source_records(_, document_uid, update_status)
+            return
+        await self._get_recomputation_scheduler().schedule(document_uid, update_status,
+                                                           lane=current_priority_lane.get())
+
+    async def recompute_flagged_documents(self, batch_size: int | None = None) -> int:
+        """
+        Request the recomputation of the documents still flagged to be recomputed,
+        e.g. whose scheduled recomputation was lost when the process stopped
+
+        The flag is cleared by the recomputation, so that a document is recomputed
+        at least once after its source records have changed.
+        :param batch_size: number of documents fetched at once,
+                           defaults to the document_recomputation_sweep_batch_size setting
+        :return: the number of documents requested to be recomputed
+        """
+        batch_size = batch_size or get_app_settings().document_recomputation_sweep_batch_size
+        dao: DocumentDAO = cast(DocumentDAO, self._get_dao_factory().get_dao(Document))
+        scheduler = self._get_recomputation_scheduler()
+        requested = 0
+        after_uid = ""
+        while document_uids := await dao.get_document_uids_to_be_recomputed(after_uid,
+                                                                            batch_size):
+            for document_uid in document_uids:
+                # documents already scheduled by the messages being processed are skipped
+                if not scheduler.scheduled(document_uid):
+                    await self.schedule_update_from_source_records(None, document_uid)
+                    requested += 1
+            after_uid = document_uids[-1]
+        logger.info(f"{requested} documents flagged to be recomputed have been requested")
+        return requested
+
+    @classmethod
+    async def drain_scheduled_recomputations(cls) -> None:
+        """
+        Run the scheduled document recomputations without waiting for their quiet window
+        :return:
+        """
+        if cls._recomputation_scheduler is not None:
+            await cls._recomputation_scheduler.drain()
+
+    @classmethod
+    def recomputation_scheduler_statistics(cls) -> dict:
+        """
+        Get the statistics of the scheduled document recomputations
+        :return: dictionary of statistics
+        """
+        return cls._get_recomputation_scheduler().statistics()
+
+    async def update_from_source_records(
+            self, _, document_uid: str,
+            update_status: SourceRecordDAO.UpdateStatus | None = None):
         """
         Recompute metadata for an existing document
         :param _: unused (for compatibility with signal handlers)
         :param document_uid: the document uid
+        :param update_status: the fields that have changed in the source records
+                              of the document, None to recompute everything
         :return:
         """
-        to_be_deleted = not await self._compute_document_from_source_records(document_uid)
-        if to_be_deleted:
+        status = await self._compute_document_from_source_records(document_uid, update_status)
+        if status == DocumentDAO.Status.DELETED:
             await self.signal_document_deleted(document_uid)
+        elif status == DocumentDAO.Status.UNCHANGED:
+            if get_app_settings().signal_unchanged_documents:
+                await self.signal_document_unchanged(document_uid)
         else:
             await self.signal_document_updated(document_uid)
 
@@ -86,20 +165,43 @@ class DocumentService:
         svc = EquivalenceService()
         await svc.update_source_record(self, representative_uid)
 
-    async def _compute_document_from_source_records(self, document_uid) -> bool:
+    async def _compute_document_from_source_records(
+            self, document_uid,
+            update_status: SourceRecordDAO.UpdateStatus | None = None) -> DocumentDAO.Status:
         """
         Compute the metadata of a document from its source records
+
+        If the changed fields of the source records are known, the stages whose inputs
+        have not changed are skipped and their previous results are kept.
+        If the computed content has the fingerprint of the stored one and the contributions
+        have not been remapped, the document is not written again.
         :param document_uid:
-        :return: False if the document should be deleted (i.e. has no source records)
+        :param update_status: the fields that have changed in the source records,
+                              None to recompute everything
+        :return: DELETED if the document should be deleted (i.e. has no source records),
+                 UNCHANGED if the stored document is up to date, UPDATED otherwise
         """
         sources_records = await self._get_source_records_of_document(document_uid)
-        source_contributor_mapping_service = SourceContributorMappingService(
-            source_records=sources_records, document_uid=document_uid)
-        await source_contributor_mapping_service.update_contributions()
+        dao: DocumentDAO = cast(DocumentDAO, self._get_dao_factory().get_dao(Document))
+        previous_document = None
+        if update_status is not None:
+            previous_document = await dao.get_document_by_uid(document_uid)
+        contributions_remapped = previous_document is None or update_status.contributors_changed
+        if contributions_remapped:
+            source_contributor_mapping_service = SourceContributorMappingService(
+                source_records=sources_records, document_uid=document_uid)
+            await source_contributor_mapping_service.update_contributions()
         # delegate the merge operation to the metadata computation service
         document = MetadataComputationService(sources_records).merge()
 
-        document = await OAColorsComputationService(document, sources_records).compute_oa_colors()
+        if (previous_document is None
+                or not previous_document.open_access_status.oa_computed_status
+                or update_status.identifiers_changed
+                or update_status.custom_metadata_changed):
+            document = await OAColorsComputationService(document,
+                                                        sources_records).compute_oa_colors()
+        else:
+            document.open_access_status = previous_document.open_access_status
 
         document.uid = document_uid
         # set it explicitly to False for code clarity although it is the default value
@@ -107,16 +209,29 @@ class DocumentService:
         to_be_deleted = len(sources_records) == 0
         document.to_be_deleted = to_be_deleted
         if to_be_deleted:
-            return False
-        publication_channel: DocumentPublicationChannel = (
-            await JournalService().compute_document_publication_channel(
-                document_uid=document_uid,
-                source_records=sources_records))
-        if publication_channel is not None:
-            document.publication_channels.append(publication_channel)
+            return DocumentDAO.Status.DELETED
+        # a document without publication channel may be resolved since a journal
+        # has been linked in the meantime
+        if (previous_document is None
+                or not previous_document.publication_channels
+                or update_status.issue_changed):
+            publication_channel: DocumentPublicationChannel = (
+                await JournalService().compute_document_publication_channel(
+                    document_uid=document_uid,
+                    source_records=sources_records))
+            if publication_channel is not None:
+                document.publication_channels.append(publication_channel)
+        else:
+            document.publication_channels = previous_document.publication_channels
+        document.source_record_uids = [source_record.uid for source_record in sources_records]
+        document.content_fingerprint = document.compute_content_fingerprint()
+        if (not contributions_remapped
+                and previous_document.content_fingerprint == document.content_fingerprint):
+            await dao.mark_document_recomputed(document_uid)
+            return DocumentDAO.Status.UNCHANGED
         # persist the merged document
-        dao: DocumentDAO = cast(DocumentDAO, self._get_dao_factory().get_dao(Document))
         await dao.create_or_update_document(document)
+        # the merged fields have been overwritten, so the changes are always replayed
         # pylint: disable=fixme
         # TODO : if the document has an entering edge "to_be_merged_into",
         # take all changes from the source document and reapply them to the target
@@ -124,7 +239,7 @@ class DocumentService:
         # pylint: disable=import-outside-toplevel,cyclic-import
         from app.services.changes.change_service import ChangeService
         await ChangeService().apply_changes_to_node(document_uid)
-        return True
+        return DocumentDAO.Status.UPDATED
 
     async def signal_document_updated(self, document_uid):
         """
@@ -164,8 +279,7 @@ class DocumentService:
         sources_record_uids = await (
             source_record_dao.get_source_record_uids_by_document_uid(
                 document_uid))
-        return [await source_record_dao.get(source_record_uid) for source_record_uid in
-                sources_record_uids]
+        return await source_record_dao.get_many(sources_record_uids)
 
     async def get_document(self, document_uid: str) -> Document | None:
         """
@@ -203,6 +317,38 @@ class DocumentService:
         dao: SourceRecordDAO = cast(SourceRecordDAO, factory.get_dao(SourceRecord))
         return dao
 
+    @classmethod
+    def _get_recomputation_scheduler(cls) -> DebouncedScheduler:
+        if cls._recomputation_scheduler is None:
+            settings = get_app_settings()
+            cls._recomputation_scheduler = DebouncedScheduler(
+                cls._run_scheduled_update,
+                merge=cls._merge_update_statuses,
+                limits=DebouncedScheduler.Limits(
+                    quiet_window=settings.document_recomputation_quiet_window,
+                    max_delay=settings.document_recomputation_max_delay,
+                    concurrency=settings.document_recomputation_concurrency,
+                    max_pending=settings.document_recomputation_max_pending,
+                    priorities=settings.amqp_topic_priorities))
+        return cls._recomputation_scheduler
+
+    @classmethod
+    async def _run_scheduled_update(cls, document_uid: str,
+                                    update_status: SourceRecordDAO.UpdateStatus | None):
+        await cls().update_from_source_records(None, document_uid, update_status)
+
+    @staticmethod
+    def _merge_update_statuses(
+            update_status_1: SourceRecordDAO.UpdateStatus | None,
+            update_status_2: SourceRecordDAO.UpdateStatus | None
+    ) -> SourceRecordDAO.UpdateStatus | None:
+        # an unknown change requires a full recomputation
+        if update_status_1 is None or update_status_2 is None:
+            return None
+        return SourceRecordDAO.UpdateStatus(
+            *(changed_1 or changed_2 for changed_1, changed_2 in zip(update_status_1,
+                                                                     update_status_2)))
+
     @staticmethod
     def _get_dao_factory() -> DAOFactory:
         settings = get_app_settings()
@@ -1,6 +1,5 @@
-from typing import List, Type
+from typing import List
 
-from app.config import get_app_settings
 from app.models.book import Book
 from app.models.book_chapter import BookChapter
 from app.models.conference_article import ConferenceArticle
@@ -10,7 +9,7 @@ from app.models.journal_article import JournalArticle
 from app.models.proceedings import Proceedings
 from app.models.source_records import SourceRecord
 from app.services.documents.merge_strategies.abstract_merge_strategy import MergeStrategy
-from app.services.documents.merge_strategies.merge_strategy_factory import MergeStrategyFactory
+from app.services.policies.publication_source_policy import PublicationSourcePolicy
 
 
 class MetadataComputationService:
@@ -32,7 +31,7 @@ class MetadataComputationService:
         :param source_records: the source records to be merged
         """
         self.source_records = source_records
-        self.settings = get_app_settings()
+        self.policy = PublicationSourcePolicy.current()
         self._sort_source_records()
         self._elected_document_type = self._elect_document_type()
         self._elected_strategy = self._elect_strategy()
@@ -47,9 +46,7 @@ class MetadataComputationService:
     def _sort_source_records(self):
         self.source_records = sorted(
             self.source_records,
-            key=lambda x: self._get_harvesters().index(x.harvester.value)
-            if x.harvester.value in self._get_harvesters()
-            else len(self._get_harvesters()))
+            key=lambda x: self.policy.harvester_rank(x.harvester.value))
 
     def _elect_document_type(self) -> List[DocumentTypeEnum]:
         return next(
@@ -72,36 +69,13 @@ class MetadataComputationService:
         :return: MergeStrategy instance
         """
         expected_document_class = self._document_class()
-        for strategy in self._get_strategies():
-            document_type_values = [document_type.value for document_type in
-                                    self._elected_document_type]
-            if any(doc_type in strategy['types'] for doc_type in document_type_values):
-                return self._instantiate_strategy(expected_document_class, strategy)
-        default_strategy = next(
-            (strategy for strategy in self._get_strategies() if 'default' in strategy['types']),
-            None
-        )
-        assert default_strategy is not None, "No default strategy found"
-        return self._instantiate_strategy(expected_document_class, default_strategy)
-
-    def _instantiate_strategy(self, expected_document_class: Type, strategy: dict) -> MergeStrategy:
-        return MergeStrategyFactory[expected_document_class].create_strategy(
-            strategy_type=MergeStrategyFactory.StrategyType(strategy['type']),
+        document_type_values = [document_type.value for document_type in
+                                self._elected_document_type]
+        return self.policy.strategy_for(document_type_values).create(
             source_records=self.source_records,
-            parameters=strategy.get("parameters", {}),
             document_class=expected_document_class,
-            harvesters=strategy.get("harvesters", []),
         )
 
-    def _get_policies(self):
-        return self.settings.publication_source_policies
-
-    def _get_strategies(self):
-        return self._get_policies()['strategies']
-
-    def _get_harvesters(self):
-        return self._get_policies()['harvesters']
-
     def get_elected_strategy(self) -> MergeStrategy:
         """
         Get the elected strategy
@@ -15,6 +15,7 @@ from app.models.journal_identifiers import JournalIdentifier
 from app.models.source_journal import SourceJournal
 from app.models.source_records import SourceRecord
 from app.services.journals.issn_service import ISSNService
+from app.services.policies.publication_source_policy import PublicationSourcePolicy
 
 
 class JournalService:
@@ -117,15 +118,13 @@ class JournalService:
         :param source_records: A list of source records associated with the document.
         :return: DocumentPublicationChannel if a journal is resolved, otherwise None.
         """
-        harvester_priority = self._get_harvesters()
+        policy = PublicationSourcePolicy.current()
         selected_journal = None
         selected_volume = None
         selected_number = None
 
         def record_priority(record: SourceRecord):
-            return harvester_priority.index(record.harvester.value) \
-                if record.harvester.value in harvester_priority \
-                else float('inf')
+            return policy.harvester_rank(record.harvester.value, float('inf'))
 
         sorted_records = sorted(source_records, key=record_priority)
 
@@ -209,11 +208,5 @@ class JournalService:
                 result[journal.uid] = journal
         return result
 
-    def _get_policies(self):
-        return self.settings.publication_source_policies
-
-    def _get_harvesters(self):
-        return list(self._get_policies()['harvesters'])
-
     def _get_dao_factory(self) -> DAOFactory:
         return AbstractDAOFactory().get_dao_factory(self.settings.graph_db)
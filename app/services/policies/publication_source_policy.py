@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Type
+
+import yaml
+from loguru import logger
+
+from app.config import get_app_settings
+from app.models.source_records import SourceRecord
+from app.services.documents.merge_strategies.abstract_merge_strategy import MergeStrategy
+from app.services.documents.merge_strategies.merge_strategy_factory import MergeStrategyFactory
+from app.settings.app_settings import AppSettings
+
+
+class PublicationSourcePolicy:
+    """
+    Publication source policies (publication_sources_policies.yaml) compiled into
+    lookup tables, shared by all the services of the process
+
+    The policy is compiled once on first use and replaced as a whole by reload(),
+    so that a service holding a policy always sees a consistent version of it.
+    """
+
+    DEFAULT_STRATEGY_TYPE = "default"
+    DEFAULT_CONTRIBUTOR_CLUSTERING_ENGINE = "assignment"
+
+    class Strategy(NamedTuple):
+        """
+        Merge strategy definition with its validated type
+        """
+        strategy_type: MergeStrategyFactory.StrategyType
+        parameters: Dict
+        harvesters: List[str]
+
+        def create(self, source_records: List[SourceRecord],
+                   document_class: Type) -> MergeStrategy:
+            """
+            Instantiate the merge strategy for a set of source records
+
+            :param source_records: the source records to merge
+            :param document_class: the pydantic class of the merged document
+            :return: MergeStrategy instance
+            """
+            return MergeStrategyFactory[document_class].create_strategy(
+                strategy_type=self.strategy_type,
+                source_records=source_records,
+                parameters=self.parameters,
+                document_class=document_class,
+                harvesters=self.harvesters,
+            )
+
+    _current: PublicationSourcePolicy | None = None
+
+    def __init__(self, policies: dict):
+        """
+        Compile the policies
+
+        :param policies: the policies as loaded from the yaml file
+        :raises ValueError: if a strategy type is unknown
+        """
+        self.harvesters: List[str] = list(policies['harvesters'])
+        self.harvesting_sources: List[str] = list(policies['harvesting_sources'])
+        self._harvester_ranks = {harvester: rank
+                                 for rank, harvester in enumerate(self.harvesters)}
+        self._harvesting_source_ranks = {source: rank
+                                         for rank, source in enumerate(self.harvesting_sources)}
+        self.contributor_clustering_engine: str = (
+            policies.get('contributor_clustering', {}).get(
+                'engine', self.DEFAULT_CONTRIBUTOR_CLUSTERING_ENGINE)
+        )
+        self._strategies: List[PublicationSourcePolicy.Strategy] = []
+        # index of the first strategy declaring each document type
+        self._strategy_index_by_document_type: Dict[str, int] = {}
+        for index, strategy in enumerate(policies['strategies']):
+            self._strategies.append(PublicationSourcePolicy.Strategy(
+                strategy_type=MergeStrategyFactory.StrategyType(strategy['type']),
+                parameters=strategy.get("parameters", {}),
+                harvesters=strategy.get("harvesters", []),
+            ))
+            for document_type in strategy['types'] or []:
+                self._strategy_index_by_document_type.setdefault(document_type, index)
+
+    @classmethod
+    def current(cls) -> PublicationSourcePolicy:
+        """
+        Get the policy of the process, compiling it from the settings on first call
+
+        :return: the compiled policy
+        """
+        if cls._current is None:
+            cls._current = cls(get_app_settings().publication_source_policies)
+        return cls._current
+
+    @classmethod
+    def reload(cls) -> None:
+        """
+        Read the policies file again and replace the policy of the process
+        (e.g. on SIGHUP). The previous policy is kept if the file is invalid.
+
+        :return: None
+        """
+        policies_file = get_app_settings().publication_source_policies_file
+        try:
+            policy = cls(AppSettings.dct_from_yml(yml_file=policies_file))
+        except (OSError, yaml.YAMLError, ValueError, KeyError, TypeError) as error:
+            logger.error(f"Invalid publication source policies in {policies_file}, "
+                         f"keeping the previous ones : {error}")
+            return
+        cls._current = policy
+        logger.info(f"Publication source policies reloaded from {policies_file}")
+
+    def harvester_rank(self, harvester: str, default: float | None = None) -> float:
+        """
+        Get the rank of a harvester in the harvesters order
+
+        :param harvester: harvester name
+        :param default: rank of unlisted harvesters, after all the listed ones by default
+        :return: the rank
+        """
+        if default is None:
+            default = len(self.harvesters)
+        return self._harvester_ranks.get(harvester, default)
+
+    def harvesting_source_rank(self, source: str, default: float = float('inf')) -> float:
+        """
+        Get the rank of a harvesting source in the harvesting sources order
+
+        :param source: harvesting source name
+        :param default: rank of unlisted sources
+        :return: the rank
+        """
+        return self._harvesting_source_ranks.get(source, default)
+
+    def strategy_for(self, document_types: List[str]) -> PublicationSourcePolicy.Strategy:
+        """
+        Get the first strategy declaring one of the document types,
+        or the default strategy
+
+        :param document_types: the document type values
+        :return: the strategy
+        """
+        indexes = [self._strategy_index_by_document_type[document_type]
+                   for document_type in document_types
+                   if document_type in self._strategy_index_by_document_type]
+        if indexes:
+            return self._strategies[min(indexes)]
+        default_index = self._strategy_index_by_document_type.get(self.DEFAULT_STRATEGY_TYPE)
+        assert default_index is not None, "No default strategy found"
+        return self._strategies[default_index]
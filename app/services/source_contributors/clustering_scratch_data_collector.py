@@ -0,0 +1,52 @@
+import asyncio
+
+from loguru import logger
+
+from app.config import get_app_settings
+from app.errors.database_error import DatabaseError
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.generic.dao_factory import DAOFactory
+from app.graph.neo4j.source_person_dao import SourcePersonDAO
+from app.models.source_people import SourcePerson
+
+
+class ClusteringScratchDataCollector:
+    """
+    Garbage collector for the scratch data left in the graph by contributor clustering
+    """
+
+    async def collect(self, batch_size: int | None = None) -> dict[str, int]:
+        """
+        Delete the stale clustering scratch data by batches
+        :param batch_size: number of entities deleted per transaction,
+                           defaults to the clustering_scratch_gc_batch_size setting
+        :return: number of deleted entities by kind
+        """
+        batch_size = batch_size or get_app_settings().clustering_scratch_gc_batch_size
+        factory = self._get_dao_factory()
+        dao: SourcePersonDAO = factory.get_dao(SourcePerson)
+        counts = await dao.delete_clustering_scratch_data(batch_size)
+        logger.info(f"Clustering scratch data collected : "
+                    f"{counts['source_people_distances']} source people distances, "
+                    f"{counts['computation_origins']} computation origins")
+        return counts
+
+    async def run_periodically(self, interval: int) -> None:
+        """
+        Collect the clustering scratch data at a fixed interval until cancelled
+        :param interval: interval between two collections, in seconds
+        :return: None
+        """
+        while True:
+            try:
+                await self.collect()
+            except DatabaseError as error:
+                # the next run will resume the collection
+                logger.error(f"Database error while collecting clustering scratch data : "
+                             f"{error}")
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def _get_dao_factory() -> DAOFactory:
+        settings = get_app_settings()
+        return AbstractDAOFactory().get_dao_factory(settings.graph_db)
@@ -0,0 +1,134 @@
+import numpy as np
+
+# cost of a couple of contributors that must not be matched
+FORBIDDEN_COST = 1e9
+
+
+class ContributorClustering:
+    """
+    In-memory clustering of the contributors of a document harvested from several
+    source platforms
+
+    Layers of contributors are processed in harvesting sources order : the contributors
+    of each layer are matched to the clusters built from the previous layers by a minimum
+    cost assignment over the distances between the last contributor of each cluster and
+    the contributors of the layer. Unmatched contributors open new clusters.
+    """
+
+    def __init__(self, layers: list[list[str]], distances: dict[str, dict[str, float | None]]):
+        """
+        :param layers: source people uids by source platform, in harvesting sources order
+        :param distances: distances from each source person to the source people
+                          of the subsequent layers, None if they cannot be equivalent
+        """
+        self.layers = layers
+        self.distances = distances
+
+    def clusters(self) -> list[list[str]]:
+        """
+        Compute the clusters of equivalent source people
+        :return: clusters of at least two source people uids, in layers order
+        """
+        clusters: list[list[str]] = []
+        for layer in self.layers:
+            if not layer:
+                continue
+            matched = set()
+            if clusters:
+                cost = np.array([
+                    [self._cost(cluster[-1], source_person_uid) for source_person_uid in layer]
+                    for cluster in clusters
+                ], dtype=np.float64)
+                for cluster_index, layer_index in self.linear_sum_assignment(cost):
+                    if cost[cluster_index, layer_index] >= FORBIDDEN_COST:
+                        continue
+                    clusters[cluster_index].append(layer[layer_index])
+                    matched.add(layer_index)
+            clusters.extend([source_person_uid] for layer_index, source_person_uid
+                            in enumerate(layer) if layer_index not in matched)
+        return [cluster for cluster in clusters if len(cluster) > 1]
+
+    def _cost(self, source_person_uid: str, next_source_person_uid: str) -> float:
+        distance = self.distances.get(source_person_uid, {}).get(next_source_person_uid)
+        return FORBIDDEN_COST if distance is None else distance
+
+    @staticmethod
+    def linear_sum_assignment(cost: np.ndarray) -> list[tuple[int, int]]:
+        """
+        Solve the rectangular linear sum assignment problem
+        (Hungarian algorithm with potentials, O(n²m))
+        :param cost: cost matrix
+        :return: list of (row, column) couples of the minimum cost assignment,
+                 one per row or column of the smallest dimension
+        """
+        transposed = cost.shape[0] > cost.shape[1]
+        if transposed:
+            cost = cost.T
+        couples = _HungarianAssignment(cost).solve()
+        if transposed:
+            return sorted((column, row) for row, column in couples)
+        return sorted(couples)
+
+
+class _HungarianAssignment:
+    """
+    Hungarian algorithm with potentials for a cost matrix with no more rows than columns
+
+    Index 0 of the columns is a virtual column used as the starting point
+    of augmenting paths, rows and columns of the matrix are numbered from 1.
+    """
+
+    def __init__(self, cost: np.ndarray):
+        rows, columns = cost.shape
+        self.cost = cost
+        self.row_potentials = np.zeros(rows + 1)
+        self.column_potentials = np.zeros(columns + 1)
+        self.column_rows = np.zeros(columns + 1, dtype=np.int64)
+        self.previous_columns = np.zeros(columns + 1, dtype=np.int64)
+
+    def solve(self) -> list[tuple[int, int]]:
+        """
+        Compute the minimum cost assignment
+        :return: list of (row, column) couples, one per row
+        """
+        rows, columns = self.cost.shape
+        for row in range(1, rows + 1):
+            self._augment(self._find_augmenting_path(row))
+        return [(int(self.column_rows[column]) - 1, column - 1)
+                for column in range(1, columns + 1) if self.column_rows[column]]
+
+    def _find_augmenting_path(self, row: int) -> int:
+        # Dijkstra-like search of the shortest augmenting path from the row,
+        # updating the potentials, up to a free column which is returned
+        columns = self.cost.shape[1]
+        self.column_rows[0] = row
+        current_column = 0
+        min_reduced_costs = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while True:
+            used[current_column] = True
+            current_row = self.column_rows[current_column]
+            free = ~used
+            free[0] = False
+            reduced_costs = (self.cost[current_row - 1] - self.row_potentials[current_row]
+                             - self.column_potentials[1:])
+            improved = free[1:] & (reduced_costs < min_reduced_costs[1:])
+            min_reduced_costs[1:][improved] = reduced_costs[improved]
+            self.previous_columns[1:][improved] = current_column
+            candidates = np.where(free, min_reduced_costs, np.inf)
+            next_column = int(np.argmin(candidates))
+            delta = candidates[next_column]
+            used_columns = np.nonzero(used)[0]
+            self.row_potentials[self.column_rows[used_columns]] += delta
+            self.column_potentials[used_columns] -= delta
+            min_reduced_costs[free] -= delta
+            current_column = next_column
+            if self.column_rows[current_column] == 0:
+                return current_column
+
+    def _augment(self, current_column: int) -> None:
+        # reassign the columns along the path ending at the free column
+        while current_column:
+            previous_column = self.previous_columns[current_column]
+            self.column_rows[current_column] = self.column_rows[previous_column]
+            current_column = previous_column
@@ -1,9 +1,11 @@
 import re
 import unicodedata
-from typing import cast, AsyncGenerator, List
+from dataclasses import dataclass, field
+from typing import cast, List
 from venv import logger
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
 from app.config import get_app_settings
 from app.errors.conflict_error import ConflictError
@@ -24,9 +26,21 @@ from app.models.source_people import SourcePerson
 from app.models.source_records import SourceRecord
 from app.services.authority_organizations.authority_organization_service import \
     AuthorityOrganizationService
+from app.services.policies.publication_source_policy import PublicationSourcePolicy
+from app.services.source_contributors.contributor_clustering import ContributorClustering
 from app.services.source_contributors.source_organization_service import SourceOrganizationService
 
 
+@dataclass
+class _NameKeys:
+    """
+    Name keys computed once per contributor mapping run
+    """
+    # harvested_for people of the source records with their name keys, loaded on first use
+    harvested_for_people: list[tuple[Person, list[str]]] | None = None
+    source_people: dict[str, list[str]] = field(default_factory=dict)
+
+
 class SourceContributorMappingService:
     """
     Service to handle operations on source journals data
@@ -35,11 +49,11 @@ class SourceContributorMappingService:
     def __init__(self, source_records: List[SourceRecord], document_uid: str):
         self.source_records = source_records
         self.document_uid = document_uid
+        self.policy = PublicationSourcePolicy.current()
         self.source_people: List[SourcePerson] = self._get_source_people(self.source_records)
         self.person_dao = self._get_person_dao()
         self.source_person_dao = self._get_source_person_dao()
-        self.source_organization_service = SourceOrganizationService()
-        self.authority_organization_service = AuthorityOrganizationService()
+        self._name_keys = _NameKeys()
 
     async def update_contributions(self) -> None:
         """
@@ -61,16 +75,27 @@ class SourceContributorMappingService:
         if number_of_layers < 2:
             return
         distances = self._compute_equivalence_distances(source_people_by_source_platform)
-        source_person_uids = [
-            source_person.uid for source_person in self.source_people
-        ]
-        paths = await self.source_person_dao.create_source_people_clusters(
-            source_people_uids=source_person_uids,
-            distances=distances,
-            document_uid=self.document_uid,
-            number_of_layers=number_of_layers)
-        filtered_paths = self.filter_unique_paths(paths)
+        if self._get_contributor_clustering_engine() == "graph":
+            # legacy engine : clusters are computed in the database by path expansion
+            source_person_uids = [
+                source_person.uid for source_person in self.source_people
+            ]
+            paths = await self.source_person_dao.create_source_people_clusters(
+                source_people_uids=source_person_uids,
+                distances=distances,
+                document_uid=self.document_uid,
+                number_of_layers=number_of_layers)
+            filtered_paths = self.filter_unique_paths(paths)
+        else:
+            layers = [
+                [source_person.uid for source_person in source_people_by_source_platform[source]]
+                for source in self._get_harvesting_sources()
+                if source in source_people_by_source_platform
+            ]
+            filtered_paths = ContributorClustering(layers, distances).clusters()
         couples = self.convert_paths_to_couples(filtered_paths)
+        if not couples:
+            return
         await self.source_person_dao.create_contextual_equivalents(
             source_people_couples=couples,
             document_uid=self.document_uid)
@@ -79,10 +104,54 @@ class SourceContributorMappingService:
         str, [list[SourcePerson]]]:
         """
         Link source people to real people based on identifiers and names
+
+        All the clusters are resolved against the existing people in a single query,
+        only the clusters left unresolved go to name matching or external person creation,
+        and all the links are written at once at the end.
         :return: a dictionary of found people with their corresponding source people
         """
-        yet_processed_source_person_uids = set()
+        clusters = await self._get_source_people_clusters()
+        resolutions = await self.person_dao.resolve_source_people_clusters(clusters)
+        # the resolutions are read before any merge : the uids of the external people
+        # merged while visiting the clusters are mapped to the uid of the person kept
+        kept_person_uids: dict[str, str] = {}
+        person_uids_by_cluster_key: dict[str, str] = {}
+        external_people_to_create: list[Person] = []
+        for cluster_key, source_people_cluster in clusters.items():
+            resolution = resolutions.get(cluster_key)
+            person_uid = (
+                    (resolution.identified_person_uid if resolution else None)
+                    or await self._match_by_name(source_people_cluster)
+            )
+            if person_uid is None and resolution and resolution.external_person_uids:
+                person_uid = await self._merge_external_people(
+                    {self._kept_person_uid(kept_person_uids, external_person_uid)
+                     for external_person_uid in resolution.external_person_uids},
+                    kept_person_uids)
+            if person_uid is None:
+                external_person = self._build_external_person(source_people_cluster)
+                external_people_to_create.append(external_person)
+                person_uid = external_person.uid
+            person_uids_by_cluster_key[cluster_key] = person_uid
         linked_people: dict[str, [list[SourcePerson]]] = {}
+        source_person_uids_by_person_uid: dict[str, list[str]] = {}
+        for cluster_key, person_uid in person_uids_by_cluster_key.items():
+            # a person merged by a later cluster is replaced by the person kept
+            person_uid = self._kept_person_uid(kept_person_uids, person_uid)
+            linked_people.setdefault(person_uid, []).extend(clusters[cluster_key])
+            source_person_uids_by_person_uid.setdefault(person_uid, []).extend(
+                source_person.uid for source_person in clusters[cluster_key])
+        await self.person_dao.create_external_people(external_people_to_create)
+        await self.source_person_dao.link_to_people(source_person_uids_by_person_uid)
+        return linked_people
+
+    async def _get_source_people_clusters(self) -> dict[str, list[SourcePerson]]:
+        """
+        Group the source people of the document by their contextual equivalences
+        :return: clusters of source people, by uid of their first source person
+        """
+        yet_processed_source_person_uids = set()
+        clusters: dict[str, list[SourcePerson]] = {}
         for source_person in self.source_people:
             source_person_uid = source_person.uid
             if source_person_uid in yet_processed_source_person_uids:
@@ -91,17 +160,10 @@ class SourceContributorMappingService:
                 source_person_uid)
             # append the source person uid to the cluster if it is not already in the cluster
             source_people_cluster_uids = list(set(source_people_cluster_uids + [source_person_uid]))
-            source_people_cluster = [person for person in self.source_people if
-                                     person.uid in source_people_cluster_uids]
+            clusters[source_person_uid] = [person for person in self.source_people if
+                                           person.uid in source_people_cluster_uids]
             yet_processed_source_person_uids.update(source_people_cluster_uids)
-            person_uid = (
-                    await self._match_by_identifiers(source_people_cluster)
-                    or await self._match_by_name(source_people_cluster)
-                    or await self._match_with_external_person(source_people_cluster)
-            )
-            if person_uid is not None:
-                linked_people[person_uid] = source_people_cluster
-        return linked_people
+        return clusters
 
     async def _match_by_name(self, source_people_cluster: List[SourcePerson]) -> str | None:
         """
@@ -109,63 +171,11 @@ class SourceContributorMappingService:
         :param source_people_cluster: List of SourcePerson objects.
         :return: The UID of the matched person, or None if no match is found.
         """
-        async for harvested_for_person in self._fetch_harvested_for_people(self.person_dao,
-                                                                           self.source_records):
-
-            if self._is_similar(harvested_for_person, source_people_cluster):
-                await self.source_person_dao.link_to_person([source_person.uid for
-                                                             source_person in
-                                                             source_people_cluster],
-                                                            harvested_for_person.uid)
+        for harvested_for_person, name_keys in await self._get_harvested_for_people():
+            if self._is_similar(name_keys, source_people_cluster):
                 return harvested_for_person.uid
         return None
 
-    async def _match_by_identifiers(self, source_people_cluster: List[SourcePerson]) -> str:
-        """
-        Match source people to real people based on identifiers.
-
-        :param source_people_cluster:
-        :return:
-        """
-        person_uid = None
-        identifiers = [identifier.model_dump() for person in source_people_cluster
-                       for identifier in person.identifiers]
-        if identifiers:
-            person_uid = await self.person_dao.find_by_identifiers(identifiers)
-            if person_uid:
-                await self.source_person_dao.link_to_person([source_person.uid for
-                                                             source_person in
-                                                             source_people_cluster],
-                                                            person_uid)
-        return person_uid
-
-    async def _match_with_external_person(self, source_people_cluster: List[SourcePerson]) -> str:
-        existing_external_people_uids = set()
-        for source_person in source_people_cluster:
-            external_person_uid = await self.person_dao.get_person_uid_by_source_person_uid(
-                source_person_uid=source_person.uid)
-            if external_person_uid:
-                existing_external_people_uids.add(external_person_uid)
-        if len(existing_external_people_uids) == 0:
-            external_person: Person = self._build_external_person(source_people_cluster)
-            try:
-                person_uid, _, _ = await self.person_dao.create(external_person)
-            except ConflictError:
-                logger.error("External person %s already exists", external_person)
-                person_uid = external_person.uid
-            existing_external_people_uids.add(person_uid)
-        if len(existing_external_people_uids) == 1:
-            external_person_uid = existing_external_people_uids.pop()
-            await self.source_person_dao.link_to_person([source_person.uid for
-                                                         source_person in
-                                                         source_people_cluster],
-                                                        external_person_uid)
-            return external_person_uid
-        # the more complex case where there are multiple existing external people
-        # we need to merge them
-        return await self._merge_external_people(existing_external_people_uids,
-                                                 source_people_cluster)
-
     def _build_external_person(self, source_people_cluster):
         external_person_data = {
             'uid': None,
@@ -177,8 +187,7 @@ class SourceContributorMappingService:
         }
         source_people_cluster = sorted(
             source_people_cluster,
-            key=lambda person: self._get_harvesting_sources().index(person.source.value)
-            if person.source.value in self._get_harvesting_sources() else float('inf')
+            key=lambda person: self.policy.harvesting_source_rank(person.source.value)
         )
         for source_person in source_people_cluster:
             if external_person_data['uid'] is None:
@@ -199,24 +208,34 @@ class SourceContributorMappingService:
 
         return Person(**external_person_data)
 
-    async def _merge_external_people(self,
-                                     existing_external_people_uids,
-                                     source_people_cluster) -> str:
+    async def _merge_external_people(self, existing_external_people_uids: set[str],
+                                     kept_person_uids: dict[str, str]) -> str:
         """
         Merge multiple external people into a single person
-        :param existing_external_people_uids: List of UIDs of existing external people
-        :param source_people_cluster: List of SourcePerson objects
+        :param existing_external_people_uids: Set of UIDs of existing external people
+        :param kept_person_uids: UIDs of the people kept by merged person UID,
+                                 completed with the merged people
         :return: The UID of the merged person
         """
-        person_to_keep_uid = existing_external_people_uids.pop()
-        for person_to_merge_uid in existing_external_people_uids:
+        # the smallest uid is kept, so that retries of the same merge converge
+        person_to_keep_uid, *people_to_merge_uids = sorted(existing_external_people_uids)
+        for person_to_merge_uid in people_to_merge_uids:
             await self.person_dao.merge_people(person_to_keep_uid, person_to_merge_uid)
-        # Link the source people to the merged person
-        await self.source_person_dao.link_to_person([source_person.uid for source_person in
-                                                     source_people_cluster],
-                                                    person_to_keep_uid)
+            kept_person_uids[person_to_merge_uid] = person_to_keep_uid
         return person_to_keep_uid
 
+    @staticmethod
+    def _kept_person_uid(kept_person_uids: dict[str, str], person_uid: str) -> str:
+        """
+        Get the UID of the person a person has been merged into, if any
+        :param kept_person_uids: UIDs of the people kept by merged person UID
+        :param person_uid: UID of a person
+        :return: The UID of the person kept
+        """
+        while person_uid in kept_person_uids:
+            person_uid = kept_person_uids[person_uid]
+        return person_uid
+
     async def _update_contributions(self, linked_people):
         document_dao = self._get_document_dao()
         current_contribution_ids = set()
@@ -295,6 +314,8 @@ class SourceContributorMappingService:
 
     async def _map_source_organizations_to_authority_organization_states(self,
                                                                          source_organisations):
+        source_organization_service = SourceOrganizationService()
+        authority_organization_service = AuthorityOrganizationService()
         seen = set()
         root_objects: list[AuthorityOrganizationRoot] = []
         for source_organisation in source_organisations:
@@ -302,12 +323,12 @@ class SourceContributorMappingService:
                 continue
             # fetch the cluster of source organizations sharing identifiers with the current
             # source organization
-            so_cluster = await self.source_organization_service.get_cluster(
+            so_cluster = await source_organization_service.get_cluster(
                 source_organization_uid=source_organisation.uid)
             seen.update(org.uid for org in so_cluster)
             try:
                 root = await (
-                    self.authority_organization_service.get_or_create_authority_organization(
+                    authority_organization_service.get_or_create_authority_organization(
                         so_cluster)
                 )
                 root_objects.append(root)
@@ -332,11 +353,9 @@ class SourceContributorMappingService:
         :return: the first encountered role
         """
         # Sort source_people by harvester order
-        harvesting_sources_order = {source: index for index, source in
-                                    enumerate(self._get_harvesting_sources())}
         sorted_people = sorted(
             source_people,
-            key=lambda person: harvesting_sources_order.get(person.source, float('inf'))
+            key=lambda person: self.policy.harvesting_source_rank(person.source)
         )
 
         roles = []
@@ -375,27 +394,61 @@ class SourceContributorMappingService:
 
         return list(organisations.values())
 
-    async def _fetch_harvested_for_people(
-            self, person_dao: PersonDAO, source_records: list[SourceRecord]
-    ) -> AsyncGenerator[Person, None]:
+    async def _get_harvested_for_people(self) -> list[tuple[Person, list[str]]]:
         """
-        Fetch the harvested_for people associated with the given source records.
+        Get the harvested_for people of the source records with their name keys.
 
-        :param person_dao: DAO for fetching Person data.
-        :param source_records: List of SourceRecord objects.
-        :return: An async generator yielding Person objects.
+        The people are loaded in a single query on first call and kept for the whole run,
+        as they are the same for every source people cluster of the document.
+        :return: list of people with the sorted token keys of their names
         """
-        harvested_for_uids: set[str] = set()
-
-        # Gather all harvested_for_uids from the source records
-        for source_record in source_records:
-            harvested_for_uids.update(source_record.harvested_for_uids)
+        if self._name_keys.harvested_for_people is None:
+            harvested_for_uids: set[str] = set()
+            for source_record in self.source_records:
+                harvested_for_uids.update(source_record.harvested_for_uids)
+            people = await self.person_dao.find_by_uids(list(harvested_for_uids))
+            self._name_keys.harvested_for_people = [
+                (people[person_uid], self._person_name_keys(people[person_uid]))
+                for person_uid in sorted(people)
+            ]
+        return self._name_keys.harvested_for_people
+
+    def _person_name_keys(self, person: Person) -> list[str]:
+        """
+        Compute the name keys of all the first name / last name combinations of a person
+        :param person: person with structured names
+        :return: list of name keys
+        """
+        return [
+            self._name_key(f"{fn.value} {ln.value}")
+            for name in person.names
+            for fn in name.first_names
+            for ln in name.last_names
+        ]
 
-        # Fetch Person objects for each harvested_for_uid
-        for harvested_for_uid in harvested_for_uids:
-            person = await person_dao.get(harvested_for_uid)
-            if person:
-                yield person
+    def _source_person_name_keys(self, source_person: SourcePerson) -> list[str]:
+        """
+        Get the name keys of the name and name variants of a source person, computed once per run
+        :param source_person: source person with unstructured names
+        :return: list of name keys
+        """
+        name_keys = self._name_keys.source_people.get(source_person.uid)
+        if name_keys is None:
+            name_keys = [
+                self._name_key(name)
+                for name in [source_person.name] + (source_person.name_variants or [])
+            ]
+            self._name_keys.source_people[source_person.uid] = name_keys
+        return name_keys
+
+    def _name_key(self, name: str) -> str:
+        """
+        Normalize a name and sort its tokens, so that a plain ratio between two keys
+        is the token sort ratio between the two names
+        :param name: raw name
+        :return: name key
+        """
+        return " ".join(sorted(self._normalize_string(name).split()))
 
     @staticmethod
     def filter_unique_paths(paths: list[list[str]]) -> list[list[str]]:
@@ -462,39 +515,84 @@ class SourceContributorMappingService:
         :param source_people: Dictionary of contributors by source platform
         :return: Dictionary of distances between contributors
         """
-        sources = self._get_harvesting_sources()
         source_people_by_source_platform = source_people
-        distances = {}
-        existing_sources = list(source_people_by_source_platform.keys())
         # Order the sources by the order of the harvesters
-        sources = [source for source in sources if source in existing_sources]
+        sources = [source for source in self._get_harvesting_sources()
+                   if source in source_people_by_source_platform]
+        # Names are normalized once per person rather than once per compared pair
+        normalized_names = {
+            source: [self._normalize_string(source_person.name)
+                     for source_person in source_people_by_source_platform[source]]
+            for source in sources
+        }
 
+        distances = {}
         # Compute distances between each layer and all subsequent layers
         for i, source in enumerate(sources):
-            source_people = source_people_by_source_platform[source]
-            for j in range(i + 1, len(sources)):  # Compare with all following layers
-                next_source = sources[j]
-                next_source_people = source_people_by_source_platform[next_source]
-                for source_person in source_people:
-                    for next_source_person in next_source_people:
-                        distance = self._compute_distance(source_person, next_source_person)
-                        # Store the distance
-                        distances.setdefault(source_person.uid, {})[
-                            next_source_person.uid] = distance
+            layer = source_people_by_source_platform[source]
+            for next_source in sources[i + 1:]:  # Compare with all following layers
+                next_layer = source_people_by_source_platform[next_source]
+                layer_distances = self._compute_layer_distances(
+                    layer, normalized_names[source],
+                    next_layer, normalized_names[next_source])
+                for source_person, row in zip(layer, layer_distances):
+                    # Store the distances
+                    distances.setdefault(source_person.uid, {}).update(
+                        zip((next_source_person.uid for next_source_person in next_layer), row))
 
         return distances
 
-    def _compute_distance(
-            self, source_person: SourcePerson, next_source_person: SourcePerson
-    ) -> float | None:
-        if self._common_identifier(source_person, next_source_person):
-            return 0
-        proximity = self._compute_fuzz_distance(source_person.name, next_source_person.name)
-        if (distance := 100 - proximity) > self._coauthor_names_maximal_distance():
-            return None
-        if distance == 0:
-            return 0.0001  # as identical name is not as accurate as common identifier
-        return distance
+    def _compute_layer_distances(self, source_people: list[SourcePerson],
+                                 normalized_names: list[str],
+                                 next_source_people: list[SourcePerson],
+                                 next_normalized_names: list[str]) -> list[list[float | None]]:
+        """
+        Compute the distance matrix between two layers of contributors,
+        with identical names scoring 0.0001 and a common identifier overriding the name distance
+        :param source_people: contributors of the first layer
+        :param normalized_names: normalized names of the contributors of the first layer
+        :param next_source_people: contributors of the second layer
+        :param next_normalized_names: normalized names of the contributors of the second layer
+        :return: distances, one row per contributor of the first layer
+        """
+        proximities = process.cdist(normalized_names, next_normalized_names,
+                                    scorer=fuzz.token_sort_ratio, dtype=np.float64, workers=-1)
+        distances = 100 - proximities
+        # as identical name is not as accurate as common identifier
+        distances[distances == 0] = 0.0001
+        too_distant = distances > self._coauthor_names_maximal_distance()
+        common_identifier = self._common_identifier_mask(source_people, next_source_people)
+        rows = np.where(too_distant, None, distances.astype(object))
+        rows[common_identifier] = 0
+        return rows.tolist()
+
+    @staticmethod
+    def _common_identifier_mask(source_people: list[SourcePerson],
+                                next_source_people: list[SourcePerson]) -> np.ndarray:
+        """
+        Compute which couples of contributors of two layers share an identifier
+        with the same type and value
+        :param source_people: contributors of the first layer
+        :param next_source_people: contributors of the second layer
+        :return: boolean matrix, one row per contributor of the first layer
+        """
+        identifier_indexes: dict[tuple, int] = {}
+        memberships = []
+        for layer in (source_people, next_source_people):
+            layer_memberships = []
+            for person_index, source_person in enumerate(layer):
+                for identifier in source_person.identifiers:
+                    key = (identifier.type, identifier.value)
+                    identifier_index = identifier_indexes.setdefault(key, len(identifier_indexes))
+                    layer_memberships.append((person_index, identifier_index))
+            memberships.append(layer_memberships)
+        incidences = []
+        for layer, layer_memberships in zip((source_people, next_source_people), memberships):
+            incidence = np.zeros((len(layer), len(identifier_indexes)), dtype=np.int32)
+            for person_index, identifier_index in layer_memberships:
+                incidence[person_index, identifier_index] = 1
+            incidences.append(incidence)
+        return (incidences[0] @ incidences[1].T) > 0
 
     def _normalize_string(self, input_string):
         # Convert to lowercase
@@ -516,58 +614,22 @@ class SourceContributorMappingService:
         settings = get_app_settings()
         return settings.coauthor_names_maximal_distance
 
-    def _common_identifier(self, source_person: SourcePerson,
-                           next_source_person: SourcePerson) -> bool:
-        """
-        Check if the two source persons have a common identifier with the same type and value.
-        :param source_person: First source person
-        :param next_source_person: Second source person
-        :return: True if a common identifier exists, False otherwise
-        """
-        for identifier in source_person.identifiers:
-            for next_identifier in next_source_person.identifiers:
-                if (identifier.type == next_identifier.type
-                        and identifier.value == next_identifier.value):
-                    return True
-        return False
-
-    def _compute_fuzz_distance(self, name1: str, name2: str) -> float:
-        """
-        Compute the Levenshtein distance between two names
-        :param name1: First name
-        :param name2: Second name
-        :return: normalized Levenshtein distance
-        """
-        return fuzz.token_sort_ratio(name1, name2, processor=self._normalize_string)
-
-    def _is_similar(self, internal_person: Person, external_people: list[SourcePerson]) -> bool:
+    def _is_similar(self, internal_name_keys: list[str],
+                    external_people: list[SourcePerson]) -> bool:
         """
-        Check if an internal_person is similar to any person in the external_people cluster
+        Check if an internal person is similar to any person in the external_people cluster
         based on name similarity.
 
-        :param internal_person: A Person object with structured names (internal person).
+        :param internal_name_keys: name keys of the internal person (see _person_name_keys).
         :param external_people: List of SourcePerson objects
             with unstructured names (external people).
         :return: True if similar, False otherwise.
         """
-        # Extract structured names from the internal person
-        internal_names = [
-            f"{fn.value} {ln.value}"
-            for name in internal_person.names
-            for fn in name.first_names
-            for ln in name.last_names
-        ]
-
-        # Iterate over each SourcePerson in the external cluster
         for external_person in external_people:
-            # Combine unstructured name and name_variants
-            unstructured_names = [external_person.name] + (external_person.name_variants or [])
-            for unstructured_name in unstructured_names:
-                for internal_name in internal_names:
-                    distance = self._compute_fuzz_distance(unstructured_name, internal_name)
-                    if distance >= 85:  # Define a similarity threshold
+            for external_name_key in self._source_person_name_keys(external_person):
+                for internal_name_key in internal_name_keys:
+                    if fuzz.ratio(external_name_key, internal_name_key) >= 85:
                         return True
-
         return False
 
     def _get_person_dao(self):
@@ -588,9 +650,8 @@ class SourceContributorMappingService:
         settings = get_app_settings()
         return AbstractDAOFactory().get_dao_factory(settings.graph_db)
 
-    def _get_policies(self):
-        settings = get_app_settings()
-        return settings.publication_source_policies
-
     def _get_harvesting_sources(self):
-        return list(self._get_policies()['harvesting_sources'])
+        return self.policy.harvesting_sources
+
+    def _get_contributor_clustering_engine(self) -> str:
+        return self.policy.contributor_clustering_engine
@@ -40,6 +40,24 @@ class SourceOrganizationService:
             return await dao.update(source_organization)
         return await dao.create(source_organization)
 
+    async def create_or_update_source_organizations(
+            self,
+            source_organizations: list[SourceOrganization]) -> list[SourceOrganization]:
+        """
+        Create or update several SourceOrganizations in the graph database in a single batch,
+        organizations repeated in the list are written once.
+        :param source_organizations: Pydantic SourceOrganization objects
+        :return: the registered source organizations, one per uid
+        """
+        factory = self._get_dao_factory()
+        dao: SourceOrganizationDAO = factory.get_dao(SourceOrganization)
+        for source_organization in source_organizations:
+            assert source_organization.uid, (
+                "Source organization uid should have been computed before from "
+                f"{source_organization.source.value} and {source_organization.source_identifier}"
+            )
+        return await dao.create_or_update_many(source_organizations)
+
     async def get_source_organization_by_uid(self, uid: str) -> SourceOrganization:
         """
         Retrieve a SourceOrganization by its UID.
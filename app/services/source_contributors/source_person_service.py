@@ -27,6 +27,21 @@ class SourcePersonService:
             return await source_person_dao.update(source_person)
         return await source_person_dao.create(source_person)
 
+    async def create_or_update_source_people(self, source_people: list[SourcePerson]
+                                             ) -> list[SourcePerson]:
+        """
+        Create or update several source people in the graph database in a single batch
+        :param source_people: Pydantic SourcePerson objects
+        :return: the registered source people, one per uid
+        """
+        factory = self._get_dao_factory()
+        source_person_dao: SourcePersonDAO = factory.get_dao(SourcePerson)
+        for source_person in source_people:
+            assert source_person.uid, \
+                "Source person uid should have been computed before from" \
+                f"{source_person.source.value} and {source_person.source_identifier}"
+        return await source_person_dao.create_or_update_many(source_people)
+
     @staticmethod
     def _get_dao_factory() -> DAOFactory:
         settings = get_app_settings()
@@ -1,6 +1,7 @@
 from app.config import get_app_settings
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
 from app.graph.generic.dao_factory import DAOFactory
+from app.graph.generic.unit_of_work import send_after_commit
 from app.graph.neo4j.source_journal_dao import SourceJournalDAO
 from app.models.source_journal import SourceJournal
 from app.signals import source_journal_updated, source_journal_created
@@ -26,10 +27,12 @@ class SourceJournalService:
         existing_source_journal = await source_journal_dao.get_by_uid(source_journal.uid)
         if existing_source_journal:
             journal = await source_journal_dao.update(source_journal)
-            await source_journal_updated.send_async(self, source_journal_uid=source_journal.uid)
+            await send_after_commit(source_journal_updated, self,
+                                    source_journal_uid=source_journal.uid)
         else:
             journal = await source_journal_dao.create(source_journal)
-            await source_journal_created.send_async(self, source_journal_uid=source_journal.uid)
+            await send_after_commit(source_journal_created, self,
+                                    source_journal_uid=source_journal.uid)
         return journal
 
     async def get_source_journal_uids(self) -> list[str]:
@@ -1,3 +1,5 @@
+from collections import deque
+
 from loguru import logger
 
 from app.config import get_app_settings
@@ -8,8 +10,7 @@ from app.graph.neo4j.source_record_dao import SourceRecordDAO
 from app.models.document import Document
 from app.models.source_records import SourceRecord
 from app.signals import document_sources_changed, document_created_from_sources
-
-MAX_EQUIVALENCES_RECURSION_LEVEL = 100
+from app.utils.concurrency.striped_lock import StripedLock
 
 
 class EquivalenceService:
@@ -17,88 +18,179 @@ class EquivalenceService:
     Service to handle equivalence relationships between source records
     """
 
-    def __init__(self):
-        self.source_records_to_update_uids = []
+    # shared by all the instances so that every worker of the process sees the same locks
+    _component_locks: StripedLock | None = None
 
-    async def update_source_record(self, _, source_record_id) -> None:
+    async def update_source_record(self, _, source_record_id,
+                                   update_status: SourceRecordDAO.UpdateStatus | None = None
+                                   ) -> None:
         """
         Update a source record with the given id
         :param _:
         :param source_record_id:
+        :param update_status: the fields of the source record that have changed,
+                              None if unknown (e.g. the source record has been created)
         :return:
         """
         logger.debug(f"beginning to update source record with id {source_record_id}")
-        self.source_records_to_update_uids.append(source_record_id)
-        await self._update_inferred_equivalence_relationships()
+        await self._update_inferred_equivalence_relationships(deque([source_record_id]),
+                                                              update_status)
 
-    async def _update_inferred_equivalence_relationships(self, recursion_level: int = 0) -> None:
+    async def _update_inferred_equivalence_relationships(
+            self,
+            source_records_to_update_uids: deque,
+            update_status: SourceRecordDAO.UpdateStatus | None = None) -> None:
         """
-        Recursively update the inferred equivalence relationships between source records
+        Update the inferred equivalence relationships between source records
+        until no source record is left to update
+        :param source_records_to_update_uids: work queue of this invocation
+        :param update_status: the fields that have changed in the first source record
+                              of the queue
         :return:
         """
-        if not self.source_records_to_update_uids:
-            return
-        if recursion_level > MAX_EQUIVALENCES_RECURSION_LEVEL:
-            logger.error("Recursion limit reached while updating inferred equivalence "
-                         "relationships for remaining source records: "
-                         f"{self.source_records_to_update_uids}")
-            return
-        # Pop the first source record from the list and use it as the origin of the whole algorithm
-        obsolete_source_record_uid = self.source_records_to_update_uids.pop(0)
+        # pending uids are deduplicated : a source record detached several times
+        # while processing the queue is only processed once
+        pending_uids = set(source_records_to_update_uids)
+        while source_records_to_update_uids:
+            # use the first source record of the queue as the origin of the algorithm
+            obsolete_source_record_uid = source_records_to_update_uids.popleft()
+            pending_uids.discard(obsolete_source_record_uid)
+            detached_uids = await self._update_locked_component(obsolete_source_record_uid,
+                                                                update_status)
+            # the documents of detached source records lose sources : they are fully recomputed
+            update_status = None
+            # Add any detached source records to the queue of records to update
+            for detached_uid in detached_uids:
+                if detached_uid not in pending_uids:
+                    pending_uids.add(detached_uid)
+                    source_records_to_update_uids.append(detached_uid)
+
+    async def _update_locked_component(
+            self,
+            origin_source_record_uid: str,
+            update_status: SourceRecordDAO.UpdateStatus | None = None) -> list[str]:
+        """
+        Update the component of a source record and its documents while holding
+        the locks of every source record of the component, so that two workers
+        never interleave on the same component
+        :param origin_source_record_uid:
+        :param update_status: the fields that have changed in the origin source record
+        :return: the source records detached from the component
+        """
+        locked_uids = self._uids_of_component(
+            origin_source_record_uid, await self._get_component_uids(origin_source_record_uid))
+        while True:
+            async with self._get_component_locks().hold(locked_uids):
+                # the component may have changed while waiting for the locks
+                shared_identifier_uids, inferred_equiv_uids, equivalent_uids = \
+                    await self._get_component_uids(origin_source_record_uid)
+                component_uids = self._uids_of_component(
+                    origin_source_record_uid,
+                    (shared_identifier_uids, inferred_equiv_uids, equivalent_uids))
+                if component_uids <= locked_uids:
+                    detached_uids = await self._update_component(shared_identifier_uids,
+                                                                 inferred_equiv_uids)
+                    # the new inferred equivalences link source records of the component
+                    # of shared identifiers : the equivalents of the origin only change
+                    # if some of them were not equivalent yet or if source records were detached
+                    if detached_uids or not set(shared_identifier_uids) <= {
+                            origin_source_record_uid, *equivalent_uids}:
+                        equivalent_uids = await self._get_equivalent_uids(
+                            origin_source_record_uid)
+                    # Handle attached publications
+                    document_created, documents, resized_document_uids = \
+                        await self._update_documents(origin_source_record_uid, equivalent_uids)
+                    break
+            logger.debug(f"Equivalence component of source record {origin_source_record_uid} "
+                         "has grown while waiting for its locks, retrying")
+            locked_uids = locked_uids | component_uids
+        # document signals may trigger a new equivalence update of the same component
+        # so they are sent once the locks are released
+        await self._notify_documents(document_created, documents,
+                                     update_status, resized_document_uids)
+        return detached_uids
+
+    async def _get_component_uids(self, origin_source_record_uid: str
+                                  ) -> tuple[list[str], list[str], list[str]]:
+        """
+        Get all the source records that the update of a source record may touch
+        :param origin_source_record_uid:
+        :return: uids of the source records sharing identifiers with the source record,
+                 of the source records inferred to be equivalent to one of them
+                 and of the source records equivalent to the source record
+        """
+        factory = self._get_dao_factory()
+        dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        sr_with_shared_identifier_uids, existing_inferred_equiv_sr_uids = \
+            await dao.get_equivalence_components(origin_source_record_uid)
+        equivalent_uids = await self._get_equivalent_uids(origin_source_record_uid)
+        return sr_with_shared_identifier_uids, existing_inferred_equiv_sr_uids, equivalent_uids
+
+    async def _get_equivalent_uids(self, origin_source_record_uid: str) -> list[str]:
+        """
+        Get the weakly connected graph of source records that are equivalents (inferred,
+        predicted or asserted) to a source record
+        :param origin_source_record_uid:
+        :return: uids of the equivalent source records
+        """
         factory = self._get_dao_factory()
         dao: SourceRecordDAO = factory.get_dao(SourceRecord)
-        # Fetch the weakly connected graph of source records that share identifiers with the origin
-        sr_with_shared_identifier_uids = [obsolete_source_record_uid]
-        sr_with_shared_identifier_uids.extend(
-            await (
-                dao.get_source_records_with_shared_identifier_uids(
-                    obsolete_source_record_uid)
-            ))
-        sr_with_shared_identifier_uids = list(set(sr_with_shared_identifier_uids))
-        # Fetch the weakly connected graph of source records that are inferred to be equivalent to
-        # one of the source records in the weakly connected graph of shared identifiers
-        existing_inferred_equiv_sr_uids = [obsolete_source_record_uid]
-        for source_record_uid in sr_with_shared_identifier_uids:
-            existing_inferred_equiv_sr_uids.extend(
-                await dao.get_source_records_equivalent_uids(
-                    source_record_uid, SourceRecordDAO.EquivalenceType.INFERRED))
-        existing_inferred_equiv_sr_uids = list(set(existing_inferred_equiv_sr_uids))
+        return await dao.get_source_records_equivalent_uids(
+            origin_source_record_uid, SourceRecordDAO.EquivalenceType.ALL)
+
+    @staticmethod
+    def _uids_of_component(origin_source_record_uid: str,
+                           component: tuple[list[str], list[str], list[str]]) -> set[str]:
+        return {origin_source_record_uid, *(uid for uids in component for uid in uids)}
+
+    @classmethod
+    def _get_component_locks(cls) -> StripedLock:
+        if cls._component_locks is None:
+            cls._component_locks = StripedLock(get_app_settings().equivalence_lock_stripes)
+        return cls._component_locks
+
+    async def _update_component(self, sr_with_shared_identifier_uids: list[str],
+                                existing_inferred_equiv_sr_uids: list[str]) -> list[str]:
+        """
+        Rebuild the inferred equivalence relationships of the component of source records
+        sharing identifiers with a source record
+        :param sr_with_shared_identifier_uids: the weakly connected graph of source records
+                                               that share identifiers with the source record
+        :param existing_inferred_equiv_sr_uids: the weakly connected graph of source records
+                                                that are inferred to be equivalent
+                                                to one of them
+        :return: the source records detached from the component
+        """
+        factory = self._get_dao_factory()
+        dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        shared_identifier_uids = set(sr_with_shared_identifier_uids)
         # The set of source records that belong to the weakly connected graph of inferred
         # equivalences but not to the weakly connected graph of shared identifiers
         # should lose their inferred equivalence relationships
         obsolete_inferred_equiv_sr_uids = [x for x in existing_inferred_equiv_sr_uids if
-                                           x not in sr_with_shared_identifier_uids]
-        for obsolete_inferred_equiv_sr_uid in obsolete_inferred_equiv_sr_uids:
-            await dao.delete_inferred_equivalence_relationships(
-                source_record_uid=obsolete_inferred_equiv_sr_uid,
-                target_source_record_uids=sr_with_shared_identifier_uids)
-            # Add any detached source records to the list of records to update
-            self.source_records_to_update_uids.append(obsolete_inferred_equiv_sr_uid)
-        await dao.create_inferred_equivalence_relationships(
-            sr_with_shared_identifier_uids)
-        # Handle attached publications
-        await self._update_documents(obsolete_source_record_uid)
-        # Loop until the source_records_to_update list is empty
-        await self._update_inferred_equivalence_relationships()
-
-    async def _update_documents(self, origin_source_record_uid) -> None:
+                                           x not in shared_identifier_uids]
+        await dao.update_inferred_equivalence_component(
+            source_record_uids=sr_with_shared_identifier_uids,
+            detached_source_record_uids=obsolete_inferred_equiv_sr_uids)
+        return obsolete_inferred_equiv_sr_uids
+
+    async def _update_documents(self, origin_source_record_uid: str,
+                                equivalent_uids: list[str]
+                                ) -> tuple[bool, list[Document], set[str]]:
         """
         Update the attached publications of a source record
         :param origin_source_record_uid:
-        :return:
+        :param equivalent_uids: the weakly connected graph of source records that are
+                                equivalents (inferred, predicted or asserted)
+                                to the source record
+        :return: whether a document has been created, the updated documents
+                 and the uids of the documents whose source records have changed
         """
         factory = self._get_dao_factory()
         document_created = False
-        source_record_dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        resized_document_uids = set()
         document_dao: DocumentDAO = factory.get_dao(Document)
-        # get the weakly connected graph of source records that are equivalents (inferred,
-        # predicted or asserted) to the source record
-        equivalent_source_record_uids = [origin_source_record_uid]
-        equivalent_source_record_uids.extend(
-            await source_record_dao.get_source_records_equivalent_uids(
-                origin_source_record_uid, SourceRecordDAO.EquivalenceType.ALL)
-        )
-        equivalent_source_record_uids = list(set(equivalent_source_record_uids))
+        equivalent_source_record_uids = list({origin_source_record_uid, *equivalent_uids})
         # for each equivalent source record, fetch the recorded publications and append it to the
         # publications list
         recorded_documents = [
@@ -122,6 +214,8 @@ class EquivalenceService:
         # attach all the equivalent source records to the existing document
         if len(recorded_documents) == 1:
             document = recorded_documents[0]
+            if set(document.source_record_uids) != set(equivalent_source_record_uids):
+                resized_document_uids.add(document.uid)
             document.source_record_uids = equivalent_source_record_uids
             document.to_be_recomputed = True
             await document_dao.create_or_update_document(
@@ -138,6 +232,7 @@ class EquivalenceService:
         #    Flag other publications Px as to_be_deleted and to be merged into P1.
         elif len(recorded_documents) > 1:
             main_document = self._elect_main_document(recorded_documents)
+            resized_document_uids.update(document.uid for document in recorded_documents)
             for document in recorded_documents:
                 if document.uid == main_document.uid:
                     document.source_record_uids = equivalent_source_record_uids
@@ -161,7 +256,21 @@ class EquivalenceService:
                 await document_dao.create_or_update_document(
                     document=document
                 )
-        # Send signal to update the document
+        return document_created, recorded_documents, resized_document_uids
+
+    async def _notify_documents(self, document_created: bool,
+                                recorded_documents: list[Document],
+                                update_status: SourceRecordDAO.UpdateStatus | None = None,
+                                resized_document_uids: set[str] | None = None) -> None:
+        """
+        Send the signals to update the documents
+        :param document_created: whether a document has been created
+        :param recorded_documents: the updated documents
+        :param update_status: the fields that have changed in the origin source record
+        :param resized_document_uids: the documents whose source records have changed,
+                                      which have to be fully recomputed
+        :return:
+        """
         # if the document was created, send the document_created_from_sources signal
         if document_created:
             await document_created_from_sources.send_async(self,
@@ -170,7 +279,9 @@ class EquivalenceService:
             # Otherwise, send the document_sources_changed signal for each recorded document
             for document in recorded_documents:
                 await document_sources_changed.send_async(
-                    self, document_uid=document.uid
+                    self, document_uid=document.uid,
+                    update_status=None if document.uid in (resized_document_uids or set())
+                    else update_status
                 )
 
     @staticmethod
@@ -1,15 +1,16 @@
 from loguru import logger
 
 from app.config import get_app_settings
-from app.errors.database_error import DatabaseError
 from app.errors.reference_owner_not_found_error import ReferenceOwnerNotFoundError
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
 from app.graph.generic.dao_factory import DAOFactory
+from app.graph.generic.unit_of_work import send_after_commit
 from app.graph.neo4j.neo4j_dao import Neo4jDAO
 from app.graph.neo4j.person_dao import PersonDAO
 from app.graph.neo4j.source_record_dao import SourceRecordDAO
 from app.models.agent_identifiers import PersonIdentifier
 from app.models.people import Person
+from app.models.source_journal import SourceJournal
 from app.models.source_records import SourceRecord
 from app.services.concepts.concept_service import ConceptService
 from app.services.source_contributors.source_organization_service import SourceOrganizationService
@@ -25,50 +26,135 @@ class SourceRecordService:
 
     async def create_source_record(self, source_record: SourceRecord,
                                    harvested_for: Person,
-                                   identifier_used: PersonIdentifier) -> SourceRecord:
+                                   identifier_used: PersonIdentifier,
+                                   prepared: bool = False) -> SourceRecord:
         """
         Create a source bibliographic record in the graph database
-        from a Pydantic SourceRecord object and a Pydantic Person object
+        from a Pydantic SourceRecord object and a Pydantic Person object.
+        The source record and its related entities are written all together or not at all :
+        a database error in any step rolls back the whole unit of work and is raised.
         :param source_record: Pydantic SourceRecord object
         :param harvested_for: Pydantic Person object.
                 The person the reference has been harvested for
         :param identifier_used: person identifier that triggered the harvest
+        :param prepared: True if harvested_for is the registered person returned by
+                find_source_record_owners and the related entities of the source record
+                have been registered with prepare_source_records
         :return:
         """
-        person = await self._handle_source_record_owner(harvested_for)
-        await self._handle_source_record_contributors(source_record)
-        await self._handle_source_record_affiliations(source_record)
-        await self._handle_source_record_subjects(source_record)
-        await self._handle_source_record_journal(source_record)
-        status = await self._create_source_record(source_record, person, identifier_used)
-        await self._update_source_record_contributions(source_record)
-        if status == Neo4jDAO.Status.CREATED:
-            await source_record_created.send_async(self, source_record_id=source_record.uid)
+        unit_of_work = self._get_dao_factory().get_unit_of_work()
+        await unit_of_work.run(self._save_source_record, source_record, harvested_for,
+                               identifier_used, create=True, prepared=prepared)
         return source_record
 
     async def update_source_record(self, source_record: SourceRecord,
                                    harvested_for: Person,
-                                   identifier_used: PersonIdentifier) -> SourceRecord:
+                                   identifier_used: PersonIdentifier,
+                                   prepared: bool = False,
+                                   stored_source_record: SourceRecord | None = None
+                                   ) -> SourceRecord:
         """
         Update a source bibliographic record in the graph database
-        from a Pydantic SourceRecord object and a Pydantic Person object
+        from a Pydantic SourceRecord object and a Pydantic Person object.
+        The source record and its related entities are written all together or not at all :
+        a database error in any step rolls back the whole unit of work and is raised.
         :param source_record: Pydantic SourceRecord object
         :param harvested_for: Pydantic Person object.
                The person the reference has been harvested for
         :param identifier_used: person identifier that triggered the harvest
+        :param prepared: True if harvested_for is the registered person returned by
+                find_source_record_owners and the related entities of the source record
+                have been registered with prepare_source_records
+        :param stored_source_record: with prepared=True, the source record as stored
+                before prepare_source_records, which tells the changes of its contributors
         :return:
         """
-        person = await self._handle_source_record_owner(harvested_for)
-        await self._handle_source_record_contributors(source_record)
-        await self._handle_source_record_affiliations(source_record)
-        await self._handle_source_record_subjects(source_record)
-        await self._handle_source_record_journal(source_record)
-        status = await self._update_source_record(source_record, person, identifier_used)
-        await self._update_source_record_contributions(source_record)
-        if status == Neo4jDAO.Status.UPDATED:
-            await source_record_updated.send_async(self, source_record_id=source_record.uid)
+        # the batch options are forwarded as is to _save_source_record
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        unit_of_work = self._get_dao_factory().get_unit_of_work()
+        await unit_of_work.run(self._save_source_record, source_record, harvested_for,
+                               identifier_used, create=False, prepared=prepared,
+                               stored_source_record=stored_source_record)
         return source_record
 
+    async def find_source_record_owners(self, harvested_for: list[Person]
+                                        ) -> list[Person | None]:
+        """
+        Find the registered people several source records have been harvested for,
+        looking each distinct person up once
+        :param harvested_for: Pydantic Person objects, one per source record
+        :return: the registered people, in the same order, None for unknown people
+        """
+        owners: dict[tuple, Person | None] = {}
+        for person in harvested_for:
+            key = self._person_lookup_key(person)
+            if key not in owners:
+                try:
+                    owners[key] = await self._handle_source_record_owner(person)
+                except ReferenceOwnerNotFoundError:
+                    owners[key] = None
+        return [owners[self._person_lookup_key(person)] for person in harvested_for]
+
+    async def prepare_source_records(self, source_records: list[SourceRecord]
+                                     ) -> dict[str, SourceRecord]:
+        """
+        Register the contributors, affiliations, subjects and journals of several source
+        records at once : entities shared by several source records are written once.
+        The source records can then be saved with prepared=True.
+        :param source_records: Pydantic SourceRecord objects
+        :return: the already stored source records by uid, as they were
+                 before their related entities were registered
+        """
+        unit_of_work = self._get_dao_factory().get_unit_of_work()
+        return await unit_of_work.run(self._prepare_source_records, source_records)
+
+    async def _prepare_source_records(self, source_records: list[SourceRecord]
+                                      ) -> dict[str, SourceRecord]:
+        source_record_dao: SourceRecordDAO = self._get_dao_factory().get_dao(SourceRecord)
+        stored_source_records = await source_record_dao.get_many(
+            [source_record.uid for source_record in source_records])
+        await self._register_related_entities(source_records)
+        return {source_record.uid: source_record for source_record in stored_source_records}
+
+    async def _save_source_record(self, source_record: SourceRecord,
+                                  harvested_for: Person,
+                                  identifier_used: PersonIdentifier,
+                                  create: bool,
+                                  prepared: bool = False,
+                                  stored_source_record: SourceRecord | None = None) -> None:
+        # the options tell what a batch of messages has already done before saving
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        # runs inside a unit of work : signals are only sent once it has been committed
+        if prepared:
+            person = harvested_for
+        else:
+            person = await self._handle_source_record_owner(harvested_for)
+            if not create:
+                # read before the shared contributors and affiliations are overwritten
+                stored_source_record = await self.get_source_record(source_record.uid)
+            await self._register_related_entities([source_record])
+        update_status = None
+        if create:
+            status = await self._create_source_record(source_record, person, identifier_used)
+        else:
+            status, update_status = await self._update_source_record(source_record, person,
+                                                                     identifier_used,
+                                                                     stored_source_record)
+        await self._update_source_record_contributions(source_record)
+        if status == Neo4jDAO.Status.CREATED:
+            await send_after_commit(source_record_created, self,
+                                    source_record_id=source_record.uid)
+        elif status == Neo4jDAO.Status.UPDATED:
+            await send_after_commit(source_record_updated, self,
+                                    source_record_id=source_record.uid,
+                                    update_status=update_status)
+
+    async def _register_related_entities(self, source_records: list[SourceRecord]) -> None:
+        await self._handle_source_records_contributors(source_records)
+        await self._handle_source_records_affiliations(source_records)
+        await self._handle_source_records_subjects(source_records)
+        await self._handle_source_records_journals(source_records)
+
     async def _create_source_record(self, source_record, person,
                                     identifier_used: PersonIdentifier) -> Neo4jDAO.Status:
         source_record_dao: SourceRecordDAO = self._get_dao_factory().get_dao(SourceRecord)
@@ -79,92 +165,96 @@ class SourceRecordService:
 
     async def _update_source_record_contributions(self, source_record):
         source_record_dao: SourceRecordDAO = self._get_dao_factory().get_dao(SourceRecord)
-        await source_record_dao.delete_contributions(source_record.uid)
-        for contribution in source_record.contributions:
-            try:
-                await source_record_dao.create_contribution(contribution, source_record.uid)
-            except ValueError as e:
-                logger.error(
-                    f"Invalid data error while creating contribution {contribution} : {e}")
-            except DatabaseError as e:
-                logger.error(f"Database error while creating contribution {contribution} : {e}")
+        errors = await source_record_dao.update_contributions(source_record.uid,
+                                                              source_record.contributions)
+        for contribution, message in errors:
+            logger.error(
+                f"Invalid data error while creating contribution {contribution} : {message}")
 
     async def _update_source_record(self, source_record, person,
-                                    identifier_used: PersonIdentifier) -> Neo4jDAO.Status:
+                                    identifier_used: PersonIdentifier,
+                                    stored_source_record: SourceRecord | None
+                                    ) -> tuple[Neo4jDAO.Status,
+                                               SourceRecordDAO.UpdateStatus | None]:
         source_record_dao: SourceRecordDAO = self._get_dao_factory().get_dao(SourceRecord)
-        _, status, _ = await source_record_dao.update(
+        _, status, update_status = await source_record_dao.update(
             source_record=source_record,
             harvested_for=person,
-            identifier_used=identifier_used
+            identifier_used=identifier_used,
+            stored_source_record=stored_source_record
         )
-        return status
+        return status, update_status
 
-    async def _handle_source_record_journal(self, source_record: SourceRecord) -> None:
-        if not source_record.issue or not source_record.issue.journal:
-            return
-        source_journal = source_record.issue.journal
+    async def _handle_source_records_journals(self, source_records: list[SourceRecord]
+                                              ) -> None:
         source_journal_service = SourceJournalService()
-        registered_source_journal = None
-        try:
-            registered_source_journal = await \
-                source_journal_service.create_or_update_source_journal(
-                    source_journal)
-        except ValueError as e:
-            logger.error(
-                f"Invalid data error while creating or updating source journal {source_journal} :"
-                f" {e}")
-        except DatabaseError as e:
-            logger.error(
-                f"Database error while creating or updating source journal {source_journal} : {e}")
-        source_record.issue.journal = registered_source_journal
+        # journals shared by several source records are written once
+        registered_source_journals: dict[str, SourceJournal | None] = {}
+        for source_record in source_records:
+            if not source_record.issue or not source_record.issue.journal:
+                continue
+            source_journal = source_record.issue.journal
+            if source_journal.uid not in registered_source_journals:
+                registered_source_journal = None
+                try:
+                    registered_source_journal = await \
+                        source_journal_service.create_or_update_source_journal(
+                            source_journal)
+                except ValueError as e:
+                    logger.error(
+                        f"Invalid data error while creating or updating source journal "
+                        f"{source_journal} : {e}")
+                registered_source_journals[source_journal.uid] = registered_source_journal
+            source_record.issue.journal = registered_source_journals[source_journal.uid]
 
-    async def _handle_source_record_subjects(self, source_record: SourceRecord) -> None:
+    async def _handle_source_records_subjects(self, source_records: list[SourceRecord]
+                                              ) -> None:
         concept_service = ConceptService()
-        registered_concepts = []
-        for subject in source_record.subjects:
-            try:
-                concept = await concept_service.create_or_update_concept(subject)
-                registered_concepts.append(concept)
-            except ValueError as e:
-                logger.error(f"Invalid data error while creating or updating concept {subject} :"
-                             f" {e}")
-            except DatabaseError as e:
-                logger.error(f"Database error while creating or updating concept {subject} : {e}")
-        source_record.subjects = registered_concepts
-
-    async def _handle_source_record_contributors(self, source_record: SourceRecord) -> None:
+        subjects = [subject for source_record in source_records
+                    for subject in source_record.subjects]
+        registered_subjects = {
+            subject.uid: subject for subject in
+            await concept_service.create_or_update_concepts(subjects)
+        }
+        # invalid concepts are not registered and are dropped
+        for source_record in source_records:
+            source_record.subjects = [registered_subjects[subject.uid]
+                                      for subject in source_record.subjects
+                                      if subject.uid in registered_subjects]
+
+    async def _handle_source_records_contributors(self, source_records: list[SourceRecord]
+                                                  ) -> None:
         source_contributors_service = SourcePersonService()
-        for i, contribution in enumerate(source_record.contributions):
-            try:
-                source_record.contributions[i].contributor = \
-                    await source_contributors_service.create_or_update_source_person(
-                        contribution.contributor)
-            except ValueError as e:
-                logger.error(
-                    f"Invalid data error while creating or updating source contributor "
-                    f"{contribution.contributor} : {e}")
-            except DatabaseError as e:
-                logger.error(
-                    "Database error while creating or updating source contributor "
-                    f"{contribution.contributor} : {e}")
-
-    async def _handle_source_record_affiliations(self, source_record: SourceRecord) -> None:
+        contributors = [contribution.contributor
+                        for source_record in source_records
+                        for contribution in source_record.contributions]
+        registered_contributors = {
+            contributor.uid: contributor for contributor in
+            await source_contributors_service.create_or_update_source_people(contributors)
+        }
+        for source_record in source_records:
+            for contribution in source_record.contributions:
+                contribution.contributor = registered_contributors[contribution.contributor.uid]
+
+    async def _handle_source_records_affiliations(self, source_records: list[SourceRecord]
+                                                  ) -> None:
         source_organization_service = SourceOrganizationService()
-        for contribution in source_record.contributions:
-            for i, source_organization in enumerate(contribution.affiliations):
-                try:
-                    contribution.affiliations[
-                        i] = await source_organization_service.create_or_update_source_organization(
-                        source_organization
-                    )
-                except ValueError as e:
-                    logger.error(
-                        "Invalid data error while creating or updating affiliation "
-                        f"{source_organization} : {e}")
-                except DatabaseError as e:
-                    logger.error(
-                        "Database error while creating or updating affiliation "
-                        f"{source_organization} : {e}")
+        # organizations repeated across authors and source records are written once
+        affiliations = [source_organization
+                        for source_record in source_records
+                        for contribution in source_record.contributions
+                        for source_organization in contribution.affiliations]
+        if not affiliations:
+            return
+        registered_affiliations = {
+            source_organization.uid: source_organization for source_organization in
+            await source_organization_service.create_or_update_source_organizations(
+                affiliations)
+        }
+        for source_record in source_records:
+            for contribution in source_record.contributions:
+                contribution.affiliations = [registered_affiliations[source_organization.uid]
+                                             for source_organization in contribution.affiliations]
 
     async def _handle_source_record_owner(self, harvested_for: Person) -> Person:
         factory = self._get_dao_factory()
@@ -184,6 +274,16 @@ class SourceRecordService:
         dao: SourceRecordDAO = factory.get_dao(SourceRecord)
         return await dao.get(source_record_uid)
 
+    async def get_source_records(self, source_record_uids: list[str]) -> list[SourceRecord]:
+        """
+        Get several source records from the graph database in a single query
+        :param source_record_uids: source record uids
+        :return: Pydantic SourceRecord objects, in the order of the uids
+        """
+        factory = self._get_dao_factory()
+        dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        return await dao.get_many(source_record_uids)
+
     async def source_record_exists(self, source_record_uid: str) -> bool:
         """
         Check if a source record exists in the graph database
@@ -194,6 +294,23 @@ class SourceRecordService:
         dao: SourceRecordDAO = factory.get_dao(SourceRecord)
         return await dao.source_record_exists(source_record_uid)
 
+    async def get_existing_source_record_uids(self, source_record_uids: list[str]) -> set[str]:
+        """
+        Get, among several source record uids, the ones that exist in the graph database,
+        in a single query
+        :param source_record_uids: source record uids
+        :return: the uids of the existing source records
+        """
+        factory = self._get_dao_factory()
+        dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+        return await dao.get_existing_uids(source_record_uids)
+
+    @staticmethod
+    def _person_lookup_key(person: Person) -> tuple:
+        # people are looked up by their identifiers only
+        return tuple(sorted((identifier.type.value, identifier.value)
+                            for identifier in person.identifiers))
+
     @staticmethod
     def _get_dao_factory() -> DAOFactory:
         settings = get_app_settings()
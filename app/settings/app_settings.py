@@ -59,6 +59,52 @@ class AppSettings(BaseSettings):
     amqp_wait_before_shutdown: int = 30
     amqp_task_parallelism_limit: int = 10
     amqp_prefetch_count: int = 10
+    # topics whose messages are routed to a fixed worker by the value found
+    # at a dotted JSON path, e.g. {"publications": "entity.identifiers"} :
+    # messages with the same value are processed in order, one at a time
+    amqp_shard_routing_paths: dict[str, str] = {}
+    # with routed topics, the prefetch count is raised to at least this number of messages
+    # per shard, so that a burst of messages with the same value does not hold every
+    # unacknowledged message of the channel while the other shards are idle
+    amqp_shard_prefetch_depth: int = 4
+    # publication messages are processed in batches of up to this size,
+    # waiting at most the timeout (in milliseconds) for the batch to fill :
+    # owners, contributors, affiliations, subjects and journals are resolved
+    # once per batch. A size of 1 processes messages one by one.
+    amqp_reference_batch_size: int = 1
+    amqp_reference_batch_timeout: int = 200
+    # adaptive concurrency : every interval (in seconds), the number of active workers
+    # of a topic is increased by one while they are all busy and the mean processing time
+    # stays under the target (in seconds). It is multiplied by the decrease factor
+    # when the target is exceeded or when Neo4j transient errors (deadlocks...) occur.
+    # The prefetch count of the channel, shared by all the topics, follows the sum of their
+    # worker limits in the configured ratio, each topic within the adaptive prefetch bounds.
+    amqp_adaptive_concurrency_enabled: bool = False
+    amqp_adaptive_concurrency_interval: float = 10.0
+    amqp_adaptive_concurrency_target_processing_time: float = 2.0
+    amqp_adaptive_concurrency_transient_error_threshold: int = 1
+    amqp_adaptive_concurrency_decrease_factor: float = 0.5
+    amqp_adaptive_concurrency_min_workers: int = 1
+    amqp_adaptive_concurrency_max_workers: int = 20
+    amqp_adaptive_prefetch_min: int = 1
+    amqp_adaptive_prefetch_max: int = 50
+    # priority lanes : with a positive shared capacity, at most that many messages
+    # are processed at the same time across all the topics. A free slot goes to the waiting
+    # topic with the lowest priority value, and the reserved slots of a topic can only be
+    # used by this topic : publications use whatever remains.
+    amqp_shared_capacity: int = 0
+    amqp_topic_priorities: dict[str, int] = {
+        "user_actions": 0,
+        "people": 1,
+        "structures": 1,
+        "harvesting_events": 2,
+        "publications": 3,
+    }
+    amqp_reserved_capacity: dict[str, int] = {
+        "user_actions": 2,
+        "people": 1,
+        "structures": 1,
+    }
     amqp_publications_topic: str = "publications"
     amqp_harvesting_events_topic: str = "harvesting_events"
     amqp_publications_exchange_name: str = "publications"
@@ -125,6 +171,10 @@ class AppSettings(BaseSettings):
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "password"
+    neo4j_max_connection_pool_size: int = 100
+    neo4j_connection_acquisition_timeout: float = 60.0  # in seconds
+    neo4j_max_connection_lifetime: int = 3600  # in seconds
+    neo4j_explain_queries_at_startup: bool = False
 
     es_enabled: bool = True
     es_host: str = "http://localhost"
@@ -158,6 +208,36 @@ class AppSettings(BaseSettings):
 
     coauthor_names_maximal_distance: int = 30
     reluctance_to_fuzzy_match_authors: int = 3  # 1 is low, 10 is high, 30 is very high
+    clustering_scratch_gc_batch_size: int = 10000
+    clustering_scratch_gc_interval: int = 0  # in seconds, 0 disables the scheduled collection
+
+    # publication identifiers shared by more source records than the ceiling of their type
+    # (e.g. DOI prefixes, ISBNs of proceedings volumes, bogus values) are not used
+    # to infer equivalences between source records
+    publication_identifier_default_fan_out_ceiling: int = 50
+    publication_identifier_fan_out_ceilings: dict[str, int] = {}
+
+    # number of in-process locks shared by the source record equivalence components
+    equivalence_lock_stripes: int = 1024
+
+    # in-process cache of the authority organizations resolved from source organization clusters
+    authority_organization_cache_size: int = 2048  # 0 disables the cache
+    authority_organization_cache_ttl: int = 600  # in seconds
+
+    # recomputed documents identical to the stored ones are not written again :
+    # signal them as unchanged, or do not signal them at all
+    signal_unchanged_documents: bool = True
+
+    # recomputations of a document requested within the quiet window are coalesced into one
+    document_recomputation_quiet_window: float = 2.0  # in seconds, 0 recomputes immediately
+    document_recomputation_max_delay: float = 30.0  # in seconds
+    document_recomputation_concurrency: int = 8
+    # requesting the recomputation of a new document waits once this number is pending
+    document_recomputation_max_pending: int = 10000
+    # documents still flagged to be recomputed, e.g. whose scheduled recomputation
+    # was lost when the process stopped, are recomputed at startup
+    document_recomputation_sweep_at_startup: bool = True
+    document_recomputation_sweep_batch_size: int = 1000
 
     issn_check_delay: int = 3 * 30 * 24 * 60 * 60  # 3 months in seconds
 
@@ -52,6 +52,10 @@ class TestAppSettings(AppSettings):
 
     neo4j_uri: str = "bolt://localhost:7688"
 
+    # documents are recomputed as soon as their sources change so that tests can check them
+    document_recomputation_quiet_window: float = 0.0
+    document_recomputation_sweep_at_startup: bool = False
+
     es_enabled: bool = True
     es_host: str = "http://localhost"
     es_port: int = 9201
@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Generic, Hashable, Iterable, NamedTuple, TypeVar
+
+V = TypeVar("V")  # pylint: disable=invalid-name
+
+
+@dataclass
+class _Counters:
+    """
+    Counters reported by the cache statistics
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class LruTtlCache(Generic[V]):
+    """
+    In-process cache bounded in size (least recently used entries are evicted first)
+    and in age (entries expire after a time to live)
+
+    Entries can be tagged, so that all the entries depending on an object
+    can be invalidated at once when this object changes.
+    A max size of 0 disables the cache.
+    """
+
+    class _Entry(NamedTuple):
+        value: object
+        expires_at: float
+        tags: frozenset
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, LruTtlCache._Entry] = OrderedDict()
+        self._keys_by_tag: dict[Hashable, set[Hashable]] = {}
+        self._counters = _Counters()
+
+    def get(self, key: Hashable) -> V | None:
+        """
+        Get a value from the cache
+
+        :param key: cache key
+        :return: the cached value or None if absent or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self._counters.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value: V, tags: Iterable[Hashable] = ()) -> None:
+        """
+        Put a value in the cache, evicting the least recently used entries if full
+
+        :param key: cache key
+        :param value: value to cache
+        :param tags: tags of the objects the value depends on
+        :return: None
+        """
+        if self.max_size <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = LruTtlCache._Entry(value=value, expires_at=time.monotonic() + self.ttl,
+                                   tags=frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self._counters.evictions += 1
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """
+        Remove all the entries tagged with a tag
+
+        :param tag: tag of the changed object
+        :return: number of removed entries
+        """
+        keys = list(self._keys_by_tag.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self._counters.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the counters
+
+        :return: None
+        """
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._counters = _Counters()
+
+    def statistics(self) -> dict:
+        """
+        Get the size and the counters of the cache
+
+        :return: dictionary of statistics
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            **asdict(self._counters),
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
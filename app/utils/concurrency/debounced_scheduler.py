@@ -0,0 +1,198 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Generic, NamedTuple, TypeVar
+
+from loguru import logger
+
+from app.utils.concurrency.priority_scheduler import PriorityScheduler
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Request(Generic[T]):
+    """
+    Requests received for a key and not served yet
+    """
+    argument: T
+    lane: str
+    deadline: float
+    latest_deadline: float
+
+
+@dataclass
+class _Counters:
+    """
+    Counters reported by the scheduler statistics
+    """
+    running: int = 0
+    requested: int = 0
+    coalesced: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _LoopBound:
+    """
+    Asyncio primitives of the scheduler, bound to the event loop they are first used in
+    """
+    loop: asyncio.AbstractEventLoop
+    slots: PriorityScheduler
+    capacity: asyncio.Semaphore
+    draining: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class DebouncedScheduler(Generic[T]):
+    """
+    Run an async job once per key after a quiet window without new request for the key
+
+    Requests received for a pending key are coalesced with the merge function.
+    A key requested while its job is running is run again once the job is over,
+    never concurrently. Jobs of different keys run with bounded concurrency,
+    the jobs requested from the lanes with the highest priority first.
+    The number of keys pending or running is bounded : requesting a new key
+    waits for another key to be over once the bound is reached.
+    """
+
+    # lane of the requests made without lane, after all the prioritized lanes
+    DEFAULT_LANE = "default"
+
+    class Limits(NamedTuple):
+        """
+        Timing and capacity limits of a debounced scheduler
+
+        quiet_window: delay without new request before the job of a key is run, in seconds
+        max_delay: maximal delay between the first request and the job of a key,
+                   in seconds, so that a key requested continuously is still run
+        concurrency: maximal number of jobs running at the same time
+        max_pending: maximal number of keys pending or running at the same time
+        priorities: priority of each lane the jobs are requested from, lowest values first
+        """
+        quiet_window: float
+        max_delay: float
+        concurrency: int
+        max_pending: int
+        priorities: dict[str, int] = {}
+
+    def __init__(self, job: Callable[[str, T], Awaitable[None]],
+                 merge: Callable[[T, T], T],
+                 limits: "DebouncedScheduler.Limits"):
+        """
+        :param job: the job to run, called with the key and the merged argument
+        :param merge: function merging the arguments of two requests for the same key
+        :param limits: the timing and capacity limits of the scheduler
+        """
+        assert limits.concurrency > 0, \
+            "A debounced scheduler needs to run at least one job at a time"
+        assert limits.max_pending >= limits.concurrency, \
+            "A debounced scheduler needs to keep pending as many keys as it runs"
+        self._job = job
+        self._merge = merge
+        self._limits = limits
+        self._pending: dict[str, _Request[T]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._counters = _Counters()
+        self._loop_bound: _LoopBound | None = None
+
+    async def schedule(self, key: str, argument: T, lane: str | None = None) -> None:
+        """
+        Request a run of the job for a key
+
+        A key requested from several lanes is run with the priority of the best of them,
+        provided that it is not already waiting for a free slot.
+        Waits for another key to be over if a new key is requested
+        while the maximal number of pending keys is reached.
+        :param key: the key to run the job for
+        :param argument: the argument of the request
+        :param lane: the lane the request comes from, None for the default lane
+        :return: None
+        """
+        loop_bound = self._bind_to_loop()
+        if key not in self._tasks:
+            await loop_bound.capacity.acquire()
+            if key in self._tasks:
+                # requested again while waiting for capacity
+                loop_bound.capacity.release()
+            else:
+                self._tasks[key] = loop_bound.loop.create_task(self._run(key))
+        self._counters.requested += 1
+        lane = lane or self.DEFAULT_LANE
+        now = loop_bound.loop.time()
+        request = self._pending.get(key)
+        if request is None:
+            request = self._pending[key] = _Request(
+                argument=argument, lane=lane, deadline=now,
+                latest_deadline=now + self._limits.max_delay)
+        else:
+            request.argument = self._merge(request.argument, argument)
+            request.lane = min(request.lane, lane, key=loop_bound.slots.priority)
+            self._counters.coalesced += 1
+        request.deadline = min(now + self._limits.quiet_window, request.latest_deadline)
+
+    def scheduled(self, key: str) -> bool:
+        """
+        Check if the job of a key is pending or running
+
+        :param key: the key
+        :return: True if the job of the key is pending or running
+        """
+        return key in self._tasks
+
+    async def drain(self) -> None:
+        """
+        Run all the pending jobs without waiting for their quiet window
+        and wait for them to be over
+
+        :return: None
+        """
+        loop_bound = self._bind_to_loop()
+        loop_bound.draining.set()
+        try:
+            while self._tasks:
+                await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        finally:
+            loop_bound.draining.clear()
+
+    def statistics(self) -> dict:
+        """
+        Get statistics about the scheduler
+        :return: dictionary of statistics
+        """
+        return {"pending": len(self._pending), **asdict(self._counters)}
+
+    async def _run(self, key: str) -> None:
+        loop_bound = self._bind_to_loop()
+        try:
+            while key in self._pending:
+                while (not loop_bound.draining.is_set()
+                       and (delay := self._pending[key].deadline - loop_bound.loop.time()) > 0):
+                    try:
+                        await asyncio.wait_for(loop_bound.draining.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                async with loop_bound.slots.slot(self._pending[key].lane):
+                    # requests received until now are served by this run
+                    request = self._pending.pop(key)
+                    self._counters.running += 1
+                    try:
+                        await self._job(key, request.argument)
+                        self._counters.completed += 1
+                    except Exception as error:  # pylint: disable=broad-exception-caught
+                        self._counters.failed += 1
+                        logger.exception(f"Scheduled job for {key} failed : {error}")
+                    finally:
+                        self._counters.running -= 1
+        finally:
+            self._tasks.pop(key, None)
+            loop_bound.capacity.release()
+
+    def _bind_to_loop(self) -> _LoopBound:
+        # asyncio primitives are bound to the event loop they are first used in
+        loop = asyncio.get_running_loop()
+        if self._loop_bound is None or self._loop_bound.loop is not loop:
+            self._loop_bound = _LoopBound(
+                loop=loop,
+                slots=PriorityScheduler(self._limits.concurrency, self._limits.priorities),
+                capacity=asyncio.Semaphore(self._limits.max_pending))
+        return self._loop_bound
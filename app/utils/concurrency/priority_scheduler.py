@@ -0,0 +1,136 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+# lane of the work processed by the current task (e.g. the topic of the message),
+# inherited by the work it requests, such as document recomputations
+current_priority_lane: ContextVar[str | None] = ContextVar(
+    "current_priority_lane", default=None
+)
+
+
+@dataclass
+class _SlotUsage:
+    """
+    Slots held by the lanes, and granted to them since the scheduler was created
+    """
+    shared_in_use: int = 0
+    reserved_in_use: dict[str, int] = field(default_factory=dict)
+    in_use: dict[str, int] = field(default_factory=dict)
+    granted: dict[str, int] = field(default_factory=dict)
+
+
+class PriorityScheduler:
+    """
+    Share a bounded processing capacity between lanes with strict priorities
+
+    A free slot is granted to the waiting lane with the lowest priority value first,
+    in request order within a lane. Reserved slots can only be used by their lane,
+    so that a lane with reserved slots never waits for the other lanes to release theirs :
+    the lanes without reservation share whatever remains.
+    """
+
+    def __init__(self, capacity: int, priorities: dict[str, int],
+                 reserved: dict[str, int] | None = None):
+        """
+        :param capacity: maximal number of slots held at the same time across all lanes
+        :param priorities: priority of each lane, lowest values first.
+                           Lanes not listed come after all the listed ones.
+        :param reserved: number of slots reserved for each lane
+        """
+        reserved = reserved or {}
+        assert sum(reserved.values()) < capacity, \
+            "Reserved slots should leave at least one shared slot"
+        self._capacity = capacity
+        self._priorities = priorities
+        self._reserved = reserved
+        self._shared = capacity - sum(reserved.values())
+        self._usage = _SlotUsage(reserved_in_use={lane: 0 for lane in reserved})
+        self._waiters: list[tuple[int, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, lane: str) -> AsyncIterator[None]:
+        """
+        Wait for a slot of a lane and hold it
+
+        :param lane: the lane requesting the slot
+        :return: None
+        """
+        reserved = await self._acquire(lane)
+        try:
+            yield
+        finally:
+            self._release(lane, reserved)
+
+    def statistics(self) -> dict:
+        """
+        Get statistics about the scheduler
+        :return: dictionary of statistics
+        """
+        waiting: dict[str, int] = {}
+        for _, _, lane, future in self._waiters:
+            if not future.done():
+                waiting[lane] = waiting.get(lane, 0) + 1
+        return {
+            "capacity": self._capacity,
+            "in_use": dict(self._usage.in_use),
+            "waiting": waiting,
+            "granted": dict(self._usage.granted),
+        }
+
+    async def _acquire(self, lane: str) -> bool:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (self.priority(lane), next(self._sequence), lane, future))
+        self._grant()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted while being cancelled : the slot is given back
+                self._release(lane, future.result())
+            raise
+
+    def _release(self, lane: str, reserved: bool) -> None:
+        self._usage.in_use[lane] -= 1
+        if reserved:
+            self._usage.reserved_in_use[lane] -= 1
+        else:
+            self._usage.shared_in_use -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        # waiters are visited by priority : a waiter that cannot be served
+        # does not prevent a lane with a free reserved slot from being served
+        remaining = []
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            _, _, lane, future = waiter
+            if future.done():
+                continue
+            if self._usage.reserved_in_use.get(lane, 0) < self._reserved.get(lane, 0):
+                self._usage.reserved_in_use[lane] += 1
+                future.set_result(True)
+            elif self._usage.shared_in_use < self._shared:
+                self._usage.shared_in_use += 1
+                future.set_result(False)
+            else:
+                remaining.append(waiter)
+                continue
+            self._usage.in_use[lane] = self._usage.in_use.get(lane, 0) + 1
+            self._usage.granted[lane] = self._usage.granted.get(lane, 0) + 1
+        self._waiters = remaining
+        heapq.heapify(self._waiters)
+
+    def priority(self, lane: str) -> int:
+        """
+        Get the priority of a lane, lowest values first
+
+        :param lane: the lane
+        :return: the priority of the lane
+        """
+        return self._priorities.get(lane, max(self._priorities.values(), default=0) + 1)
@@ -0,0 +1,56 @@
+import asyncio
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Iterable
+
+
+class StripedLock:
+    """
+    Fixed set of asyncio locks shared by arbitrary string keys
+
+    Each key is mapped to one of the stripes, so that holding the locks of a set of keys
+    only blocks the tasks working on keys of the same stripes. Stripes are always acquired
+    in the same order, so two tasks locking overlapping key sets cannot deadlock.
+    """
+
+    def __init__(self, stripes: int):
+        assert stripes > 0, "A striped lock needs at least one stripe"
+        self._stripes = stripes
+        self._locks: list[asyncio.Lock] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def stripes_of(self, keys: Iterable[str]) -> list[int]:
+        """
+        Get the sorted stripe indexes of a set of keys
+        :param keys: keys to lock
+        :return: sorted list of distinct stripe indexes
+        """
+        return sorted({zlib.crc32(key.encode("utf8")) % self._stripes for key in keys})
+
+    @asynccontextmanager
+    async def hold(self, keys: Iterable[str]) -> AsyncGenerator[list[int], None]:
+        """
+        Hold the locks of all the stripes of a set of keys
+
+        :param keys: keys to lock
+        :yields: the held stripe indexes
+        """
+        locks = self._get_locks()
+        stripes = self.stripes_of(keys)
+        acquired: list[asyncio.Lock] = []
+        try:
+            for stripe in stripes:
+                await locks[stripe].acquire()
+                acquired.append(locks[stripe])
+            yield stripes
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def _get_locks(self) -> list[asyncio.Lock]:
+        # asyncio locks are bound to the event loop they are first used in
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._locks = [asyncio.Lock() for _ in range(self._stripes)]
+            self._loop = loop
+        return self._locks
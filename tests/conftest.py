@@ -9,6 +9,8 @@ from yarl import URL
 
 from app.crisalid_ikg import CrisalidIKG
 from app.graph.neo4j.global_dao import GlobalDAO
+from app.services.authority_organizations.authority_organization_service import \
+    AuthorityOrganizationService
 from tests.fixtures.common import *  # pylint: disable=unused-import, wildcard-import, unused-wildcard-import
 from tests.fixtures.people_fixtures import *  # pylint: disable=unused-import, wildcard-import, unused-wildcard-import
 from tests.fixtures.organization_fixtures import *  # pylint: disable=unused-import, wildcard-import, unused-wildcard-import
@@ -48,6 +50,8 @@ async def reset_graph():
     factory = AbstractDAOFactory().get_dao_factory(settings.graph_db)
     global_dao: GlobalDAO = factory.get_dao()
     await global_dao.reset_all()
+    # roots cached by a previous test do not exist anymore
+    AuthorityOrganizationService.clear_resolution_cache()
     yield
     await global_dao.reset_all()
     setup = factory.get_setup()
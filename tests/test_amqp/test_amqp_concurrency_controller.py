@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from neo4j.exceptions import TransientError
+
+from app.amqp.amqp_concurrency_controller import AMQPConcurrencyController, \
+    AdaptiveConcurrencyLimit
+from app.config import get_app_settings
+from app.errors.database_error import DatabaseError, TransientErrorCounter, \
+    handle_database_errors
+
+
+def _controller() -> tuple[AMQPConcurrencyController, AsyncMock]:
+    settings = get_app_settings().model_copy(update={
+        "amqp_task_parallelism_limit": 4,
+        "amqp_prefetch_count": 8,
+        "amqp_adaptive_concurrency_target_processing_time": 0.05,
+        "amqp_adaptive_concurrency_min_workers": 1,
+        "amqp_adaptive_concurrency_max_workers": 6,
+    })
+    set_prefetch = AsyncMock()
+    return AMQPConcurrencyController(settings, set_prefetch), set_prefetch
+
+
+async def _process(limit: AdaptiveConcurrencyLimit, messages: int, duration: float) -> None:
+    async def process_message():
+        async with limit.slot():
+            await asyncio.sleep(duration)
+
+    await asyncio.gather(*(process_message() for _ in range(messages)))
+
+
+async def test_limit_bounds_concurrent_processing_and_can_be_raised():
+    """
+    Given an adaptive concurrency limit of one
+    When three messages are processed at the same time and the limit is raised to three
+    Then only one message should be processed before the limit is raised
+    and the two waiting messages should be processed alongside it afterwards
+    """
+    limit = AdaptiveConcurrencyLimit(1)
+    active = []
+
+    async def process_message():
+        async with limit.slot():
+            active.append(limit.active)
+            await asyncio.sleep(0.01)
+
+    tasks = [asyncio.create_task(process_message()) for _ in range(3)]
+    await asyncio.sleep(0.005)
+    assert active == [1]
+    await limit.set_limit(3)
+    await asyncio.gather(*tasks)
+    assert active == [1, 2, 3]
+
+
+async def test_busy_topic_within_target_gets_one_more_worker():
+    """
+    Given a topic whose workers are all busy with messages processed under the target time
+    When the controller adjusts the limits
+    Then the topic should get one more active worker and the prefetch should follow
+    in the configured ratio
+    """
+    controller, set_prefetch = _controller()
+    limit = controller.limit("publications")
+    await _process(limit, 4, 0.001)
+    await controller.adjust()
+    assert limit.limit == 5
+    set_prefetch.assert_awaited_once_with(10)
+
+
+async def test_slow_topic_is_decreased_multiplicatively():
+    """
+    Given a topic whose messages are processed slower than the target time
+    When the controller adjusts the limits
+    Then the topic limit should be halved while the other topics are left unchanged
+    """
+    controller, _ = _controller()
+    slow_limit = controller.limit("publications")
+    idle_limit = controller.limit("people")
+    await _process(slow_limit, 2, 0.1)
+    await controller.adjust()
+    assert slow_limit.limit == 2
+    assert idle_limit.limit == 4
+
+
+async def test_transient_errors_decrease_all_topics():
+    """
+    Given two topics and a Neo4j transient error since the previous adjustment
+    When the controller adjusts the limits
+    Then the limits of both topics should be halved and the channel prefetch
+    should follow the sum of the new limits
+    """
+    controller, set_prefetch = _controller()
+    publications_limit = controller.limit("publications")
+    people_limit = controller.limit("people")
+    TransientErrorCounter.record(TransientError("Lock acquisition timeout"))
+    await controller.adjust()
+    assert publications_limit.limit == 2
+    assert people_limit.limit == 2
+    set_prefetch.assert_awaited_once_with(8)
+
+
+async def test_transient_error_is_counted_once_across_handlers():
+    """
+    Given a transient error already counted as the failed attempt of a unit of work
+    When it is raised again through the database error handler
+    Then it should be converted to a database error without being counted twice
+    """
+    error = TransientError("Lock acquisition timeout")
+    TransientErrorCounter.record(error)
+    count = TransientErrorCounter.count
+
+    @handle_database_errors
+    async def run_unit_of_work():
+        raise error
+
+    with pytest.raises(DatabaseError):
+        await run_unit_of_work()
+    assert TransientErrorCounter.count == count
@@ -1,3 +1,6 @@
+import asyncio
+import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 from app.amqp.amqp_interface import AMQPInterface
@@ -22,3 +25,129 @@ async def test_amqp_connect(mock_connect):
     assert amqp_interface.pika_channel.declare_exchange.call_count == 4
     assert [key in amqp_interface.pika_exchanges for key in
             ["people", "structures", "publications"]]
+
+
+
+async def test_sharded_topic_routes_messages_by_key():
+    """
+    Given an AMQP interface routing the publications topic by harvested for person identifiers
+    When messages for the same person are routed
+    Then they should all go to the same shard queue
+    and the queue depths should be reported per shard
+    """
+    # pylint: disable=protected-access
+    settings = get_app_settings().model_copy(
+        update={"amqp_shard_routing_paths": {"publications": "entity.identifiers"}})
+    amqp_interface = AMQPInterface(settings)
+    amqp_interface.inner_tasks_shard_queues["publications"] = [asyncio.Queue() for _ in range(4)]
+
+    def message(orcid: str) -> SimpleNamespace:
+        return SimpleNamespace(body=json.dumps(
+            {"entity": {"identifiers": [{"type": "orcid", "value": orcid}]}}).encode())
+
+    first_queue = amqp_interface._shard_queue("publications", message("0000-0001"))
+    for index in range(3):
+        queue = amqp_interface._shard_queue("publications", message("0000-0001"))
+        assert queue is first_queue
+        await queue.put(f"message {index}")
+    assert sorted(amqp_interface.queue_depths()["publications"]) == [0, 0, 0, 3]
+
+
+def test_shard_routing_key_is_missing_for_unreadable_messages():
+    """
+    Given message bodies that are not JSON or lack the routing attribute
+    When their shard routing key is computed
+    Then no routing key should be found
+    """
+    # pylint: disable=protected-access
+    assert AMQPInterface._shard_routing_key(b"not json", "entity.identifiers") is None
+    assert AMQPInterface._shard_routing_key(b'{"entity": {}}', "entity.identifiers") is None
+    assert AMQPInterface._shard_routing_key(b'{"entity": {"uid": "a"}}', "entity.uid") == '"a"'
+
+
+def test_shard_routing_key_does_not_depend_on_the_order_of_list_elements():
+    """
+    Given two messages with the same identifiers listed in different orders
+    When their shard routing keys are computed
+    Then the keys should be equal
+    """
+    # pylint: disable=protected-access
+    identifiers = [{"type": "orcid", "value": "0000-0001"}, {"value": "123", "type": "idref"}]
+    keys = [AMQPInterface._shard_routing_key(
+        json.dumps({"entity": {"identifiers": ordered_identifiers}}).encode(),
+        "entity.identifiers") for ordered_identifiers in [identifiers, identifiers[::-1]]]
+    assert keys[0] == keys[1]
+
+
+class _PrefetchingQueue:
+    """
+    Broker queue delivering its messages in order while fewer than the prefetch count
+    are unacknowledged : the messages put in the shard queues are never acknowledged
+    """
+
+    def __init__(self, messages: list, prefetch_count: int):
+        self.messages = messages
+        self.prefetch_count = prefetch_count
+        self.delivered = 0
+
+    def iterator(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.delivered >= min(self.prefetch_count, len(self.messages)):
+            # no message left or no prefetch credit left
+            await asyncio.Event().wait()
+        self.delivered += 1
+        return self.messages[self.delivered - 1]
+
+
+async def test_burst_of_a_routing_key_does_not_block_other_keys():
+    """
+    Given an AMQP interface routing the publications topic on four shards,
+    with a prefetch count lower than the number of shards
+    When a burst of messages for one person is followed by a message for another person
+    Then the message for the other person should reach its own shard queue
+    while the burst is still waiting to be processed
+    """
+    # pylint: disable=protected-access
+    settings = get_app_settings().model_copy(
+        update={"amqp_shard_routing_paths": {"publications": "entity.identifiers"},
+                "amqp_task_parallelism_limit": 4,
+                "amqp_prefetch_count": 2,
+                "amqp_shard_prefetch_depth": 4,
+                "amqp_adaptive_concurrency_enabled": False})
+    amqp_interface = AMQPInterface(settings)
+    amqp_interface.inner_tasks_shard_queues["publications"] = [asyncio.Queue() for _ in range(4)]
+
+    def message(orcid: str) -> SimpleNamespace:
+        return SimpleNamespace(body=json.dumps(
+            {"entity": {"identifiers": [{"type": "orcid", "value": orcid}]}}).encode())
+
+    burst = [message("0000-0001") for _ in range(12)]
+    other = message("0000-0002")
+    assert amqp_interface._shard_queue("publications", other) is not \
+           amqp_interface._shard_queue("publications", burst[0])
+    assert amqp_interface._consumer_prefetch_count() == 16
+    amqp_interface.pika_queues["publications"] = _PrefetchingQueue(
+        burst + [other], amqp_interface._consumer_prefetch_count())
+
+    listener = asyncio.create_task(amqp_interface.listen("publications"))
+    try:
+        async def other_shard_queue_filled():
+            while amqp_interface._shard_queue("publications", other).qsize() == 0:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(other_shard_queue_filled(), timeout=1)
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+    assert sorted(amqp_interface.queue_depths()["publications"]) == [0, 0, 1, 12]
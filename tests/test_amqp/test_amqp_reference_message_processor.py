@@ -0,0 +1,158 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from app.amqp.amqp_reference_message_processor import AMQReferenceMessageProcessor
+from app.config import get_app_settings
+from app.models.people import Person
+from app.models.source_records import SourceRecord
+
+
+class _Message:
+    """
+    Minimal incoming message recording how it has been settled
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.routing_key = "event.references.reference.created"
+        self.processed = False
+        self.settlement = None
+
+    @asynccontextmanager
+    async def process(self, ignore_processed=False):  # pylint: disable=unused-argument
+        """Mimic aio_pika message processing context"""
+        yield
+
+    async def ack(self):
+        """Acknowledge the message"""
+        self.processed = True
+        self.settlement = "ack"
+
+    async def nack(self, requeue=True):
+        """Reject the message"""
+        self.processed = True
+        self.settlement = "requeue" if requeue else "drop"
+
+
+def _reference_message(source_identifier: str, person_identifier: str,
+                       event_type: str = "created") -> _Message:
+    return _Message(json.dumps({
+        "reference_event": {
+            "type": event_type,
+            "enhanced": False,
+            "reference": {
+                "source_identifier": source_identifier,
+                "harvester": "hal",
+                "titles": [{"language": "en", "value": f"Title of {source_identifier}"}],
+            },
+        },
+        "entity": {
+            "identifiers": [{"type": "local", "value": person_identifier}],
+            "name": "Jane Doe",
+        },
+        "harvesting": {"identifier_used_type": "local",
+                       "identifier_used_value": person_identifier},
+    }).encode("utf-8"))
+
+
+async def test_batch_collects_queued_messages_up_to_batch_size():
+    """
+    Given a reference message processor with a batch size of 2
+    When 3 messages are queued
+    Then the first batch should hold 2 messages and the second one the last message,
+    returned once the batch timeout has elapsed
+    """
+    settings = get_app_settings().model_copy(update={"amqp_reference_batch_size": 2,
+                                                     "amqp_reference_batch_timeout": 10})
+    queue = asyncio.Queue()
+    for index in range(3):
+        queue.put_nowait(_Message(str(index).encode("utf-8")))
+    processor = AMQReferenceMessageProcessor(queue, settings)
+    # pylint: disable=protected-access
+    first_batch = await processor._next_batch()
+    second_batch = await processor._next_batch()
+    assert [message.body for message in first_batch] == [b"0", b"1"]
+    assert [message.body for message in second_batch] == [b"2"]
+
+
+async def test_batch_messages_are_settled_individually():
+    """
+    Given a batch of three publication messages : an unreadable one,
+    one harvested for a known person and one harvested for an unknown person
+    When the batch is processed
+    Then the owners should be looked up once for the batch,
+    the source record of the known person should be created from the prepared batch,
+    and each message should be acknowledged or dropped on its own outcome
+    """
+    known_person = Person(identifiers=[{"type": "local", "value": "known"}],
+                          display_name="Jane Doe")
+    processor = AMQReferenceMessageProcessor(asyncio.Queue(), get_app_settings())
+    processor.service = AsyncMock()
+    processor.service.find_source_record_owners.return_value = [known_person, None]
+    processor.service.get_existing_source_record_uids.return_value = set()
+    messages = [_Message(b"{}"),
+                _reference_message("hal-1", "known"),
+                _reference_message("hal-2", "unknown")]
+    # pylint: disable=protected-access
+    await processor._process_batch(1, messages)
+    assert [message.settlement for message in messages] == ["drop", "ack", "drop"]
+    processor.service.find_source_record_owners.assert_awaited_once()
+    prepared_records = processor.service.prepare_source_records.await_args.args[0]
+    assert [source_record.uid for source_record in prepared_records] == ["hal-hal-1"]
+    processor.service.create_source_record.assert_awaited_once()
+    assert processor.service.create_source_record.await_args.kwargs["prepared"] is True
+    assert processor.service.create_source_record.await_args.kwargs["harvested_for"] \
+           == known_person
+
+
+async def test_batch_falls_back_to_one_by_one_processing_when_preparation_fails():
+    """
+    Given a batch of two publication messages
+    When the preparation of the batch fails with an error that is not a database error
+    Then each source record should be saved on its own, without the prepared entities,
+    and each message should be acknowledged
+    """
+    known_person = Person(identifiers=[{"type": "local", "value": "known"}],
+                          display_name="Jane Doe")
+    processor = AMQReferenceMessageProcessor(asyncio.Queue(), get_app_settings())
+    processor.service = AsyncMock()
+    processor.service.find_source_record_owners.return_value = [known_person, known_person]
+    processor.service.prepare_source_records.side_effect = ValueError("Invalid journal")
+    processor.service.source_record_exists.return_value = False
+    messages = [_reference_message("hal-1", "known"), _reference_message("hal-2", "known")]
+    # pylint: disable=protected-access
+    await processor._process_batch(1, messages)
+    assert [message.settlement for message in messages] == ["ack", "ack"]
+    assert processor.service.create_source_record.await_count == 2
+    assert all("prepared" not in call.kwargs
+               for call in processor.service.create_source_record.await_args_list)
+
+
+async def test_batch_updates_existing_source_records_with_their_stored_version():
+    """
+    Given a batch with an updated publication message for an existing source record
+    When the batch is processed
+    Then the source record should be updated from the prepared batch
+    with the stored version returned by the preparation, read before its contributors
+    and affiliations were overwritten
+    """
+    known_person = Person(identifiers=[{"type": "local", "value": "known"}],
+                          display_name="Jane Doe")
+    stored_source_record = SourceRecord(source_identifier="hal-1", harvester="hal",
+                                        titles=[{"language": "en", "value": "Stored title"}])
+    processor = AMQReferenceMessageProcessor(asyncio.Queue(), get_app_settings())
+    processor.service = AsyncMock()
+    processor.service.find_source_record_owners.return_value = [known_person]
+    processor.service.prepare_source_records.return_value = {
+        stored_source_record.uid: stored_source_record}
+    processor.service.get_existing_source_record_uids.return_value = {stored_source_record.uid}
+    messages = [_reference_message("hal-1", "known", event_type="updated")]
+    # pylint: disable=protected-access
+    await processor._process_batch(1, messages)
+    assert messages[0].settlement == "ack"
+    processor.service.update_source_record.assert_awaited_once()
+    update_kwargs = processor.service.update_source_record.await_args.kwargs
+    assert update_kwargs["prepared"] is True
+    assert update_kwargs["stored_source_record"] is stored_source_record
@@ -0,0 +1,43 @@
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+
+
+async def test_driver_is_shared_between_connexions():
+    """
+    Given two Neo4j connexion objects
+    When a driver is requested from each of them
+    Then the same pooled driver should be returned and left open
+    """
+    async with Neo4jConnexion().get_driver() as first_driver:
+        async with Neo4jConnexion().get_driver() as second_driver:
+            assert first_driver is second_driver
+            assert Neo4jConnexion.pool_statistics()["active_leases"] >= 2
+    statistics = Neo4jConnexion.pool_statistics()
+    assert statistics["driver_open"]
+    assert statistics["active_leases"] == 0
+
+
+async def test_driver_is_recreated_after_close():
+    """
+    Given an open shared driver
+    When the DAO factory is closed
+    Then the next request should create a new driver
+    """
+    async with Neo4jConnexion().get_driver() as driver:
+        pass
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    await factory.close()
+    assert not factory.get_pool_statistics()["driver_open"]
+    async with Neo4jConnexion().get_driver() as new_driver:
+        assert new_driver is not driver
+
+
+def test_graph_pool_statistics_route(test_client):
+    """
+    Given a running application
+    When the graph pool statistics route is called
+    Then the statistics should be returned
+    """
+    response = test_client.get("/health/graph")
+    assert response.status_code == 200
+    assert "connections_in_use" in response.json()
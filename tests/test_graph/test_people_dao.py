@@ -1,7 +1,11 @@
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
 from app.models.identifier_types import PersonIdentifierType
+from app.models.literal import Literal
 from app.models.people import Person
+from app.models.people_names import PersonName
 from app.models.research_units import ResearchUnit
+from app.models.source_people import SourcePerson
+from app.models.source_person_identifiers import SourcePersonIdentifier
 
 
 async def test_create_person(
@@ -365,3 +369,76 @@ async def test_update_existing_person_membership(
         membership.entity_uid == persisted_research_unit_b_pydantic_model.uid
 
     )
+
+
+async def test_find_people_by_uids(
+        person_a_pydantic_model: Person,
+        person_b_with_two_names_pydantic_model: Person,
+):
+    """
+    Given two persisted people
+    When find_by_uids is called with their uids and an unknown uid
+    Then both people should be returned with all their names in a single dictionary
+
+    :param person_a_pydantic_model:
+    :param person_b_with_two_names_pydantic_model:
+    :return:
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao = factory.get_dao(Person)
+    await dao.create(person_a_pydantic_model)
+    await dao.create(person_b_with_two_names_pydantic_model)
+    people = await dao.find_by_uids([person_a_pydantic_model.uid,
+                                     person_b_with_two_names_pydantic_model.uid,
+                                     "local-unknown"])
+    assert set(people) == {person_a_pydantic_model.uid,
+                           person_b_with_two_names_pydantic_model.uid}
+    assert len(people[person_b_with_two_names_pydantic_model.uid].names) == 2
+
+
+async def test_resolve_source_people_clusters(person_a_pydantic_model: Person):
+    """
+    Given a persisted person with an ORCID identifier
+    When two clusters of source people are resolved, one sharing this ORCID and one unknown
+    Then the first one should be resolved to the person and the second one to nobody
+
+    :param person_a_pydantic_model:
+    :return:
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao = factory.get_dao(Person)
+    await dao.create(person_a_pydantic_model)
+    identified_source_person = SourcePerson(
+        source="hal", source_identifier="1", name="John Doe",
+        identifiers=[SourcePersonIdentifier(type="orcid", value="0000-0001-2345-6789")])
+    unknown_source_person = SourcePerson(source="hal", source_identifier="2", name="Jane Roe")
+    resolutions = await dao.resolve_source_people_clusters({
+        identified_source_person.uid: [identified_source_person],
+        unknown_source_person.uid: [unknown_source_person],
+    })
+    assert resolutions[identified_source_person.uid].identified_person_uid == \
+           person_a_pydantic_model.uid
+    assert resolutions[unknown_source_person.uid].identified_person_uid is None
+    assert not resolutions[unknown_source_person.uid].external_person_uids
+
+
+async def test_create_external_people():
+    """
+    Given two external people
+    When they are created in a single batch, then created again
+    Then they should be created the first time with their names and skipped the second time
+
+    :return:
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao = factory.get_dao(Person)
+    people = [
+        Person(uid="hal-1", display_name="John Doe", external=True,
+               names=[PersonName(first_names=[Literal(value="John")],
+                                 last_names=[Literal(value="Doe")])]),
+        Person(uid="hal-2", display_name="Jane Roe", external=True),
+    ]
+    assert sorted(await dao.create_external_people(people)) == ["hal-1", "hal-2"]
+    assert not await dao.create_external_people(people)
+    person_from_db = await dao.get("hal-1")
+    assert person_from_db.names[0].last_names[0].value == "Doe"
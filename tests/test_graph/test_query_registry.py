@@ -0,0 +1,53 @@
+import pytest
+from neo4j.exceptions import ClientError
+
+from app.errors.database_error import DatabaseError, handle_database_errors
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+from app.graph.neo4j.query_registry import QueryRegistry
+from app.graph.neo4j.utils import load_query
+
+
+def test_referenced_queries_are_registered():
+    """
+    Given the query registry loaded at import
+    When the queries referenced by the DAOs are checked
+    Then no query should be missing
+    """
+    QueryRegistry.check_references()
+
+
+async def test_database_errors_are_attributed_to_the_failing_query():
+    """
+    Given a database call failing after loading a query through load_query
+    When the error goes through the database error handler
+    Then the database error should name the query and its identifier
+    """
+    query = QueryRegistry.get("get_source_record_by_uid")
+
+    @handle_database_errors
+    async def run_query():
+        load_query("get_source_record_by_uid")
+        raise ClientError("Invalid input")
+
+    with pytest.raises(DatabaseError, match=f"get_source_record_by_uid \\({query.identifier}\\)"):
+        await run_query()
+
+
+def test_unknown_query_raises_error():
+    """
+    Given the query registry
+    When an unknown query is requested
+    Then a ValueError should be raised
+    """
+    with pytest.raises(ValueError):
+        load_query("unknown_query")
+
+
+async def test_all_queries_can_be_explained():
+    """
+    Given the query registry and a live database
+    When EXPLAIN is run on every query
+    Then no query should fail
+    """
+    async with Neo4jConnexion().get_driver() as driver:
+        assert not await QueryRegistry.explain_all(driver)
@@ -4,6 +4,7 @@ import pytest
 
 from app.config import get_app_settings
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
 from app.graph.neo4j.source_organization_dao import SourceOrganizationDAO
 from app.models.source_organization_identifiers import SourceOrganizationIdentifier
 from app.models.source_organizations import SourceOrganization
@@ -138,6 +139,32 @@ async def test_create_source_organization_cluster_returns_orgs_with_identifiers(
         i.type == "ror" and i.value == "https://ror.org/000000000" for i in peer2.identifiers)
 
 
+@pytest.mark.asyncio
+async def test_create_or_update_many_replaces_the_label_of_a_changed_type(
+        hal_source_institution_pydantic_model: SourceOrganization):
+    """
+    Given a source organization written in batch as an institution
+    When it is written again in batch as a laboratory
+    Then it should carry the laboratory label only
+    """
+    dao = _get_source_organization_dao()
+    await dao.create_or_update_many([hal_source_institution_pydantic_model])
+    laboratory = hal_source_institution_pydantic_model.model_copy(
+        update={"type": SourceOrganization.SourceOrganisationType.LABORATORY})
+
+    await dao.create_or_update_many([laboratory])
+
+    async with Neo4jConnexion().get_driver() as driver:
+        async with driver.session() as session:
+            result = await session.run(
+                "MATCH (s:SourceOrganization {uid: $uid}) RETURN labels(s) AS labels",
+                uid=laboratory.uid)
+            record = await result.single()
+    assert sorted(record["labels"]) == ["SourceLaboratory", "SourceOrganization"]
+    so_from_db = await dao.get_by_uid(laboratory.uid)
+    assert so_from_db.type == SourceOrganization.SourceOrganisationType.LABORATORY
+
+
 def _get_source_organization_dao() -> SourceOrganizationDAO:
     factory = AbstractDAOFactory().get_dao_factory(get_app_settings().graph_db)
     return factory.get_dao(SourceOrganization)
@@ -0,0 +1,44 @@
+# file: tests/test_graph/test_source_person_dao.py
+
+import pytest
+
+from app.config import get_app_settings
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.source_person_dao import SourcePersonDAO
+from app.models.source_people import SourcePerson
+
+
+@pytest.mark.asyncio
+async def test_create_or_update_many_source_people_with_identifiers():
+    """
+    Given a batch of source people, one of them having identifiers
+    When they are upserted with a single batched statement
+    Then they should all be persisted, with the identifiers of the identified one,
+    and upserting the batch again with an identifier removed should remove it
+    """
+    dao = _get_source_person_dao()
+    identified = SourcePerson(source="hal", source_identifier="123", name="Jane Doe",
+                              identifiers=[{"type": "orcid", "value": "0000-0001-2345-6789"},
+                                           {"type": "idref", "value": "123456789"}])
+    anonymous = SourcePerson(source="hal", source_identifier="456", name="John Doe")
+
+    written = await dao.create_or_update_many([identified, anonymous])
+
+    assert {source_person.uid for source_person in written} == {identified.uid, anonymous.uid}
+    identified_from_db = await dao.get_by_uid(identified.uid)
+    assert {(identifier.type.value, identifier.value)
+            for identifier in identified_from_db.identifiers} == {
+        ("orcid", "0000-0001-2345-6789"), ("idref", "123456789")}
+    assert (await dao.get_by_uid(anonymous.uid)).identifiers == []
+
+    identified.identifiers = identified.identifiers[:1]
+    await dao.create_or_update_many([identified])
+
+    identified_from_db = await dao.get_by_uid(identified.uid)
+    assert [identifier.value for identifier in identified_from_db.identifiers] == [
+        "0000-0001-2345-6789"]
+
+
+def _get_source_person_dao() -> SourcePersonDAO:
+    factory = AbstractDAOFactory().get_dao_factory(get_app_settings().graph_db)
+    return factory.get_dao(SourcePerson)
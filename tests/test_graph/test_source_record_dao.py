@@ -0,0 +1,150 @@
+from app.config import get_app_settings
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.source_record_dao import SourceRecordDAO
+from app.models.agent_identifiers import PersonIdentifier
+from app.models.identifier_types import PublicationIdentifierType
+from app.models.literal import Literal
+from app.models.people import Person
+from app.models.publication_identifiers import PublicationIdentifier
+from app.models.source_person_identifiers import SourcePersonIdentifier
+from app.models.source_records import SourceRecord
+
+
+async def test_get_many_source_records_preserves_order(
+        hal_chapter_a_source_record_persisted_model: SourceRecord,
+        open_alex_article_with_journal_1_persisted_model: SourceRecord
+):
+    """
+    Given two persisted source records
+    When they are fetched together with an unknown uid
+    Then they should be returned in the requested order, fully hydrated,
+    and the unknown uid should be skipped
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    expected = [open_alex_article_with_journal_1_persisted_model,
+                hal_chapter_a_source_record_persisted_model]
+    source_records = await dao.get_many([expected[0].uid, "unknown-uid", expected[1].uid])
+    assert [source_record.uid for source_record in source_records] == \
+           [source_record.uid for source_record in expected]
+    for source_record, expected_source_record in zip(source_records, expected):
+        single_source_record = await dao.get(expected_source_record.uid)
+        assert sorted(title.value for title in source_record.titles) == \
+               sorted(title.value for title in single_source_record.titles)
+        assert source_record.issue == single_source_record.issue
+        assert sorted(identifier.value for identifier in source_record.identifiers) == \
+               sorted(identifier.value for identifier in single_source_record.identifiers)
+        assert sorted(contribution.contributor.uid
+                      for contribution in source_record.contributions) == \
+               sorted(contribution.contributor.uid
+                      for contribution in single_source_record.contributions)
+
+
+async def test_get_equivalence_components(
+        source_record_id_doi_1_persisted_model: SourceRecord,
+        source_record_id_hal_1_persisted_model: SourceRecord,
+        source_record_id_doi_1_hal_1_persisted_model: SourceRecord
+):
+    """
+    Given three persisted source records linked by shared DOI and HAL identifiers
+    When their inferred equivalence component is rebuilt
+    Then both components fetched from any of them should contain the three source records
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    expected_uids = sorted([source_record_id_doi_1_persisted_model.uid,
+                            source_record_id_hal_1_persisted_model.uid,
+                            source_record_id_doi_1_hal_1_persisted_model.uid])
+    shared_identifier_uids, inferred_uids = await dao.get_equivalence_components(
+        source_record_id_doi_1_persisted_model.uid)
+    assert sorted(shared_identifier_uids) == expected_uids
+    assert sorted(inferred_uids) == expected_uids
+    await dao.update_inferred_equivalence_component(shared_identifier_uids, [])
+    _, inferred_uids = await dao.get_equivalence_components(
+        source_record_id_hal_1_persisted_model.uid)
+    assert sorted(inferred_uids) == expected_uids
+
+
+async def test_hub_identifiers_are_excluded_from_equivalence_components(
+        monkeypatch,
+        source_record_id_doi_1_persisted_model: SourceRecord,
+        source_record_id_hal_1_persisted_model: SourceRecord,
+        source_record_id_doi_1_hal_1_persisted_model: SourceRecord
+):
+    """
+    Given three persisted source records linked by shared DOI and HAL identifiers
+    When the fan-out ceiling of DOI identifiers is lowered to one source record
+    Then the DOI identifier should be listed as a hub
+    and should not link source records in the shared identifier component anymore
+    """
+    monkeypatch.setitem(get_app_settings().publication_identifier_fan_out_ceilings, "doi", 1)
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    await dao.refresh_publication_identifiers_cardinality()
+    hub_identifiers = await dao.get_hub_publication_identifiers()
+    assert [identifier["type"] for identifier in hub_identifiers] == ["doi"]
+    assert hub_identifiers[0]["source_record_count"] == 2
+    shared_identifier_uids, _ = await dao.get_equivalence_components(
+        source_record_id_doi_1_persisted_model.uid)
+    assert shared_identifier_uids == [source_record_id_doi_1_persisted_model.uid]
+    shared_identifier_uids, _ = await dao.get_equivalence_components(
+        source_record_id_hal_1_persisted_model.uid)
+    assert sorted(shared_identifier_uids) == sorted([
+        source_record_id_hal_1_persisted_model.uid,
+        source_record_id_doi_1_hal_1_persisted_model.uid])
+
+
+async def test_update_reports_changed_fields(
+        scanr_article_a_source_record_persisted_model: SourceRecord,
+        persisted_person_a_pydantic_model: Person,
+        default_identifier_used: PersonIdentifier
+):
+    """
+    Given a persisted source record
+    When it is updated without change, then with a new title and a new identifier
+    Then the update status should report no change, then only the titles and identifiers
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    _, _, update_status = await dao.update(scanr_article_a_source_record_persisted_model,
+                                           persisted_person_a_pydantic_model,
+                                           default_identifier_used)
+    assert not any(update_status)
+    source_record = scanr_article_a_source_record_persisted_model.model_copy(deep=True)
+    source_record.titles.append(Literal(value="A new title", language="en"))
+    source_record.identifiers.append(
+        PublicationIdentifier(type=PublicationIdentifierType.BIBCODE, value="2024ApJ...000..000X"))
+    _, _, update_status = await dao.update(source_record,
+                                           persisted_person_a_pydantic_model,
+                                           default_identifier_used)
+    assert update_status == SourceRecordDAO.UpdateStatus(identifiers_changed=True,
+                                                         titles_changed=True,
+                                                         contributors_changed=False,
+                                                         issue_changed=False,
+                                                         custom_metadata_changed=False)
+
+
+async def test_update_reports_contributor_identifier_change(
+        scanr_article_a_source_record_persisted_model: SourceRecord,
+        persisted_person_a_pydantic_model: Person,
+        default_identifier_used: PersonIdentifier
+):
+    """
+    Given a persisted source record
+    When it is updated with an ORCID added to one of its contributors, nothing else changing
+    Then the update status should only report a change of the contributors
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    source_record = scanr_article_a_source_record_persisted_model.model_copy(deep=True)
+    contributor = source_record.contributions[0].contributor
+    contributor.identifiers = contributor.identifiers + [
+        SourcePersonIdentifier(type="orcid", value="0000-0001-6528-2446")]
+    _, _, update_status = await dao.update(source_record,
+                                           persisted_person_a_pydantic_model,
+                                           default_identifier_used)
+    assert update_status == SourceRecordDAO.UpdateStatus(identifiers_changed=False,
+                                                         titles_changed=False,
+                                                         contributors_changed=True,
+                                                         issue_changed=False,
+                                                         custom_metadata_changed=False)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from app.models.document import Document
+from app.models.literal import Literal
+
+
+def test_content_fingerprint_ignores_workflow_fields():
+    """
+    Given two documents with the same content but different uids, flags, source record order
+    and open access computation timestamps
+    When their content fingerprints are computed
+    Then the fingerprints should be the same
+    """
+    document_1 = Document(uid="document-1",
+                          titles=[Literal(value="A title", language="en")],
+                          source_record_uids=["source-1", "source-2"])
+    document_1.open_access_status.oa_computation_timestamp = datetime(2024, 1, 1)
+    document_2 = Document(uid="document-2",
+                          titles=[Literal(value="A title", language="en")],
+                          source_record_uids=["source-2", "source-1"],
+                          to_be_recomputed=True)
+    document_2.open_access_status.oa_computation_timestamp = datetime(2025, 1, 1)
+    assert document_1.compute_content_fingerprint() == document_2.compute_content_fingerprint()
+
+
+def test_content_fingerprint_changes_with_content():
+    """
+    Given two documents with different titles or publication dates
+    When their content fingerprints are computed
+    Then the fingerprints should be different
+    """
+    document = Document(titles=[Literal(value="A title", language="en")])
+    fingerprint = document.compute_content_fingerprint()
+    retitled_document = Document(titles=[Literal(value="Another title", language="en")])
+    assert retitled_document.compute_content_fingerprint() != fingerprint
+    document.publication_date = "2024-01"
+    assert document.compute_content_fingerprint() != fingerprint
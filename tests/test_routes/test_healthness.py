@@ -5,3 +5,24 @@ def test_healthness_route_answers(test_client: TestClient):
     """Test the healthness route."""
     response = test_client.get("/health")
     assert response.status_code == 200
+
+
+def test_authority_organization_cache_route_answers(test_client: TestClient):
+    """Test the authority organization resolution cache statistics route."""
+    response = test_client.get("/health/authority-organizations-cache")
+    assert response.status_code == 200
+    assert {"hits", "misses", "size"} <= response.json().keys()
+
+
+def test_document_recomputation_route_answers(test_client: TestClient):
+    """Test the scheduled document recomputations statistics route."""
+    response = test_client.get("/health/document-recomputations")
+    assert response.status_code == 200
+    assert {"pending", "coalesced", "completed"} <= response.json().keys()
+
+
+def test_amqp_queues_route_answers(test_client: TestClient):
+    """Test the AMQP inner queues depths route."""
+    response = test_client.get("/health/amqp-queues")
+    assert response.status_code == 200
+    assert "queue_depths" in response.json()
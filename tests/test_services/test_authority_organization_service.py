@@ -431,3 +431,111 @@ async def test_attach_states_to_root_sets_root_display_names_deduped():
 def _get_authority_org_dao():
     factory = AbstractDAOFactory().get_dao_factory(get_app_settings().graph_db)
     return factory.get_dao(AuthorityOrganizationState)
+
+
+@pytest.mark.asyncio
+async def test_root_election_reuses_the_root_whose_states_are_all_in_the_cluster():
+    """
+    Given a root attached to states s1 and s2, and a root attached to state s3
+    When a root is elected for a cluster made of states s1 and s3
+    Then the second root should be elected, as the first one has a state outside the cluster,
+    and saving it should attach s1 to it and return it hydrated with both states
+    """
+    dao = _get_authority_org_dao()
+
+    async def create_state(index: int) -> AuthorityOrganizationState:
+        state = AuthorityOrganizationState(
+            type=SourceOrganization.SourceOrganisationType.LABORATORY,
+            identifiers=[OrganizationIdentifier(type=OrganizationIdentifierType.IDREF,
+                                                value=f"ELECTION{index}")],
+        )
+        state.set_names([Literal(value=f"Election lab {index}", language="fr")])
+        return await dao.create_authority_organization_state(state)
+
+    s1 = await create_state(1)
+    s2 = await create_state(2)
+    s3 = await create_state(3)
+    first_root = await dao.save_authority_organization_root_with_states(
+        AuthorityOrganizationRoot(source_organization_uids=[]), [s1.uid, s2.uid])
+    second_root = await dao.save_authority_organization_root_with_states(
+        AuthorityOrganizationRoot(source_organization_uids=[]), [s3.uid])
+
+    candidate_roots = await dao.find_candidate_roots_of_states([s1.uid, s3.uid])
+    assert {root_uid: sorted(state_uids) for root_uid, state_uids in candidate_roots.items()} \
+           == {first_root.uid: sorted([s1.uid, s2.uid]), second_root.uid: [s3.uid]}
+    elected_root_uid = AuthorityOrganizationService._elect_root(  # pylint: disable=protected-access
+        candidate_roots, [s1.uid, s3.uid])
+    assert elected_root_uid == second_root.uid
+
+    saved_root = await dao.save_authority_organization_root_with_states(
+        AuthorityOrganizationRoot(uid=elected_root_uid, source_organization_uids=["hal-election"]),
+        [s1.uid, s3.uid])
+    assert saved_root.uid == second_root.uid
+    assert sorted(state.uid for state in saved_root.states) == sorted([s1.uid, s3.uid])
+    assert await dao.find_candidate_roots_of_states([s2.uid]) == {first_root.uid: [s2.uid]}
+
+
+def test_moving_states_to_another_root_invalidates_cached_resolutions():
+    """
+    Given cached resolutions depending on a root attached to states s1 and s2,
+    and on a state s3 without root
+    When s1 and s3 are attached to a new root
+    Then the resolutions depending on s1, s3 or the previous root should be removed
+    from the cache, while the others are kept
+    """
+    service = AuthorityOrganizationService()
+    cache = service._get_resolution_cache()  # pylint: disable=protected-access
+    for signature, tags in {"cluster-1-2": ["s1", "s2", "root-1"], "cluster-2": ["s2"],
+                            "cluster-3": ["s3"], "cluster-4": ["s4", "root-4"]}.items():
+        cache.put(signature, AuthorityOrganizationRoot(uid=tags[-1]), tags=tags)
+    service._invalidate_moved_states(  # pylint: disable=protected-access
+        {"root-1": ["s1", "s2"]}, "root-2", ["s1", "s3"])
+    assert [signature for signature in ["cluster-1-2", "cluster-2", "cluster-3", "cluster-4"]
+            if cache.get(signature) is not None] == ["cluster-2", "cluster-4"]
+
+
+def test_saving_an_unchanged_root_keeps_cached_resolutions():
+    """
+    Given a cached resolution depending on a root attached to states s1 and s2
+    When the root is saved again with the same states
+    Then the resolution should be kept in the cache
+    """
+    service = AuthorityOrganizationService()
+    cache = service._get_resolution_cache()  # pylint: disable=protected-access
+    cache.put("cluster-1-2", AuthorityOrganizationRoot(uid="root-1"),
+              tags=["s1", "s2", "root-1"])
+    service._invalidate_moved_states(  # pylint: disable=protected-access
+        {"root-1": ["s2", "s1"]}, "root-1", ["s1", "s2"])
+    assert cache.get("cluster-1-2") is not None
+
+
+@pytest.mark.asyncio
+async def test_variant_clusters_sharing_a_state_do_not_evict_each_other(
+        test_app,  # pylint: disable=unused-argument
+        persisted_cluster_seed_source_org: SourceOrganization,
+        persisted_cluster_peer_source_org_1: SourceOrganization,
+        persisted_cluster_peer_source_org_2: SourceOrganization,
+):
+    """
+    Given a cluster resolved twice, the second time from the resolution cache
+    When a variant of the cluster resolving to the same state is resolved
+    Then both clusters should be served from the resolution cache afterwards,
+    although the resolution of the variant updated their common state
+    """
+    auth_service = AuthorityOrganizationService()
+    cluster = [persisted_cluster_seed_source_org, persisted_cluster_peer_source_org_1,
+               persisted_cluster_peer_source_org_2]
+    variant = [persisted_cluster_seed_source_org]
+
+    root = await auth_service.get_or_create_authority_organization(cluster)
+    await auth_service.get_or_create_authority_organization(cluster)
+    statistics = AuthorityOrganizationService.resolution_cache_statistics()
+    assert (statistics["hits"], statistics["misses"]) == (1, 1)
+
+    variant_root = await auth_service.get_or_create_authority_organization(variant)
+    assert variant_root.states[0].uid == root.states[0].uid
+    await auth_service.get_or_create_authority_organization(cluster)
+    await auth_service.get_or_create_authority_organization(variant)
+    statistics = AuthorityOrganizationService.resolution_cache_statistics()
+    assert (statistics["hits"], statistics["misses"]) == (3, 2)
+    assert statistics["invalidations"] == 0
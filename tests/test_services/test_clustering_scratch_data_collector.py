@@ -0,0 +1,28 @@
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+from app.services.source_contributors.clustering_scratch_data_collector import \
+    ClusteringScratchDataCollector
+
+
+async def test_collect_clustering_scratch_data() -> None:
+    """
+    Given scratch data left by the graph contributor clustering engine
+    When the scratch data is collected by batches smaller than its size
+    Then all of it should be deleted and counted, and a second collection should find nothing
+    """
+    async with Neo4jConnexion().get_driver() as driver:
+        async with driver.session() as session:
+            await session.run(
+                "MERGE (computation:ComputationOrigin {contextUid: 'document-1'}) "
+                "MERGE (a:SourcePerson {uid: 'source-person-a'}) "
+                "MERGE (b:SourcePerson {uid: 'source-person-b'}) "
+                "MERGE (computation)-[:SOURCE_PEOPLE_DISTANCE "
+                "{distance: 3, contextUid: 'document-1'}]->(a) "
+                "MERGE (computation)-[:SOURCE_PEOPLE_DISTANCE "
+                "{distance: 3, contextUid: 'document-1'}]->(b) "
+                "MERGE (a)-[:SOURCE_PEOPLE_DISTANCE {distance: 5, contextUid: 'document-1'}]->(b)"
+            )
+    collector = ClusteringScratchDataCollector()
+    counts = await collector.collect(batch_size=2)
+    assert counts == {"source_people_distances": 3, "computation_origins": 1}
+    counts = await collector.collect(batch_size=2)
+    assert counts == {"source_people_distances": 0, "computation_origins": 0}
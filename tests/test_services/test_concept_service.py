@@ -144,3 +144,35 @@ async def test_update_concept_b_without_uri(persisted_concept_b_without_uri_pyda
     assert fetched_concept.pref_labels[0].language == \
            concept_b_without_uri_pydantic_model.pref_labels[0].language == \
            persisted_concept_b_without_uri_pydantic_model.pref_labels[0].language
+
+
+async def test_create_or_update_concepts_in_batch(
+        persisted_concept_a_pydantic_model: Concept,
+        concept_a_pydantic_model: Concept,
+        concept_b_without_uri_pydantic_model: Concept) -> None:
+    """
+    Given a persisted concept with uri and a new concept without uri
+    When both are registered in a single batch, together with an updated version of the first one
+    Then the new concept should be created, the persisted one should be updated
+    and the registered concepts should be returned in the input order
+    :return:
+    """
+    service = ConceptService()
+    concept_a_pydantic_model.pref_labels.append(
+        Literal(
+            value='Галактическая физика',
+            language='ru'
+        )
+    )
+    registered_concepts = await service.create_or_update_concepts(
+        [concept_b_without_uri_pydantic_model, concept_a_pydantic_model])
+    assert [concept.uid for concept in registered_concepts] == [
+        concept_b_without_uri_pydantic_model.uid, persisted_concept_a_pydantic_model.uid]
+    fetched_concept_a = await service.get_concept(concept_a_pydantic_model.uid)
+    assert len(fetched_concept_a.pref_labels) == 3
+    assert any(pref_label.language == 'ru' for pref_label in fetched_concept_a.pref_labels)
+    assert len(fetched_concept_a.alt_labels) == 2
+    fetched_concept_b = await service.find_concept_by_uid(concept_b_without_uri_pydantic_model.uid)
+    assert fetched_concept_b
+    assert fetched_concept_b.uri is None
+    assert len(fetched_concept_b.pref_labels) == 1
@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import cast
+from unittest.mock import patch
 
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
 from app.graph.neo4j.document_dao import DocumentDAO
@@ -12,6 +13,9 @@ from app.models.open_access_status import OAStatus, UnpaywallOAStatus
 from app.models.people import Person
 from app.models.source_records import SourceRecord
 from app.services.documents.document_service import DocumentService
+from app.services.documents.oa_colors_computation_service import OAColorsComputationService
+from app.services.source_contributors.source_contributor_mapping_service import \
+    SourceContributorMappingService
 from app.services.source_records.equivalence_service import EquivalenceService
 from app.services.source_records.source_record_service import SourceRecordService
 from app.signals import source_record_created, source_record_updated, \
@@ -72,6 +76,37 @@ async def test_update_document(
                     "http://www.idref.fr/concept-e/id"
                 ] for subject in document.subjects)
 
+async def test_documents_left_flagged_to_be_recomputed_are_recomputed_by_the_sweep(
+        source_record_id_doi_1_persisted_model: SourceRecord,
+        source_record_id_hal_1_persisted_model: SourceRecord,  # pylint: disable=unused-argument
+        source_record_id_doi_1_hal_1_persisted_model: SourceRecord
+        # pylint: disable=unused-argument
+) -> None:
+    """
+    Given a document flagged to be recomputed whose recomputation request was lost
+    When the documents flagged to be recomputed are swept
+    Then the document should be recomputed and its flag cleared
+    And a second sweep should not request any recomputation
+    """
+    with source_record_updated.muted():
+        with source_record_created.muted():
+            with document_sources_changed.muted():
+                factory = AbstractDAOFactory().get_dao_factory("neo4j")
+                document_dao: DocumentDAO = cast(DocumentDAO, factory.get_dao(Document))
+                await EquivalenceService().update_source_record(
+                    None,
+                    source_record_id_doi_1_persisted_model.uid)
+                document = await document_dao.get_document_by_source_record_uid(
+                    source_record_id_doi_1_persisted_model.uid)
+                assert document.to_be_recomputed is True
+                assert await DocumentService().recompute_flagged_documents(batch_size=1) == 1
+                document = await document_dao.get_document_by_source_record_uid(
+                    source_record_id_doi_1_persisted_model.uid)
+                assert document.to_be_recomputed is False
+                assert document.titles[0].value == "Example Article with DOI and HAL"
+                assert await DocumentService().recompute_flagged_documents() == 0
+
+
 async def test_get_document_uid_from_person_uid(
         hal_article_a_source_record_persisted_model: SourceRecord,
         # pylint: disable=unused-argument
@@ -345,3 +380,55 @@ async def test_oa_status_document_with_doi_not_in_upw_and_no_hal(
     assert document.open_access_status.upw_oa_status is None
     assert not document.open_access_status.oa_upw_success_status
     assert document.open_access_status.oa_doaj_success_status is None
+
+
+async def test_recomputation_skips_the_stages_whose_inputs_have_not_changed(
+        source_record_id_doi_1_persisted_model: SourceRecord,
+        source_record_id_hal_1_persisted_model: SourceRecord,  # pylint: disable=unused-argument
+        source_record_id_doi_1_hal_1_persisted_model: SourceRecord
+        # pylint: disable=unused-argument
+) -> None:
+    """
+    Given a document computed from three equivalent source records
+    When it is recomputed with an update status reporting no change,
+    then with an update status reporting a change of the contributors only
+    Then the contributions should only be remapped for the change of the contributors
+    and the open access colors should not be computed again
+    """
+
+    async def compute_oa_colors(oa_colors_computation_service: OAColorsComputationService):
+        oa_colors_computation_service.document.open_access_status.oa_computed_status = True
+        return oa_colors_computation_service.document
+
+    with source_record_updated.muted(), source_record_created.muted(), \
+            document_sources_changed.muted(), \
+            patch.object(SourceContributorMappingService, "update_contributions",
+                         autospec=True) as update_contributions, \
+            patch.object(OAColorsComputationService, "compute_oa_colors", autospec=True,
+                         side_effect=compute_oa_colors) as compute_oa_colors_mock:
+        await EquivalenceService().update_source_record(
+            None, source_record_id_doi_1_persisted_model.uid)
+        factory = AbstractDAOFactory().get_dao_factory("neo4j")
+        document_dao: DocumentDAO = cast(DocumentDAO, factory.get_dao(Document))
+        document = await document_dao.get_document_by_source_record_uid(
+            source_record_id_doi_1_persisted_model.uid)
+        service = DocumentService()
+        await service.update_from_source_records(None, document_uid=document.uid)
+        assert update_contributions.await_count == 1
+        assert compute_oa_colors_mock.await_count == 1
+
+        no_change = SourceRecordDAO.UpdateStatus(identifiers_changed=False,
+                                                 titles_changed=False,
+                                                 contributors_changed=False,
+                                                 issue_changed=False,
+                                                 custom_metadata_changed=False)
+        await service.update_from_source_records(None, document_uid=document.uid,
+                                                 update_status=no_change)
+        assert update_contributions.await_count == 1
+        assert compute_oa_colors_mock.await_count == 1
+
+        await service.update_from_source_records(
+            None, document_uid=document.uid,
+            update_status=no_change._replace(contributors_changed=True))
+        assert update_contributions.await_count == 2
+        assert compute_oa_colors_mock.await_count == 1
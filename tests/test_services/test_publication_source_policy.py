@@ -0,0 +1,54 @@
+import yaml
+
+from app.config import get_app_settings
+from app.services.documents.merge_strategies.merge_strategy_factory import MergeStrategyFactory
+from app.services.policies.publication_source_policy import PublicationSourcePolicy
+
+POLICIES = {
+    "harvesters": ["hal", "idref"],
+    "harvesting_sources": ["hal", "idref", "sudoc"],
+    "strategies": [
+        {"types": ["default", "Article"], "type": "global_richest",
+         "parameters": {"titles": 0}, "harvesters": ["idref", "hal"]},
+        {"types": ["Book", "Chapter"], "type": "source_order", "harvesters": ["hal"]},
+    ],
+}
+
+
+def test_compiled_policy_lookups():
+    """
+    Given publication source policies
+    When they are compiled
+    Then ranks should follow the harvesters order, the first strategy declaring
+    one of the document types should be elected, and the default one otherwise
+    """
+    policy = PublicationSourcePolicy(POLICIES)
+    assert policy.harvester_rank("idref") == 1
+    assert policy.harvester_rank("scopus") == 2
+    assert policy.harvesting_source_rank("scopus") == float("inf")
+    assert policy.contributor_clustering_engine == "assignment"
+    assert policy.strategy_for(["Chapter", "Article"]).harvesters == ["idref", "hal"]
+    assert policy.strategy_for(["Book"]).strategy_type == \
+           MergeStrategyFactory.StrategyType.SOURCE_ORDER
+    assert policy.strategy_for(["Thesis"]).parameters == {"titles": 0}
+
+
+def test_reload_policy(tmp_path, monkeypatch):
+    """
+    Given a compiled policy
+    When the policies file is changed and the policy reloaded, then made invalid and reloaded
+    Then the policy should be replaced the first time and kept the second time
+    """
+    policies_file = tmp_path / "policies.yaml"
+    policies_file.write_text(yaml.dump(POLICIES), encoding="utf8")
+    monkeypatch.setattr(get_app_settings(), "publication_source_policies_file",
+                        str(policies_file))
+    monkeypatch.setattr(PublicationSourcePolicy, "_current", None)
+    PublicationSourcePolicy.reload()
+    reloaded_policy = PublicationSourcePolicy.current()
+    assert reloaded_policy.harvesters == ["hal", "idref"]
+    policies_file.write_text(yaml.dump(POLICIES | {"strategies": [
+        {"types": ["default"], "type": "unknown_strategy"}
+    ]}), encoding="utf8")
+    PublicationSourcePolicy.reload()
+    assert PublicationSourcePolicy.current() is reloaded_policy
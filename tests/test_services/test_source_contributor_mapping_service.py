@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock
+
+from app.graph.neo4j.person_dao import PersonDAO
+from app.models.source_people import SourcePerson
+from app.models.source_person_identifiers import SourcePersonIdentifier
+from app.services.source_contributors.contributor_clustering import ContributorClustering
+from app.services.source_contributors.source_contributor_mapping_service import \
+    SourceContributorMappingService
+
+
+def _source_person(source: str, name: str, identifiers=None) -> SourcePerson:
+    return SourcePerson(uid=f"{source}-{name}", source=source, source_identifier=name,
+                        name=name, identifiers=identifiers or [])
+
+
+async def test_compute_equivalence_distances() -> None:
+    """
+    Given contributors of two source platforms
+    When the distances between the two layers are computed
+    Then common identifiers should give a null distance, identical names a tiny one,
+    close names their fuzzy distance and distant names no distance at all
+    """
+    orcid = SourcePersonIdentifier(type="orcid", value="0000-0001-2345-6789")
+    hal_people = [_source_person("hal", "Jean Dupont", [orcid]),
+                  _source_person("hal", "Émilie Durand"),
+                  _source_person("hal", "Zoe Martin")]
+    idref_people = [_source_person("idref", "Dupont, J.", [orcid]),
+                    _source_person("idref", "Emilie Durand"),
+                    _source_person("idref", "Zoé Martine")]
+    service = SourceContributorMappingService(source_records=[], document_uid="document")
+    distances = service._compute_equivalence_distances(  # pylint: disable=protected-access
+        {"hal": hal_people, "idref": idref_people})
+    assert distances["hal-Jean Dupont"]["idref-Dupont, J."] == 0
+    assert distances["hal-Émilie Durand"]["idref-Emilie Durand"] == 0.0001
+    assert 0 < distances["hal-Zoe Martin"]["idref-Zoé Martine"] < 30
+    assert distances["hal-Jean Dupont"]["idref-Emilie Durand"] is None
+    assert list(distances) == [person.uid for person in hal_people]
+
+
+async def test_cluster_contributors_layer_by_layer() -> None:
+    """
+    Given three layers of contributors and their distances
+    When they are clustered in memory
+    Then the contributors should be matched to the clusters of the previous layers
+    with the minimum total distance, and contributors without any compatible cluster
+    should not be clustered
+    """
+    layers = [["hal-a", "hal-b"], ["idref-a", "idref-b"], ["scanr-a", "scanr-c"]]
+    distances = {
+        "hal-a": {"idref-a": 5, "idref-b": 4, "scanr-a": 10, "scanr-c": None},
+        "hal-b": {"idref-a": 6, "idref-b": 20, "scanr-a": None, "scanr-c": None},
+        "idref-a": {"scanr-a": None, "scanr-c": None},
+        "idref-b": {"scanr-a": 0, "scanr-c": None},
+    }
+    clusters = ContributorClustering(layers, distances).clusters()
+    # the assignment minimizes the total distance (4 + 6) over the greedy choice (4 + 20)
+    assert clusters == [["hal-a", "idref-b", "scanr-a"], ["hal-b", "idref-a"]]
+
+
+async def test_clusters_sharing_a_merged_external_person_are_linked_to_the_kept_person() -> None:
+    """
+    Given two clusters of contributors recorded by the same external person,
+    the first one being also recorded by another external person
+    When they are linked to people
+    Then both external people should be merged into the one with the smallest uid
+    and both clusters should be linked to it, although the second cluster was resolved
+    to the merged person before the merge
+    """
+    hal_person = _source_person("hal", "Jean Dupont")
+    idref_person = _source_person("idref", "Dupont, J.")
+    service = SourceContributorMappingService(source_records=[], document_uid="document")
+    service.person_dao = AsyncMock()
+    service.person_dao.find_by_uids.return_value = {}
+    service.person_dao.resolve_source_people_clusters.return_value = {
+        hal_person.uid: PersonDAO.SourcePeopleClusterResolution(
+            identified_person_uid=None, external_person_uids=["person-2", "person-1"]),
+        idref_person.uid: PersonDAO.SourcePeopleClusterResolution(
+            identified_person_uid=None, external_person_uids=["person-2"]),
+    }
+    service.source_person_dao = AsyncMock()
+    service._get_source_people_clusters = AsyncMock(  # pylint: disable=protected-access
+        return_value={hal_person.uid: [hal_person], idref_person.uid: [idref_person]})
+
+    # pylint: disable=protected-access
+    linked_people = await service._link_source_people_to_people()
+
+    service.person_dao.merge_people.assert_awaited_once_with("person-1", "person-2")
+    service.source_person_dao.link_to_people.assert_awaited_once_with(
+        {"person-1": [hal_person.uid, idref_person.uid]})
+    assert linked_people == {"person-1": [hal_person, idref_person]}
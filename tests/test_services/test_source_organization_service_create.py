@@ -95,3 +95,30 @@ async def test_create_source_org_without_type(
     assert source_org.identifiers[0].value == '9999'
     assert source_org.name == 'Organization Without Type'
     assert source_org.type is SourceOrganization.SourceOrganisationType.ORGANIZATION
+
+
+async def test_create_source_organizations_in_batch(
+        hal_source_institution_pydantic_model: SourceOrganization,
+        hal_source_laboratory_pydantic_model: SourceOrganization) -> None:
+    """
+    Given source organizations of different types, one of them repeated
+    When they are added to the graph in a single batch
+    Then each of them is written once and can be read from the graph with its type
+    :param hal_source_institution_pydantic_model:
+    :param hal_source_laboratory_pydantic_model:
+    :return:
+    """
+    service = SourceOrganizationService()
+    registered = await service.create_or_update_source_organizations(
+        [hal_source_institution_pydantic_model,
+         hal_source_laboratory_pydantic_model,
+         hal_source_institution_pydantic_model])
+    assert [source_organization.uid for source_organization in registered] == [
+        hal_source_institution_pydantic_model.uid, hal_source_laboratory_pydantic_model.uid]
+    source_institution = await service.get_source_organization_by_uid(
+        hal_source_institution_pydantic_model.uid)
+    assert source_institution.type == SourceOrganization.SourceOrganisationType.INSTITUTION
+    assert len(source_institution.identifiers) == 4
+    source_laboratory = await service.get_source_organization_by_uid(
+        hal_source_laboratory_pydantic_model.uid)
+    assert source_laboratory.type == SourceOrganization.SourceOrganisationType.LABORATORY
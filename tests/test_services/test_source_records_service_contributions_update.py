@@ -1,8 +1,13 @@
+from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.neo4j_connexion import Neo4jConnexion
+from app.graph.neo4j.source_record_dao import SourceRecordDAO
 from app.models.agent_identifiers import PersonIdentifier
 from app.models.harvesting_sources import HarvestingSource
 from app.models.loc_contribution_role import LocContributionRole
 from app.models.people import Person
+from app.models.source_contributions import SourceContribution
 from app.models.source_organizations import SourceOrganization
+from app.models.source_people import SourcePerson
 from app.models.source_records import SourceRecord
 from app.services.source_records.source_record_service import SourceRecordService
 
@@ -105,3 +110,41 @@ async def test_create_source_record_with_contributions(
         None
     )
     assert not contribution_3
+
+
+async def test_unchanged_contributions_are_not_rewritten(
+        hal_chapter_a_source_record_persisted_model: SourceRecord
+) -> None:
+    """
+    Given a persisted source record with contributions
+    When its contributions are written again with one unknown contributor added
+    Then the existing contributions should be kept
+    and the unknown contributor should be reported as an error
+
+    :param hal_chapter_a_source_record_persisted_model:
+    :return:
+    """
+    factory = AbstractDAOFactory().get_dao_factory("neo4j")
+    dao: SourceRecordDAO = factory.get_dao(SourceRecord)
+    uid = hal_chapter_a_source_record_persisted_model.uid
+    contributions = (await dao.get(uid)).contributions
+    assert contributions
+    existing_ids = await _get_contribution_ids(uid)
+    unknown_contribution = SourceContribution(
+        rank=len(contributions) + 1,
+        contributor=SourcePerson(name="Unknown Person", source=HarvestingSource.HAL,
+                                 source_identifier="unknown-person"))
+    errors = await dao.update_contributions(uid, contributions + [unknown_contribution])
+    assert len(errors) == 1
+    assert errors[0].contribution == unknown_contribution
+    assert await _get_contribution_ids(uid) == existing_ids
+
+
+async def _get_contribution_ids(source_record_uid: str) -> set[str]:
+    async with Neo4jConnexion().get_driver() as driver:
+        async with driver.session() as session:
+            result = await session.run(
+                "MATCH (:SourceRecord {uid: $uid})-[:HAS_CONTRIBUTION]->(c) "
+                "RETURN elementId(c) AS id",
+                uid=source_record_uid)
+            return {record["id"] async for record in result}
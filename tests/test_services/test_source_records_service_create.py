@@ -1,6 +1,11 @@
 from typing import List, cast
+from unittest.mock import patch
 
+import pytest
+
+from app.errors.database_error import DatabaseError
 from app.graph.generic.abstract_dao_factory import AbstractDAOFactory
+from app.graph.neo4j.source_person_dao import SourcePersonDAO
 from app.graph.neo4j.source_record_dao import SourceRecordDAO
 from app.models.agent_identifiers import PersonIdentifier
 from app.models.harvesters import Harvester
@@ -409,3 +414,60 @@ async def test_create_source_record_stores_identifier_used(
         identifier_used_value="122758765"
     )
     assert scanr_thesis_source_record_pydantic_model.uid in uids
+
+
+async def test_create_source_record_is_rolled_back_on_database_failure(
+        persisted_person_a_pydantic_model: Person,
+        scanr_thesis_source_record_pydantic_model: SourceRecord,
+        default_identifier_used: PersonIdentifier
+) -> None:
+    """
+    Given a persisted person pydantic model and a non persisted source record pydantic model
+    When a database error occurs while the contributions of the source record are written
+    Then no part of the source record should be left in the graph
+    :param persisted_person_a_pydantic_model:
+    :param scanr_thesis_source_record_pydantic_model:
+    :return:
+    """
+
+    async def failing_contributions_transaction(tx, *_):
+        await tx.run("THIS IS NOT CYPHER")
+
+    service = SourceRecordService()
+    with patch.object(SourceRecordDAO, "_update_contributions_transaction",
+                      side_effect=failing_contributions_transaction):
+        with pytest.raises(DatabaseError):
+            await service.create_source_record(
+                source_record=scanr_thesis_source_record_pydantic_model,
+                harvested_for=persisted_person_a_pydantic_model,
+                identifier_used=default_identifier_used)
+    assert not await service.source_record_exists(scanr_thesis_source_record_pydantic_model.uid)
+
+
+async def test_create_source_record_fails_on_contributors_database_failure(
+        persisted_person_a_pydantic_model: Person,
+        scanr_thesis_source_record_pydantic_model: SourceRecord,
+        default_identifier_used: PersonIdentifier
+) -> None:
+    """
+    Given a persisted person pydantic model and a non persisted source record pydantic model
+    When a database error occurs while the contributors of the source record are written
+    Then the error should be raised and the source record should not be created
+    without its contributors
+    :param persisted_person_a_pydantic_model:
+    :param scanr_thesis_source_record_pydantic_model:
+    :return:
+    """
+
+    async def failing_contributors_transaction(tx, *_):
+        await tx.run("THIS IS NOT CYPHER")
+
+    service = SourceRecordService()
+    with patch.object(SourcePersonDAO, "_create_or_update_source_people_transaction",
+                      side_effect=failing_contributors_transaction):
+        with pytest.raises(DatabaseError):
+            await service.create_source_record(
+                source_record=scanr_thesis_source_record_pydantic_model,
+                harvested_for=persisted_person_a_pydantic_model,
+                identifier_used=default_identifier_used)
+    assert not await service.source_record_exists(scanr_thesis_source_record_pydantic_model.uid)
@@ -2,8 +2,10 @@ from app.models.agent_identifiers import PersonIdentifier
 from app.models.harvesters import Harvester
 from app.models.identifier_types import PublicationIdentifierType
 from app.models.people import Person
+from app.models.source_person_identifiers import SourcePersonIdentifier
 from app.models.source_records import SourceRecord
 from app.services.source_records.source_record_service import SourceRecordService
+from app.signals import source_record_updated
 
 
 async def test_update_scanr_article_source_record(
@@ -263,3 +265,69 @@ async def test_update_source_record_issue(
     assert "Ceci est un titre d'issue" in fetched_source_record_updated.issue.titles
     assert fetched_source_record_updated.issue.volume == "1"
     assert "1" in fetched_source_record_updated.issue.number
+
+
+def _with_contributor_orcid(source_record: SourceRecord) -> SourceRecord:
+    source_record = source_record.model_copy(deep=True)
+    contributor = source_record.contributions[0].contributor
+    contributor.identifiers = contributor.identifiers + [
+        SourcePersonIdentifier(type="orcid", value="0000-0001-6528-2446")]
+    return source_record
+
+
+async def test_update_source_record_reports_contributor_identifier_change(
+        scanr_article_a_source_record_persisted_model: SourceRecord,
+        persisted_person_a_pydantic_model: Person,
+        default_identifier_used: PersonIdentifier
+):
+    """
+    Given a persisted source record
+    When it is updated through the service with an ORCID added to one of its contributors
+    Then the update status sent with the source record updated signal should report
+    a change of the contributors, although the shared contributor node has been
+    overwritten before the source record itself
+    """
+    update_statuses = []
+
+    async def record_update_status(_, update_status=None, **__):
+        update_statuses.append(update_status)
+
+    with source_record_updated.connected_to(record_update_status):
+        await SourceRecordService().update_source_record(
+            source_record=_with_contributor_orcid(scanr_article_a_source_record_persisted_model),
+            harvested_for=persisted_person_a_pydantic_model,
+            identifier_used=default_identifier_used)
+    assert len(update_statuses) == 1
+    assert update_statuses[0].contributors_changed
+
+
+async def test_update_prepared_source_record_reports_contributor_identifier_change(
+        scanr_article_a_source_record_persisted_model: SourceRecord,
+        persisted_person_a_pydantic_model: Person,
+        default_identifier_used: PersonIdentifier
+):
+    """
+    Given a persisted source record
+    When it is prepared in a batch with an ORCID added to one of its contributors,
+    then updated with prepared=True and the stored source record returned by the preparation
+    Then the update status sent with the source record updated signal should report
+    a change of the contributors
+    """
+    service = SourceRecordService()
+    source_record = _with_contributor_orcid(scanr_article_a_source_record_persisted_model)
+    stored_source_records = await service.prepare_source_records([source_record])
+    assert list(stored_source_records) == [source_record.uid]
+    update_statuses = []
+
+    async def record_update_status(_, update_status=None, **__):
+        update_statuses.append(update_status)
+
+    with source_record_updated.connected_to(record_update_status):
+        await service.update_source_record(
+            source_record=source_record,
+            harvested_for=persisted_person_a_pydantic_model,
+            identifier_used=default_identifier_used,
+            prepared=True,
+            stored_source_record=stored_source_records[source_record.uid])
+    assert len(update_statuses) == 1
+    assert update_statuses[0].contributors_changed
@@ -0,0 +1,54 @@
+import time
+
+from app.utils.cache.lru_ttl_cache import LruTtlCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Given a cache of size 2 holding two entries, the first one having been read last
+    When a third entry is put
+    Then the second entry should be evicted and the hits and misses counted
+    """
+    cache = LruTtlCache(max_size=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.statistics() | {"ttl": None} == {
+        "size": 2, "max_size": 2, "ttl": None, "hits": 2, "misses": 1,
+        "evictions": 1, "invalidations": 0,
+    }
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    """
+    Given a cached entry
+    When it is read after its time to live
+    Then it should be a miss and be removed from the cache
+    """
+    now = time.monotonic()
+    cache = LruTtlCache(max_size=2, ttl=10)
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.put("a", 1)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("a") is None
+    assert cache.statistics()["size"] == 0
+
+
+def test_invalidate_tag():
+    """
+    Given entries tagged with the objects they depend on
+    When one of these objects is invalidated
+    Then only the entries depending on it should be removed
+    """
+    cache = LruTtlCache(max_size=10, ttl=60)
+    cache.put("a", 1, tags=["state-1", "state-2"])
+    cache.put("b", 2, tags=["state-2"])
+    cache.put("c", 3, tags=["state-3"])
+    assert cache.invalidate_tag("state-2") == 2
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.invalidate_tag("state-1") == 0
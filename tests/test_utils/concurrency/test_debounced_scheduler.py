@@ -0,0 +1,138 @@
+import asyncio
+
+from app.utils.concurrency.debounced_scheduler import DebouncedScheduler
+
+
+async def test_requests_within_quiet_window_are_coalesced():
+    """
+    Given a debounced scheduler
+    When the same key is requested five times within the quiet window
+    Then the job should run once with the merged arguments
+    """
+    runs = []
+
+    async def job(key: str, argument: set):
+        runs.append((key, argument))
+
+    scheduler = DebouncedScheduler(job, merge=lambda a, b: a | b,
+                                   limits=DebouncedScheduler.Limits(
+                                       quiet_window=0.05, max_delay=1,
+                                       concurrency=2, max_pending=10))
+    for index in range(5):
+        await scheduler.schedule("document-1", {index})
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+    assert runs == [("document-1", {0, 1, 2, 3, 4})]
+    assert scheduler.statistics()["coalesced"] == 4
+
+
+async def test_key_requested_while_running_is_run_again_afterwards():
+    """
+    Given a debounced scheduler running the job of a key
+    When the key is requested again during the run
+    Then the job should run again once the first run is over, never concurrently
+    """
+    events = []
+
+    async def job(key: str, argument: int):
+        events.append(f"{key} {argument} start")
+        await asyncio.sleep(0.02)
+        events.append(f"{key} {argument} end")
+
+    scheduler = DebouncedScheduler(job, merge=max,
+                                   limits=DebouncedScheduler.Limits(
+                                       quiet_window=0, max_delay=1,
+                                       concurrency=2, max_pending=10))
+    await scheduler.schedule("document-1", 1)
+    await asyncio.sleep(0.01)
+    await scheduler.schedule("document-1", 2)
+    await scheduler.drain()
+    assert events == ["document-1 1 start", "document-1 1 end",
+                      "document-1 2 start", "document-1 2 end"]
+
+
+async def test_concurrency_is_bounded_and_drain_skips_quiet_window():
+    """
+    Given a debounced scheduler with a long quiet window and a concurrency of one
+    When several keys are requested and the scheduler is drained
+    Then all the jobs should run without waiting for the quiet window, one at a time
+    """
+    running = []
+    max_running = []
+
+    async def job(key: str, _):
+        running.append(key)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(key)
+
+    scheduler = DebouncedScheduler(job, merge=lambda a, b: b,
+                                   limits=DebouncedScheduler.Limits(
+                                       quiet_window=60, max_delay=60,
+                                       concurrency=1, max_pending=10))
+    for key in ["document-1", "document-2", "document-3"]:
+        await scheduler.schedule(key, None)
+    await asyncio.wait_for(scheduler.drain(), timeout=1)
+    assert max(max_running) == 1
+    assert scheduler.statistics()["completed"] == 3
+
+
+async def test_jobs_requested_from_a_prioritized_lane_overtake_pending_jobs():
+    """
+    Given a debounced scheduler with a concurrency of one, running a job requested
+    from the publications lane while two other publications jobs are pending
+    When a job is requested from the user_actions lane
+    Then it should run as soon as the running job is over, before the pending ones
+    """
+    events = []
+    release = asyncio.Event()
+
+    async def job(key: str, _):
+        events.append(key)
+        if key == "publication-1":
+            await release.wait()
+
+    scheduler = DebouncedScheduler(job, merge=lambda a, b: b,
+                                   limits=DebouncedScheduler.Limits(
+                                       quiet_window=0, max_delay=1,
+                                       concurrency=1, max_pending=10,
+                                       priorities={"user_actions": 0, "publications": 3}))
+    await scheduler.schedule("publication-1", None, lane="publications")
+    await asyncio.sleep(0.01)
+    await scheduler.schedule("publication-2", None, lane="publications")
+    await scheduler.schedule("publication-3", None, lane="publications")
+    await asyncio.sleep(0.01)
+    await scheduler.schedule("curated-document", None, lane="user_actions")
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(scheduler.drain(), timeout=1)
+    assert events == ["publication-1", "curated-document", "publication-2", "publication-3"]
+
+
+async def test_requesting_new_keys_waits_once_max_pending_is_reached():
+    """
+    Given a debounced scheduler keeping at most two keys pending
+    When a third key is requested while two keys are pending
+    Then the request should wait for one of them to be over
+    And requests for a pending key should not wait
+    """
+    release = asyncio.Event()
+
+    async def job(_key: str, _):
+        await release.wait()
+
+    scheduler = DebouncedScheduler(job, merge=lambda a, b: b,
+                                   limits=DebouncedScheduler.Limits(
+                                       quiet_window=0, max_delay=1,
+                                       concurrency=1, max_pending=2))
+    await scheduler.schedule("document-1", None)
+    await scheduler.schedule("document-2", None)
+    await asyncio.wait_for(scheduler.schedule("document-2", None), timeout=0.1)
+    third_request = asyncio.create_task(scheduler.schedule("document-3", None))
+    await asyncio.sleep(0.05)
+    assert not third_request.done()
+    assert not scheduler.scheduled("document-3")
+    release.set()
+    await asyncio.wait_for(third_request, timeout=1)
+    await asyncio.wait_for(scheduler.drain(), timeout=1)
+    assert scheduler.statistics()["completed"] == 3
@@ -0,0 +1,81 @@
+import asyncio
+
+from app.utils.concurrency.priority_scheduler import PriorityScheduler
+
+
+async def test_waiting_lanes_are_served_by_priority():
+    """
+    Given a priority scheduler with a single slot held by the publications lane
+    When publications and then user actions wait for the slot
+    Then the user actions should be served first once the slot is released
+    """
+    scheduler = PriorityScheduler(1, {"user_actions": 0, "publications": 3})
+    served = []
+
+    async def process(lane: str):
+        async with scheduler.slot(lane):
+            served.append(lane)
+            await asyncio.sleep(0.01)
+
+    first = asyncio.create_task(process("publications"))
+    await asyncio.sleep(0)
+    waiting = [asyncio.create_task(process("publications")),
+               asyncio.create_task(process("user_actions"))]
+    await asyncio.sleep(0)
+    assert scheduler.statistics()["waiting"] == {"publications": 1, "user_actions": 1}
+    await asyncio.gather(first, *waiting)
+    assert served == ["publications", "user_actions", "publications"]
+
+
+async def test_reserved_slots_are_available_while_shared_slots_are_busy():
+    """
+    Given a priority scheduler with one reserved slot for user actions
+    and publications holding every shared slot
+    When a user action and another publication request a slot
+    Then the user action should be served at once on its reserved slot
+    while the publication waits
+    """
+    scheduler = PriorityScheduler(3, {"user_actions": 0}, {"user_actions": 1})
+    release = asyncio.Event()
+
+    async def process(lane: str):
+        async with scheduler.slot(lane):
+            await release.wait()
+
+    tasks = [asyncio.create_task(process("publications")) for _ in range(3)]
+    tasks.append(asyncio.create_task(process("user_actions")))
+    await asyncio.sleep(0)
+    statistics = scheduler.statistics()
+    assert statistics["in_use"] == {"publications": 2, "user_actions": 1}
+    assert statistics["waiting"] == {"publications": 1}
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.statistics()["granted"] == {"publications": 3, "user_actions": 1}
+
+
+async def test_cancelled_waiter_does_not_keep_a_slot():
+    """
+    Given a priority scheduler with a single busy slot and a waiting request
+    When the waiting request is cancelled and the slot is released
+    Then the next request should be served
+    """
+    scheduler = PriorityScheduler(1, {})
+    release = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot("publications"):
+            await release.wait()
+
+    async def wait():
+        async with scheduler.slot("publications"):
+            pass
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(wait())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    await asyncio.wait_for(wait(), timeout=1)
+    assert scheduler.statistics()["in_use"] == {"publications": 0}
@@ -0,0 +1,44 @@
+import asyncio
+
+from app.utils.concurrency.striped_lock import StripedLock
+
+
+async def test_overlapping_key_sets_are_serialized():
+    """
+    Given a striped lock
+    When two tasks hold overlapping key sets
+    Then the second task waits for the first one to release its locks
+    """
+    lock = StripedLock(16)
+    events = []
+
+    async def work(name: str, keys: list[str]):
+        async with lock.hold(keys):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    await asyncio.gather(work("a", ["sr-1", "sr-2"]), work("b", ["sr-2", "sr-3"]))
+    assert events == ["a start", "a end", "b start", "b end"]
+
+
+async def test_disjoint_stripes_run_in_parallel():
+    """
+    Given a striped lock
+    When two tasks hold key sets mapped to different stripes
+    Then they run concurrently
+    """
+    lock = StripedLock(16)
+    key_a = "sr-1"
+    key_b = next(f"sr-{i}" for i in range(2, 100)
+                 if lock.stripes_of([f"sr-{i}"]) != lock.stripes_of([key_a]))
+    events = []
+
+    async def work(name: str, key: str):
+        async with lock.hold([key]):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    await asyncio.gather(work("a", key_a), work("b", key_b))
+    assert events[:2] == ["a start", "b start"]